@@ -0,0 +1,78 @@
+""" benchmark checking every item of 50k-item list, python loop vs collection comparators
+
+    $ PYTHONPATH=. python benchmarks/collection_comparators.py
+"""
+
+import timeit
+
+from httprunner.builtin import comparators
+
+NUMBER = 20
+ITEMS = [
+    {"id": index, "price": index * 0.5, "status": "paid"} for index in range(50000)
+]
+IDS = [item["id"] for item in ITEMS]
+PRICES = [item["price"] for item in ITEMS]
+
+
+# typical custom functions in debugtalk.py
+def loop_all_paid(items):
+    for item in items:
+        assert item["status"] == "paid"
+
+
+def loop_in_range(values, low, high):
+    for value in values:
+        assert low <= value <= high
+
+
+def loop_sorted(items, key):
+    for index in range(1, len(items)):
+        assert items[index - 1][key] <= items[index][key]
+
+
+def loop_unique(values):
+    seen = []
+    for value in values[:5000]:
+        # membership of list, only first 5000 items to keep it bearable
+        assert value not in seen
+        seen.append(value)
+
+
+CASES = [
+    (
+        "all_match",
+        lambda: loop_all_paid(ITEMS),
+        lambda: comparators.all_match(ITEMS, {"status": "paid"}),
+    ),
+    (
+        "each_in_range",
+        lambda: loop_in_range(PRICES, 0, 25000),
+        lambda: comparators.each_in_range(PRICES, [0, 25000]),
+    ),
+    (
+        "sorted_by",
+        lambda: loop_sorted(ITEMS, "id"),
+        lambda: comparators.sorted_by(ITEMS, "id"),
+    ),
+    (
+        "unique_by (5k)",
+        lambda: loop_unique(IDS),
+        lambda: comparators.unique_by(ITEMS[:5000], "id"),
+    ),
+]
+
+
+def main():
+    print(f"{len(ITEMS)} items, {NUMBER} runs")
+    for name, loop_check, comparator_check in CASES:
+        loop_elapsed = timeit.timeit(loop_check, number=NUMBER)
+        comparator_elapsed = timeit.timeit(comparator_check, number=NUMBER)
+        print(
+            f"{name:<16} python loop: {loop_elapsed * 1000 / NUMBER:8.3f} ms"
+            f"    comparator: {comparator_elapsed * 1000 / NUMBER:8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
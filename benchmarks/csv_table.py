@@ -0,0 +1,56 @@
+""" benchmark loading large csv parameters, list of dicts vs columnar CsvTable
+
+    $ PYTHONPATH=. python benchmarks/csv_table.py
+"""
+
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+
+from httprunner.csv_table import csv_tables_cache, load_csv_table
+
+ROWS = 200000
+
+
+def prepare_csv(csv_path: str):
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write("username,password,age:int\n")
+        for index in range(ROWS):
+            f.write(f"user{index},password{index},{index % 100}\n")
+
+
+def load_dict_rows(csv_path: str):
+    with open(csv_path, encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def measure(name: str, func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name}: {elapsed:.2f} s, "
+        f"kept {current / 1024 / 1024:.1f} MiB, peak {peak / 1024 / 1024:.1f} MiB"
+    )
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, "account.csv")
+        prepare_csv(csv_path)
+
+        measure(f"{ROWS} rows, csv.DictReader list", load_dict_rows, csv_path)
+        measure(f"{ROWS} rows, CsvTable", load_csv_table, csv_path)
+        measure(f"{ROWS} rows, CsvTable cached", load_csv_table, csv_path)
+        csv_tables_cache.clear()
+        measure("first 1000 rows, CsvTable", load_csv_table, csv_path, 0, 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+""" benchmark collecting 500 testcases, made pytest files vs run directly
+
+    $ PYTHONPATH=. python benchmarks/direct_run.py
+"""
+
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+COPIES = 100
+EXAMPLES_DIR = os.path.join("examples", "postman_echo")
+
+
+def prepare_project(project_dir: str):
+    """copies of request_methods testcases, without parameters"""
+    shutil.copy(os.path.join(EXAMPLES_DIR, "debugtalk.py"), project_dir)
+    shutil.copytree(
+        os.path.join(EXAMPLES_DIR, "request_methods"),
+        os.path.join(project_dir, "request_methods"),
+        ignore=shutil.ignore_patterns("*_test.py"),
+    )
+    testcase_paths = [
+        path
+        for path in glob.glob(os.path.join(EXAMPLES_DIR, "request_methods", "*.yml"))
+        if "parameters" not in path and "reference" not in path
+    ]
+    for index in range(COPIES):
+        copy_dir = os.path.join(project_dir, "testcases", f"copy_{index}")
+        os.makedirs(copy_dir)
+        for testcase_path in testcase_paths:
+            shutil.copy(testcase_path, copy_dir)
+
+
+def main():
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.getcwd(),
+        HRUN_MAKE_CACHE="false",
+        HRUN_MAKE_WORKERS="1",
+    )
+    for mode_args in [[], ["--direct"]]:
+        with tempfile.TemporaryDirectory() as project_dir:
+            prepare_project(project_dir)
+            testcases_dir = os.path.join(project_dir, "testcases")
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, "-m", "httprunner", "run", *mode_args]
+                + [testcases_dir, "--collect-only", "-q", "--log-level", "ERROR"],
+                capture_output=True,
+                cwd=project_dir,
+                env=env,
+            )
+            elapsed = time.perf_counter() - start
+
+        collected = result.stdout.decode().strip().splitlines()[-1]
+        mode = "direct" if mode_args else "make"
+        print(f"{mode}: {collected}, {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
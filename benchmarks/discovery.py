@@ -0,0 +1,87 @@
+""" benchmark discovering and loading test files in project with non-testcase files,
+os.walk collecting every YAML/JSON file vs scandir with ignore rules and content sniff
+
+    $ PYTHONPATH=. python benchmarks/discovery.py
+"""
+
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from loguru import logger
+
+from httprunner import exceptions, loader
+
+TESTCASE_CONTENT = """config:
+    name: demo
+teststeps:
+-   name: get
+    request:
+        method: GET
+        url: /get
+"""
+
+
+def write_file(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def prepare_project(project_dir: str):
+    fixture = json.dumps(
+        [{"id": index, "name": f"user{index}"} for index in range(200)]
+    )
+    for index in range(200):
+        write_file(
+            os.path.join(project_dir, "testcases", f"tc{index}.yml"), TESTCASE_CONTENT
+        )
+        write_file(os.path.join(project_dir, "data", f"users{index}.json"), fixture)
+    for index in range(2000):
+        package_json = json.dumps({"name": f"pkg{index}", "version": "1.0.0"})
+        write_file(
+            os.path.join(project_dir, "node_modules", f"pkg{index}", "package.json"),
+            package_json,
+        )
+    write_file(os.path.join(project_dir, "venv", "pyvenv.cfg"), "")
+    for index in range(500):
+        write_file(
+            os.path.join(project_dir, "venv", "lib", f"conf{index}.yml"), "a: 1\n"
+        )
+
+
+def walk_files(folder_path: str):
+    for dirpath, _, filenames in os.walk(folder_path):
+        for filename in filenames:
+            if filename.lower().endswith((".yml", ".yaml", ".json", "_test.py")):
+                yield os.path.join(dirpath, filename)
+
+
+def discover_and_load(discover, project_dir: str):
+    start = time.perf_counter()
+    test_files = list(discover(project_dir))
+    for test_file in test_files:
+        try:
+            loader.load_test_file(test_file)
+        except exceptions.FileFormatError:
+            pass
+    return len(test_files), time.perf_counter() - start
+
+
+def main():
+    logger.remove()
+    with tempfile.TemporaryDirectory() as project_dir:
+        prepare_project(project_dir)
+        with mock.patch.dict(os.environ, {"HRUN_LOAD_CACHE": "false"}):
+            for name, discover in [
+                ("os.walk", walk_files),
+                ("scandir, ignore rules and sniff", loader.load_folder_files),
+            ]:
+                count, elapsed = discover_and_load(discover, project_dir)
+                print(f"{name}: {count} files loaded, {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+""" benchmark validating one step with 50 validators, jmespath.search vs compiled cache
+
+    $ PYTHONPATH=. python benchmarks/jmespath_cache.py
+"""
+
+import json
+import timeit
+from datetime import timedelta
+from unittest import mock
+
+import jmespath
+import requests
+
+from httprunner import response
+from httprunner.parser import Parser
+from httprunner.response import (
+    ResponseObject,
+    ValidatorPlan,
+    get_jmespath_cache_info,
+)
+
+NUMBER = 200
+
+
+def build_response() -> requests.Response:
+    body = {
+        "code": 0,
+        "data": {
+            "items": [
+                {"id": index, "name": f"item-{index}", "tags": ["a", "b"]}
+                for index in range(50)
+            ]
+        },
+    }
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers["Content-Type"] = "application/json"
+    resp._content = json.dumps(body).encode("utf-8")
+    resp.elapsed = timedelta(milliseconds=10)
+    return resp
+
+
+VALIDATORS = [{"eq": ["status_code", 200]}, {"eq": ["body.code", 0]}] + [
+    {"eq": [f"body.data.items[{index}].name", f"item-{index}"]}
+    for index in range(48)
+]
+VALIDATOR_PLAN = ValidatorPlan(VALIDATORS)
+
+
+def run_step():
+    resp_obj = ResponseObject(build_response(), Parser({}))
+    resp_obj.validate(VALIDATOR_PLAN)
+
+
+def search_without_cache(expr, data):
+    return jmespath.search(expr, data)
+
+
+def search_only(search_func, expressions):
+    data = {"body": json.loads(build_response().content)}
+    for expr in expressions:
+        search_func(expr, data)
+
+
+def main():
+    # silence validation logs
+    response.logger.remove()
+
+    with mock.patch.object(response, "search_jmespath", search_without_cache):
+        uncached = timeit.timeit(run_step, number=NUMBER)
+
+    cached = timeit.timeit(run_step, number=NUMBER)
+
+    print(f"step with {len(VALIDATORS)} validators, {NUMBER} runs")
+    print(f"jmespath.search:   {uncached * 1000 / NUMBER:.3f} ms/step")
+    print(f"compiled cache:    {cached * 1000 / NUMBER:.3f} ms/step")
+
+    # jmespath keeps 128 parsed expressions at most, large projects exceed it
+    for size in [len(VALIDATORS), 500]:
+        expressions = [
+            f"body.data.items[{index % 50}].name || `{index}`" for index in range(size)
+        ]
+        number = NUMBER * 50 // size
+        uncached = timeit.timeit(
+            lambda: search_only(search_without_cache, expressions), number=number
+        )
+        cached = timeit.timeit(
+            lambda: search_only(response.search_jmespath, expressions), number=number
+        )
+        print(f"search {size} distinct expressions, {number} runs")
+        print(f"jmespath.search:   {uncached * 1000 / number:.3f} ms")
+        print(f"compiled cache:    {cached * 1000 / number:.3f} ms")
+
+    print(f"cache info: {get_jmespath_cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
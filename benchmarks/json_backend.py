@@ -0,0 +1,82 @@
+""" benchmark end-to-end step overhead with large json response, stdlib vs orjson backend
+
+    $ PYTHONPATH=. python benchmarks/json_backend.py
+"""
+
+import json
+import threading
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from loguru import logger
+
+from httprunner import Config, HttpRunner, RunRequest, Step, jsonlib
+
+NUMBER = 20
+ITEMS = 20000
+
+CONTENT = json.dumps(
+    {
+        "meta": {"total": ITEMS},
+        "items": [
+            {"id": index, "name": f"item-{index}", "price": index * 0.1, "tags": ["a"]}
+            for index in range(ITEMS)
+        ],
+    }
+).encode("utf-8")
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(CONTENT)))
+        self.end_headers()
+        self.wfile.write(CONTENT)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    # silence request/response logs, formatting is not measured
+    logger.remove()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ExportHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    class CaseWithLargeResponse(HttpRunner):
+        config = Config("large response").base_url(
+            f"http://127.0.0.1:{server.server_address[1]}"
+        )
+        teststeps = [
+            Step(
+                RunRequest("export")
+                .get("/export")
+                .extract()
+                .with_jmespath("body.meta.total", "total")
+                .validate()
+                .assert_equal("status_code", 200)
+                .assert_equal("body.items[0].id", 0)
+            )
+        ]
+
+    print(f"response size {len(CONTENT) / 1024 / 1024:.1f} MB, {NUMBER} runs")
+    backends = ["stdlib", "orjson"] if jsonlib.ORJSON_READY else ["stdlib"]
+    for backend in backends:
+        with mock.patch.object(jsonlib, "BACKEND", backend):
+            CaseWithLargeResponse().test_start()  # warm up
+            elapsed = timeit.timeit(
+                lambda: CaseWithLargeResponse().test_start(), number=NUMBER
+            )
+        print(f"{backend:<8} {elapsed * 1000 / NUMBER:.1f} ms/step")
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
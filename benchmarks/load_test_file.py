@@ -0,0 +1,64 @@
+""" benchmark loading and validating testcase files, YAML parser vs load cache
+
+    $ PYTHONPATH=. python benchmarks/load_test_file.py
+"""
+
+import glob
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+import yaml
+from loguru import logger
+
+from httprunner import loader
+from httprunner.compat import ensure_testcase_v4
+from httprunner.load_cache import LoadCache
+
+COPIES = 100
+EXAMPLES_DIR = os.path.join("examples", "postman_echo")
+
+
+def prepare_project(project_dir: str):
+    shutil.copy(os.path.join(EXAMPLES_DIR, "debugtalk.py"), project_dir)
+    testcase_paths = glob.glob(os.path.join(EXAMPLES_DIR, "request_methods", "*.yml"))
+    for index in range(COPIES):
+        copy_dir = os.path.join(project_dir, f"copy_{index}")
+        os.makedirs(copy_dir)
+        for testcase_path in testcase_paths:
+            shutil.copy(testcase_path, copy_dir)
+
+
+def load_and_validate(test_files):
+    start = time.perf_counter()
+    for test_file in test_files:
+        testcase = ensure_testcase_v4(loader.load_test_file(test_file))
+        testcase["config"]["path"] = test_file
+        loader.validate_testcase(testcase)
+    return time.perf_counter() - start
+
+
+def main():
+    logger.remove()
+    with tempfile.TemporaryDirectory() as project_dir:
+        prepare_project(project_dir)
+        test_files = loader.load_folder_files(project_dir)
+
+        cases = [
+            ("FullLoader, no cache", yaml.FullLoader, "false"),
+            ("CFullLoader, no cache", yaml.CFullLoader, "false"),
+            ("CFullLoader, cold cache", yaml.CFullLoader, "true"),
+            ("warm cache, new process", yaml.CFullLoader, "true"),
+        ]
+        for name, yaml_loader, cache_enabled in cases:
+            with mock.patch.dict(os.environ, {"HRUN_LOAD_CACHE": cache_enabled}):
+                with mock.patch.object(loader, "YAML_LOADER", yaml_loader):
+                    with mock.patch.object(loader, "load_cache", LoadCache()):
+                        elapsed = load_and_validate(test_files)
+            print(f"{len(test_files)} testcases, {name}: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
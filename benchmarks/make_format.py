@@ -0,0 +1,52 @@
+""" benchmark making 500 testcases, builtin formatter vs black
+
+    $ PYTHONPATH=. python benchmarks/make_format.py
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from loguru import logger
+
+from httprunner import loader, make
+
+TESTCASES = 500
+EXAMPLES_DIR = os.path.join("examples", "postman_echo")
+EXAMPLE_TESTCASE = os.path.join("request_methods", "request_with_functions.yml")
+
+
+def prepare_project(project_dir: str):
+    shutil.copy(os.path.join(EXAMPLES_DIR, "debugtalk.py"), project_dir)
+    testcases_dir = os.path.join(project_dir, "testcases")
+    os.makedirs(testcases_dir)
+    for index in range(TESTCASES):
+        shutil.copy(
+            os.path.join(EXAMPLES_DIR, EXAMPLE_TESTCASE),
+            os.path.join(testcases_dir, f"request_{index}.yml"),
+        )
+    return testcases_dir
+
+
+def main():
+    logger.remove()
+    print(f"{TESTCASES} testcases")
+    for formatter, env in [("builtin", "false"), ("black", "true")]:
+        with tempfile.TemporaryDirectory() as project_dir:
+            testcases_dir = prepare_project(project_dir)
+            make.pytest_files_made_cache_mapping.clear()
+            make.pytest_files_run_set.clear()
+            loader.project_meta = None
+            with mock.patch.dict(
+                os.environ, {"HRUN_MAKE_CACHE": "false", "HRUN_MAKE_BLACK": env}
+            ):
+                start = time.perf_counter()
+                make.main_make([testcases_dir])
+                elapsed = time.perf_counter() - start
+        print(f"{formatter:<8} {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+""" benchmark making 1000 testcases, serially vs with process pool
+
+    $ PYTHONPATH=. python benchmarks/parallel_make.py
+"""
+
+import glob
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from loguru import logger
+
+from httprunner import loader, make
+
+COPIES = 125
+EXAMPLES_DIR = os.path.join("examples", "postman_echo")
+
+
+def prepare_project(project_dir: str):
+    """copies of request_methods testcases, referencing the same testcase"""
+    shutil.copy(os.path.join(EXAMPLES_DIR, "debugtalk.py"), project_dir)
+    shutil.copytree(
+        os.path.join(EXAMPLES_DIR, "request_methods"),
+        os.path.join(project_dir, "request_methods"),
+        ignore=shutil.ignore_patterns("*_test.py"),
+    )
+    testcase_paths = glob.glob(os.path.join(EXAMPLES_DIR, "request_methods", "*.yml"))
+    for index in range(COPIES):
+        copy_dir = os.path.join(project_dir, "testcases", f"copy_{index}")
+        os.makedirs(copy_dir)
+        for testcase_path in testcase_paths:
+            shutil.copy(testcase_path, copy_dir)
+
+
+def main():
+    logger.remove()
+    for workers in [1, max(os.cpu_count() or 1, 4)]:
+        with tempfile.TemporaryDirectory() as project_dir:
+            prepare_project(project_dir)
+            testcases_dir = os.path.join(project_dir, "testcases")
+            make.pytest_files_made_cache_mapping.clear()
+            make.pytest_files_run_set.clear()
+            loader.project_meta = None
+            with mock.patch.dict(
+                os.environ,
+                {"HRUN_MAKE_CACHE": "false", "HRUN_MAKE_WORKERS": str(workers)},
+            ):
+                start = time.perf_counter()
+                testcase_python_list = make.main_make([testcases_dir])
+                elapsed = time.perf_counter() - start
+        print(
+            f"{len(testcase_python_list)} testcases, "
+            f"{workers} workers: {elapsed:.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,8 @@ class TestCaseRequestWithParameters(HttpRunner):
                 "user_agent": ["iOS/10.1", "iOS/10.2"],
                 "username-password": "${parameterize(request_methods/account.csv)}",
                 "app_version": "${get_app_version()}",
-            }
+            },
+            __file__,
         ),
     )
     def test_start(self, param):
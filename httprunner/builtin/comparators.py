@@ -2,8 +2,22 @@
 Built-in validate comparators.
 """
 
+import json
+import math
+import operator
+import os
 import re
-from typing import Text, Any, Union
+from functools import lru_cache
+from typing import Text, Any, List, Union
+
+import yaml
+
+try:
+    import jsonschema
+
+    JSONSCHEMA_READY = True
+except ModuleNotFoundError:
+    JSONSCHEMA_READY = False
 
 
 def equal(check_value: Any, expect_value: Any, message: Text = ""):
@@ -127,3 +141,316 @@ def startswith(check_value: Any, expect_value: Any, message: Text = ""):
 
 def endswith(check_value: Text, expect_value: Any, message: Text = ""):
     assert str(check_value).endswith(str(expect_value)), message
+
+
+def _ensure_jsonschema_ready():
+    if JSONSCHEMA_READY:
+        return
+
+    # fail the validation only, other validators and testcases keep running
+    raise AssertionError(
+        "schema_match comparator dependency jsonschema uninstalled, "
+        "install first and try again: $ pip install jsonschema"
+    )
+
+
+def _compile_schema(schema: dict):
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+@lru_cache(maxsize=128)
+def _load_schema_file_validator(schema_path: Text, mtime: float):
+    """load and compile schema file once, compile again when file modified"""
+    with open(schema_path, encoding="utf-8") as f:
+        if schema_path.endswith((".yml", ".yaml")):
+            schema = yaml.safe_load(f)
+        else:
+            schema = json.load(f)
+
+    return _compile_schema(schema)
+
+
+@lru_cache(maxsize=128)
+def _load_schema_text_validator(schema_text: Text):
+    return _compile_schema(json.loads(schema_text))
+
+
+def _get_schema_validator(schema: Union[Text, dict]):
+    if isinstance(schema, dict):
+        # inline schema
+        return _load_schema_text_validator(json.dumps(schema, sort_keys=True))
+
+    # schema file path, relative to project root directory of running testcase
+    from httprunner import loader
+
+    root_dir = loader.running_root_dir.get()
+    if not root_dir and loader.project_meta:
+        # called outside of testcase run
+        root_dir = loader.project_meta.RootDir
+
+    if os.path.isabs(schema):
+        schema_path = schema
+    elif root_dir:
+        schema_path = os.path.join(root_dir, *schema.split("/"))
+    else:
+        schema_path = os.path.abspath(schema)
+
+    if not os.path.isfile(schema_path):
+        raise ValueError(f"schema file not found: {schema_path}")
+
+    return _load_schema_file_validator(schema_path, os.path.getmtime(schema_path))
+
+
+def schema_match(check_value: Any, expect_value: Union[Text, dict], message: Text = ""):
+    """validate check value with JSON Schema, expect value is schema file path
+    relative to project root directory (JSON/YAML), or inline schema dict.
+    """
+    _ensure_jsonschema_ready()
+    validator = _get_schema_validator(expect_value)
+    error = jsonschema.exceptions.best_match(validator.iter_errors(check_value))
+    if error is None:
+        return
+
+    error_path = "".join(
+        f"[{item}]" if isinstance(item, int) else f".{item}" for item in error.path
+    )
+    raise AssertionError(
+        message or f"schema mismatch at {error_path or '.'}: {error.message}"
+    )
+
+
+# collection comparators, check every item of large list with builtin functions
+# implemented in C, e.g. min/max/set/map, instead of looping in Python.
+# item details are located only when check fails.
+
+
+def _ensure_list(check_value: Any) -> Union[list, tuple]:
+    assert isinstance(
+        check_value, (list, tuple)
+    ), "check_value should be list/tuple type"
+    return check_value
+
+
+def _pluck(items: Union[list, tuple], key: Text) -> List:
+    """values of key in each item, key can be nested field, e.g. price.amount"""
+    if not key:
+        return list(items)
+
+    if "." not in key:
+        try:
+            return list(map(operator.itemgetter(key), items))
+        except (KeyError, IndexError, TypeError):
+            # locate the item without field
+            pass
+
+    fields = key.split(".")
+    values = []
+    for index, item in enumerate(items):
+        try:
+            for field in fields:
+                item = item[field]
+        except (KeyError, IndexError, TypeError):
+            raise AssertionError(f"item {index} has no field {key}")
+        values.append(item)
+
+    return values
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+def _to_set(values: Union[list, tuple]) -> set:
+    try:
+        return set(values)
+    except TypeError:
+        # items are dict or list
+        return set(map(_hashable, values))
+
+
+def _in_set(value: Any, values_set: set) -> bool:
+    try:
+        return value in values_set
+    except TypeError:
+        return _hashable(value) in values_set
+
+
+def _item_match(item: Any, expect_value: Any) -> bool:
+    if isinstance(expect_value, dict):
+        # item contains all fields of expect value, same as _pluck
+        try:
+            return all(
+                _pluck([item], key) == [value] for key, value in expect_value.items()
+            )
+        except AssertionError:
+            return False
+
+    return item == expect_value
+
+
+def all_match(check_value: Any, expect_value: Any, message: Text = ""):
+    """every item equals expect value, or contains all fields if it is dict,
+    field can be nested, e.g. {"buyer.country": "CN"}
+    """
+    items = _ensure_list(check_value)
+    if isinstance(expect_value, dict):
+        try:
+            if all(
+                _pluck(items, key).count(value) == len(items)
+                for key, value in expect_value.items()
+            ):
+                return
+        except AssertionError:
+            # locate the item without field
+            pass
+    elif items.count(expect_value) == len(items):
+        return
+
+    for index, item in enumerate(items):
+        if not _item_match(item, expect_value):
+            raise AssertionError(message or f"item {index} mismatched: {item!r}")
+
+
+def any_match(check_value: Any, expect_value: Any, message: Text = ""):
+    """at least one item equals expect value, or contains all fields if it is dict,
+    field can be nested, e.g. {"buyer.country": "CN"}
+    """
+    items = _ensure_list(check_value)
+    if isinstance(expect_value, dict):
+        matched = any(_item_match(item, expect_value) for item in items)
+    else:
+        matched = expect_value in items
+    assert matched, message or f"no item matched: {expect_value!r}"
+
+
+def each_in_range(check_value: Any, expect_value: List, message: Text = ""):
+    """every item is in range [low, high], both inclusive"""
+    items = _ensure_list(check_value)
+    assert (
+        isinstance(expect_value, (list, tuple)) and len(expect_value) == 2
+    ), "expect_value should be [low, high]"
+    if not items:
+        return
+
+    low, high = expect_value
+    if low <= min(items) and max(items) <= high:
+        return
+
+    for index, item in enumerate(items):
+        if not low <= item <= high:
+            raise AssertionError(
+                message or f"item {index} out of range [{low}, {high}]: {item!r}"
+            )
+
+
+def sorted_by(check_value: Any, expect_value: Text, message: Text = ""):
+    """items are sorted by key field, descending if key starts with -,
+    empty key means sorted by items themselves
+    """
+    items = _ensure_list(check_value)
+    assert isinstance(expect_value, str), "expect_value should be Text type"
+    descending = expect_value.startswith("-")
+    key = expect_value.lstrip("-")
+    values = _pluck(items, key)
+    # timsort on sorted list is one linear pass of comparisons in C
+    if sorted(values, reverse=descending) == values:
+        return
+
+    compare = operator.ge if descending else operator.le
+    for index in range(1, len(values)):
+        if not compare(values[index - 1], values[index]):
+            raise AssertionError(
+                message
+                or f"item {index} not sorted by {expect_value or 'value'}: "
+                f"{values[index - 1]!r} before {values[index]!r}"
+            )
+
+
+def unique_by(check_value: Any, expect_value: Text, message: Text = ""):
+    """values of key field are unique, empty key means items themselves"""
+    items = _ensure_list(check_value)
+    values = _pluck(items, expect_value or "")
+    if len(_to_set(values)) == len(values):
+        return
+
+    seen = set()
+    for index, value in enumerate(values):
+        value_key = _hashable(value)
+        if value_key in seen:
+            raise AssertionError(message or f"item {index} duplicated: {value!r}")
+        seen.add(value_key)
+
+
+def _ensure_numbers(check_value: Any) -> Union[list, tuple]:
+    items = _ensure_list(check_value)
+    assert items, "check_value should not be empty"
+    return items
+
+
+def _number_equal(check_value: Union[int, float], expect_value: Union[int, float]):
+    if isinstance(check_value, float) or isinstance(expect_value, float):
+        return math.isclose(check_value, expect_value, rel_tol=1e-9, abs_tol=1e-9)
+    return check_value == expect_value
+
+
+def sum_equal(check_value: Any, expect_value: Union[int, float], message: Text = ""):
+    total = sum(_ensure_list(check_value))
+    assert _number_equal(total, expect_value), message or f"sum is {total}"
+
+
+def min_equal(check_value: Any, expect_value: Union[int, float], message: Text = ""):
+    minimum = min(_ensure_numbers(check_value))
+    assert _number_equal(minimum, expect_value), message or f"min is {minimum}"
+
+
+def max_equal(check_value: Any, expect_value: Union[int, float], message: Text = ""):
+    maximum = max(_ensure_numbers(check_value))
+    assert _number_equal(maximum, expect_value), message or f"max is {maximum}"
+
+
+def min_greater_or_equals(
+    check_value: Any, expect_value: Union[int, float], message: Text = ""
+):
+    minimum = min(_ensure_numbers(check_value))
+    assert minimum >= expect_value, message or f"min is {minimum}"
+
+
+def max_less_or_equals(
+    check_value: Any, expect_value: Union[int, float], message: Text = ""
+):
+    maximum = max(_ensure_numbers(check_value))
+    assert maximum <= expect_value, message or f"max is {maximum}"
+
+
+def contains_all(check_value: Any, expect_value: List, message: Text = ""):
+    """check value contains every item of expect value"""
+    items = _ensure_list(check_value)
+    assert isinstance(
+        expect_value, (list, tuple)
+    ), "expect_value should be list/tuple type"
+    items_set = _to_set(items)
+    missing = [value for value in expect_value if not _in_set(value, items_set)]
+    assert not missing, message or f"missing items: {missing!r}"
+
+
+def all_contained_by(check_value: Any, expect_value: List, message: Text = ""):
+    """every item of check value is contained by expect value"""
+    items = _ensure_list(check_value)
+    assert isinstance(
+        expect_value, (list, tuple)
+    ), "expect_value should be list/tuple type"
+    expect_set = _to_set(expect_value)
+    try:
+        if all(map(expect_set.__contains__, items)):
+            return
+    except TypeError:
+        # items are dict or list
+        pass
+
+    for index, item in enumerate(items):
+        if not _in_set(item, expect_set):
+            raise AssertionError(message or f"item {index} not allowed: {item!r}")
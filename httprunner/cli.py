@@ -1,13 +1,19 @@
 import argparse
 import enum
 import os
+import shutil
 import sys
+import tempfile
+import uuid
+from typing import List
 
 import pytest
 from loguru import logger
 
 from httprunner import __description__, __version__
 from httprunner.compat import ensure_cli_args
+from httprunner.direct import get_test_files
+from httprunner.ext.distributed import init_load_parser, main_load
 from httprunner.make import init_make_parser, main_make
 from httprunner.utils import init_stdout_logger, init_sentry_sdk
 
@@ -21,9 +27,61 @@ def init_parser_run(subparsers):
     return sub_parser_run
 
 
+# error budget arguments, converted to environment variables shared by pytest workers
+ERROR_BUDGET_ARGS = {
+    "--max-failure-rate": "HRUN_MAX_FAILURE_RATE",
+    "--min-testcases": "HRUN_MIN_TESTCASES",
+    "--max-conn-errors": "HRUN_MAX_CONSECUTIVE_CONN_ERRORS",
+    "--max-status-zero": "HRUN_MAX_STATUS_ZERO",
+    "--error-budget-action": "HRUN_ERROR_BUDGET_ACTION",
+}
+
+
+def ensure_error_budget_args(extra_args: List) -> List:
+    """pop error budget arguments and set them to environment variables"""
+    args = []
+    args_iter = iter(extra_args)
+    for item in args_iter:
+        if item not in ERROR_BUDGET_ARGS:
+            args.append(item)
+            continue
+
+        value = next(args_iter, None)
+        if value is None:
+            logger.error(f"missing value for argument {item}")
+            sys.exit(1)
+        os.environ[ERROR_BUDGET_ARGS[item]] = value
+
+    if any(env in os.environ for env in ERROR_BUDGET_ARGS.values()):
+        # counters of one run are shared by all pytest-xdist workers
+        os.environ.setdefault(
+            "HRUN_ERROR_BUDGET_DIR",
+            os.path.join(tempfile.gettempdir(), f"hrun-error-budget-{uuid.uuid4().hex}"),
+        )
+
+    return args
+
+
+def ensure_snapshot_args(extra_args: List) -> List:
+    """pop --update-snapshots and set it to environment variable"""
+    if "--update-snapshots" not in extra_args:
+        return extra_args
+
+    os.environ["HRUN_UPDATE_SNAPSHOTS"] = "true"
+    return [item for item in extra_args if item != "--update-snapshots"]
+
+
 def main_run(extra_args) -> enum.IntEnum:
     # keep compatibility with v2
     extra_args = ensure_cli_args(extra_args)
+    error_budget_dir_specified = "HRUN_ERROR_BUDGET_DIR" in os.environ
+    extra_args = ensure_error_budget_args(extra_args)
+    extra_args = ensure_snapshot_args(extra_args)
+
+    # run YAML/JSON testcases directly, without making pytest files
+    direct = "--direct" in extra_args
+    if direct:
+        extra_args = [item for item in extra_args if item != "--direct"]
 
     tests_path_list = []
     extra_args_new = []
@@ -40,17 +98,30 @@ def main_run(extra_args) -> enum.IntEnum:
         logger.error(f"No valid testcase path in cli arguments: {extra_args}")
         sys.exit(1)
 
-    testcase_path_list = main_make(tests_path_list)
+    if direct:
+        testcase_path_list = get_test_files(tests_path_list)
+        extra_args_new.extend(["-p", "httprunner.direct"])
+    else:
+        testcase_path_list = main_make(tests_path_list)
+
     if not testcase_path_list:
         logger.error("No valid testcases found, exit 1.")
         sys.exit(1)
 
+    # error budget outcomes, registered by entry point as well if installed
+    extra_args_new.extend(["-p", "httprunner.pytest_plugin"])
+
     if "--tb=short" not in extra_args_new:
         extra_args_new.append("--tb=short")
 
     extra_args_new.extend(testcase_path_list)
     logger.info(f"start to run tests with pytest. HttpRunner version: {__version__}")
-    return pytest.main(extra_args_new)
+    try:
+        return pytest.main(extra_args_new)
+    finally:
+        if not error_budget_dir_specified and "HRUN_ERROR_BUDGET_DIR" in os.environ:
+            # remove counters shared by workers of this run
+            shutil.rmtree(os.environ.pop("HRUN_ERROR_BUDGET_DIR"), ignore_errors=True)
 
 
 def main():
@@ -63,6 +134,7 @@ def main():
     subparsers = parser.add_subparsers(help="sub-command help")
     init_parser_run(subparsers)
     sub_parser_make = init_make_parser(subparsers)
+    sub_parser_load = init_load_parser(subparsers)
 
     if len(sys.argv) == 1:
         # httprunner
@@ -82,6 +154,9 @@ def main():
         elif sys.argv[1] == "make":
             # httprunner make
             sub_parser_make.print_help()
+        elif sys.argv[1] == "load":
+            # httprunner load
+            sub_parser_load.print_help()
         sys.exit(0)
     elif (
         len(sys.argv) == 3 and sys.argv[1] == "run" and sys.argv[2] in ["-h", "--help"]
@@ -116,7 +191,13 @@ def main():
     if sys.argv[1] == "run":
         sys.exit(main_run(extra_args))
     elif sys.argv[1] == "make":
+        if args.format_with_black:
+            os.environ["HRUN_MAKE_BLACK"] = "true"
+        if args.workers:
+            os.environ["HRUN_MAKE_WORKERS"] = str(args.workers)
         main_make(args.testcase_path, args.output_dir)
+    elif sys.argv[1] == "load":
+        sys.exit(main_load(args))
 
 
 def main_hrun_alias():
@@ -1,7 +1,9 @@
 import io
 import os
 import sys
+import tempfile
 import unittest
+from unittest import mock
 
 import pytest
 
@@ -60,3 +62,27 @@ class TestCli(unittest.TestCase):
         self.assertTrue(os.path.exists("examples/data/debugtalk.py"))
         self.assertTrue(os.path.exists("examples/data/a_b_c/T1_test.py"))
         self.assertTrue(os.path.exists("examples/data/a_b_c/T2_3_test.py"))
+
+    def test_remove_error_budget_dir(self):
+        budget_dirs = []
+
+        def run_pytest(args):
+            budget_dirs.append(os.environ["HRUN_ERROR_BUDGET_DIR"])
+            os.makedirs(budget_dirs[-1])
+            return 0
+
+        loader.project_meta = None
+        args = ["examples/data/a-b.c/2 3.yml", "--max-status-zero", "1"]
+        with mock.patch.dict(os.environ), mock.patch.object(
+            pytest, "main", side_effect=run_pytest
+        ):
+            main_run(list(args))
+            self.assertNotIn("HRUN_ERROR_BUDGET_DIR", os.environ)
+            self.assertFalse(os.path.exists(budget_dirs[0]))
+
+            # directory specified by user is kept
+            with tempfile.TemporaryDirectory() as temp_dir:
+                budget_dir = os.path.join(temp_dir, "budget")
+                os.environ["HRUN_ERROR_BUDGET_DIR"] = budget_dir
+                main_run(list(args))
+                self.assertTrue(os.path.isdir(budget_dir))
@@ -1,4 +1,3 @@
-import json
 import time
 
 import requests
@@ -12,6 +11,8 @@ from requests.exceptions import (
     RequestException,
 )
 
+from httprunner import jsonlib
+from httprunner.error_budget import get_error_budget
 from httprunner.models import RequestData, ResponseData
 from httprunner.models import SessionData, ReqRespData
 from httprunner.utils import lower_dict_keys, omit_long_data
@@ -26,14 +27,20 @@ class ApiResponse(Response):
         Response.raise_for_status(self)
 
 
-def get_req_resp_record(resp_obj: Response) -> ReqRespData:
-    """get request and response info from Response() object."""
+def get_req_resp_record(resp_obj: Response, omit_body: bool = False) -> ReqRespData:
+    """get request and response info from Response() object.
+
+    Args:
+        resp_obj: response object
+        omit_body: do not read response body, e.g. stream response
+
+    """
 
     def log_print(req_or_resp, r_type):
         msg = f"\n================== {r_type} details ==================\n"
         for key, value in req_or_resp.dict().items():
             if isinstance(value, dict) or isinstance(value, list):
-                value = json.dumps(value, indent=4, ensure_ascii=False)
+                value = jsonlib.dumps(value, indent=4, ensure_ascii=False)
 
             msg += "{:<8} : {}\n".format(key, value)
         logger.debug(msg)
@@ -45,8 +52,8 @@ def get_req_resp_record(resp_obj: Response) -> ReqRespData:
     request_body = resp_obj.request.body
     if request_body is not None:
         try:
-            request_body = json.loads(request_body)
-        except json.JSONDecodeError:
+            request_body = jsonlib.loads(request_body)
+        except jsonlib.JSONDecodeError:
             # str: a=1&b=2
             pass
         except UnicodeDecodeError:
@@ -77,13 +84,16 @@ def get_req_resp_record(resp_obj: Response) -> ReqRespData:
     lower_resp_headers = lower_dict_keys(resp_headers)
     content_type = lower_resp_headers.get("content-type", "")
 
-    if "image" in content_type:
+    if omit_body:
+        # response content is read by extractors on demand
+        response_body = "stream body (OMITTED)"
+    elif "image" in content_type:
         # response is image type, record bytes content only
         response_body = resp_obj.content
     else:
         try:
             # try to record json data
-            response_body = resp_obj.json()
+            response_body = jsonlib.loads_response(resp_obj)
         except ValueError:
             # only record at most 512 text charactors
             resp_text = resp_obj.text
@@ -171,12 +181,15 @@ class HttpSession(requests.Session):
         # timeout default to 120 seconds
         kwargs.setdefault("timeout", 120)
 
+        # stream specified by caller, response body is not recorded
+        stream = kwargs.get("stream", False)
         # set stream to True, in order to get client/server IP/Port
         kwargs["stream"] = True
 
         start_timestamp = time.time()
         response = self._send_request_safe_mode(method, url, **kwargs)
         response_time_ms = round((time.time() - start_timestamp) * 1000, 2)
+        get_error_budget().record_response(response.status_code)
 
         try:
             client_ip, client_port = response.raw._connection.sock.getsockname()
@@ -205,7 +218,8 @@ class HttpSession(requests.Session):
         # record request and response histories, include 30X redirection
         response_list = response.history + [response]
         self.data.req_resps = [
-            get_req_resp_record(resp_obj) for resp_obj in response_list
+            get_req_resp_record(resp_obj, omit_body=stream and resp_obj is response)
+            for resp_obj in response_list
         ]
 
         try:
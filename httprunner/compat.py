@@ -139,6 +139,7 @@ def _sort_step_by_custom_order(step: Dict) -> Dict:
     custom_order = [
         "name",
         "variables",
+        "repeat",
         "request",
         "testcase",
         "setup_hooks",
@@ -146,10 +147,39 @@ def _sort_step_by_custom_order(step: Dict) -> Dict:
         "extract",
         "validate",
         "validate_script",
+        "validate_stop_on_failure",
+        "snapshot",
     ]
     return sort_dict_by_custom_order(step, custom_order)
 
 
+def _convert_repeat(repeat: Union[int, Dict]) -> Dict:
+    """convert repeat shorthand to dict, e.g. 100 => {"times": 100}"""
+    if isinstance(repeat, int) and not isinstance(repeat, bool):
+        return {"times": repeat}
+    elif isinstance(repeat, Dict) and "times" in repeat:
+        return repeat
+
+    raise exceptions.TestCaseFormatError(f"Invalid teststep repeat: {repeat}")
+
+
+def _convert_snapshot(snapshot: Union[bool, Text, Dict]) -> Dict:
+    """convert snapshot shorthand to dict
+
+    Args:
+        snapshot: true, snapshot name, or {"name": ..., "ignore": [...], "fields": [...]}
+
+    """
+    if snapshot is True:
+        return {}
+    elif isinstance(snapshot, Text):
+        return {"name": snapshot}
+    elif isinstance(snapshot, Dict):
+        return snapshot
+
+    raise exceptions.TestCaseFormatError(f"Invalid teststep snapshot: {snapshot}")
+
+
 def _ensure_step_attachment(step: Dict) -> Dict:
     test_dict = {
         "name": step["name"],
@@ -161,6 +191,9 @@ def _ensure_step_attachment(step: Dict) -> Dict:
     if "variables" in step:
         test_dict["variables"] = step["variables"]
 
+    if "repeat" in step:
+        test_dict["repeat"] = _convert_repeat(step["repeat"])
+
     if "setup_hooks" in step:
         test_dict["setup_hooks"] = step["setup_hooks"]
 
@@ -183,6 +216,12 @@ def _ensure_step_attachment(step: Dict) -> Dict:
     if "validate_script" in step:
         test_dict["validate_script"] = step["validate_script"]
 
+    if "validate_stop_on_failure" in step:
+        test_dict["validate_stop_on_failure"] = step["validate_stop_on_failure"]
+
+    if step.get("snapshot") not in [None, False]:
+        test_dict["snapshot"] = _convert_snapshot(step["snapshot"])
+
     return test_dict
 
 
@@ -279,14 +318,15 @@ def _generate_conftest_for_summary(args: List):
         sys.exit(1)
 
     conftest_content = '''# NOTICE: Generated By HttpRunner.
-import json
 import os
 import time
 
 import pytest
 from loguru import logger
 
-from httprunner.utils import get_platform, ExtendJSONEncoder
+from httprunner import jsonlib
+from httprunner.error_budget import get_error_budget
+from httprunner.utils import get_platform
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -303,12 +343,13 @@ def session_fixture(request):
     summary = {
         "success": True,
         "stat": {
-            "testcases": {"total": 0, "success": 0, "fail": 0},
+            "testcases": {"total": 0, "success": 0, "fail": 0, "skipped": 0},
             "teststeps": {"total": 0, "failures": 0, "successes": 0},
         },
         "time": {"start_at": start_at, "duration": time.time() - start_at},
         "platform": get_platform(),
         "details": [],
+        "abort_reason": get_error_budget().exhausted_reason(),
     }
 
     for item in request.node.items:
@@ -316,18 +357,20 @@ def session_fixture(request):
         summary["success"] &= testcase_summary.success
 
         summary["stat"]["testcases"]["total"] += 1
-        summary["stat"]["teststeps"]["total"] += len(testcase_summary.step_results)
-        if testcase_summary.success:
+        if testcase_summary.abort_reason:
+            # not run because error budget exhausted
+            summary["stat"]["testcases"]["skipped"] += 1
+        elif testcase_summary.success:
             summary["stat"]["testcases"]["success"] += 1
-            summary["stat"]["teststeps"]["successes"] += len(
-                testcase_summary.step_results
-            )
         else:
             summary["stat"]["testcases"]["fail"] += 1
-            summary["stat"]["teststeps"]["successes"] += (
-                len(testcase_summary.step_results) - 1
-            )
-            summary["stat"]["teststeps"]["failures"] += 1
+
+        # step results may be partly retained, count with step counters
+        steps_total = testcase_summary.steps_total
+        steps_failed = testcase_summary.steps_failed
+        summary["stat"]["teststeps"]["total"] += steps_total
+        summary["stat"]["teststeps"]["successes"] += steps_total - steps_failed
+        summary["stat"]["teststeps"]["failures"] += steps_failed
 
         testcase_summary_json = testcase_summary.dict()
         testcase_summary_json["records"] = testcase_summary_json.pop("step_results")
@@ -338,7 +381,7 @@ def session_fixture(request):
     os.makedirs(summary_dir, exist_ok=True)
 
     with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=4, ensure_ascii=False, cls=ExtendJSONEncoder)
+        jsonlib.dump(summary, f, indent=4, ensure_ascii=False, default=repr)
 
     logger.info(f"generated task summary: {summary_path}")
 
@@ -1,9 +1,47 @@
+import json
 import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from typing import Dict
 
 from httprunner import compat, exceptions, loader
 from httprunner.utils import HTTP_BIN_URL
 
+SUMMARY_TESTCASE_CONTENT = """
+from httprunner import Config, HttpRunner
+from httprunner.exceptions import ValidationFailure
+from httprunner.models import IStep, StepResult
+
+
+class FakeStep(IStep):
+    retry_times = 0
+    retry_interval = 0
+
+    def __init__(self, name, success=True):
+        self.__name = name
+        self.__success = success
+
+    def name(self):
+        return self.__name
+
+    def run(self, runner):
+        if self.__success is None:
+            raise ValidationFailure(f"{self.__name} failed")
+        return StepResult(name=self.__name, success=self.__success)
+
+
+class TestCaseFailed(HttpRunner):
+    config = Config("failed").retain_step_results("none")
+    teststeps = [FakeStep("step1"), FakeStep("step2", False), FakeStep("step3")]
+
+
+class TestCaseRaised(HttpRunner):
+    config = Config("raised").retain_step_results("none")
+    teststeps = [FakeStep("step1"), FakeStep("step2", None), FakeStep("step3")]
+"""
+
 
 class TestCompat(unittest.TestCase):
     def setUp(self):
@@ -249,6 +287,53 @@ class TestCompat(unittest.TestCase):
             ],
         )
 
+    def __run_with_save_tests(self, **env) -> Dict:
+        with tempfile.TemporaryDirectory() as project_dir:
+            open(os.path.join(project_dir, "debugtalk.py"), "w").close()
+            test_path = os.path.join(project_dir, "summary_test.py")
+            with open(test_path, "w") as f:
+                f.write(SUMMARY_TESTCASE_CONTENT)
+
+            compat.ensure_cli_args([test_path, "--save-tests"])
+            subprocess.run(
+                [sys.executable, "-m", "pytest", "-p", "httprunner.pytest_plugin"]
+                + ["-p", "no:cacheprovider", test_path],
+                cwd=project_dir,
+                capture_output=True,
+                env=dict(os.environ, PYTHONPATH=os.getcwd(), **env),
+            )
+            summary_path = os.path.join(
+                project_dir, "logs", "summary_test.summary.json"
+            )
+            with open(summary_path, encoding="utf-8") as f:
+                summary = json.load(f)
+
+        loader.project_meta = None
+        return summary
+
+    def test_save_tests_summary_with_retention_none(self):
+        summary = self.__run_with_save_tests()
+        self.assertEqual(
+            summary["stat"]["testcases"],
+            {"total": 2, "success": 0, "fail": 2, "skipped": 0},
+        )
+        # steps not retained are counted, including step raised
+        self.assertEqual(
+            summary["stat"]["teststeps"], {"total": 5, "failures": 2, "successes": 3}
+        )
+        self.assertEqual(summary["details"][0]["records"], [])
+
+    def test_save_tests_summary_with_error_budget_exhausted(self):
+        summary = self.__run_with_save_tests(
+            HRUN_MAX_FAILURE_RATE="0", HRUN_MIN_TESTCASES="1"
+        )
+        # testcase after the failed one is skipped
+        self.assertEqual(
+            summary["stat"]["testcases"],
+            {"total": 2, "success": 0, "fail": 1, "skipped": 1},
+        )
+        self.assertEqual(summary["stat"]["teststeps"]["total"], 3)
+
     def test_ensure_file_path(self):
         self.assertEqual(
             compat.ensure_path_sep("demo\\test.yml"), os.sep.join(["demo", "test.yml"])
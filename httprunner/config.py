@@ -2,7 +2,14 @@ import copy
 import inspect
 from typing import Text
 
-from httprunner.models import TConfig, TConfigThrift, TConfigDB, ProtoType, VariablesMapping
+from httprunner.models import (
+    ProtoType,
+    RetentionEnum,
+    TConfig,
+    TConfigDB,
+    TConfigThrift,
+    VariablesMapping,
+)
 
 
 class ConfigThrift(object):
@@ -88,12 +95,14 @@ class ConfigDB(object):
 
 
 class Config(object):
-    def __init__(self, name: Text) -> None:
-        caller_frame = inspect.stack()[1]
+    def __init__(self, name: Text, path: Text = None) -> None:
+        if path is None:
+            # defined in pytest file, inspect.stack() reads source of all frames
+            path = inspect.currentframe().f_back.f_code.co_filename
         self.__name: Text = name
         self.__base_url: Text = ""
         self.__variables: VariablesMapping = {}
-        self.__config = TConfig(name=name, path=caller_frame.filename)
+        self.__config = TConfig(name=name, path=path)
 
     @property
     def name(self) -> Text:
@@ -120,6 +129,34 @@ class Config(object):
         self.__config.export = list(set(self.__config.export))
         return self
 
+    def retain_step_results(
+        self,
+        retention: RetentionEnum = RetentionEnum.ALL,
+        max_step_results: int = None,
+        keep_session_data: bool = True,
+    ) -> "Config":
+        """set step results retention policy of testcase summary
+
+        Args:
+            retention: all/failed/none, keep all, failed only or no step results
+            max_step_results: keep latest N step results at most
+            keep_session_data: keep request/response data in step results
+
+        """
+        self.__config.retention = RetentionEnum(retention)
+        self.__config.max_step_results = max_step_results
+        self.__config.keep_session_data = keep_session_data
+        return self
+
+    def deadline(self, seconds: float) -> "Config":
+        """set testcase time budget, including steps of referenced testcases
+
+        Each request timeout is clamped to the remaining time, and testcase fails
+        with DeadlineExceeded once the budget is used up.
+        """
+        self.__config.deadline = seconds
+        return self
+
     def struct(self) -> TConfig:
         self.__init()
         return self.__config
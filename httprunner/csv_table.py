@@ -0,0 +1,201 @@
+""" columnar CSV parameter source, loaded once and shared by testcases in a run.
+
+Values of each column are kept in one list, rows are built as dict on access, so
+large CSV files take much less memory than one dict per row. Loaded tables are
+cached by path, mtime and size of CSV file, and shared by all parameterize calls.
+
+Columns are strings by default, type can be annotated in header:
+
+    username,age:int,score:float,active:bool
+    test1,18,95.5,true
+
+Rows can be sliced while reading, rows after stop are never read:
+
+    ${parameterize(account.csv)}            all rows
+    ${parameterize(account.csv, 100)}       rows from 100
+    ${parameterize(account.csv, 0, 100)}    first 100 rows
+"""
+
+import csv
+import itertools
+import os
+from collections.abc import Sequence
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Text,
+    TextIO,
+    Tuple,
+)
+
+from httprunner import exceptions
+
+
+def _to_bool(value: Text) -> bool:
+    lower_value = value.strip().lower()
+    if lower_value in ["true", "1", "yes", "y", "on"]:
+        return True
+    if lower_value in ["false", "0", "no", "n", "off", ""]:
+        return False
+
+    raise ValueError(f"invalid bool value: {value}")
+
+
+COLUMN_TYPES: Dict[Text, Callable[[Text], Any]] = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": _to_bool,
+}
+
+# rows transposed to columns at a time when reading
+CHUNK_SIZE = 10000
+
+""" loaded csv tables, (path, start, stop) => (mtime, size, table)
+"""
+csv_tables_cache: Dict[Tuple, Tuple[int, int, "CsvTable"]] = {}
+
+
+def parse_header(header: List[Text]) -> Tuple[Tuple[Text, ...], Tuple[Callable, ...]]:
+    """split column names and types, e.g. ["name", "age:int"]
+    => ("name", "age"), (str, int)
+
+    Column name with unknown type suffix is kept as it is, e.g. "time:utc".
+    """
+    names, converters = [], []
+    for column in header:
+        name, sep, type_name = column.rpartition(":")
+        if sep and type_name.strip() in COLUMN_TYPES:
+            names.append(name.strip())
+            converters.append(COLUMN_TYPES[type_name.strip()])
+        else:
+            names.append(column)
+            converters.append(str)
+
+    return tuple(names), tuple(converters)
+
+
+def _read_rows(
+    f: TextIO, start: int, stop: Optional[int]
+) -> Tuple[Tuple[Text, ...], Tuple[Callable, ...], Iterator[List]]:
+    """read header and rows in [start, stop) of opened csv file, values not converted.
+    Blank rows are skipped and short rows are padded with None like csv.DictReader.
+    """
+    reader = csv.reader(f)
+    names, converters = parse_header(next(reader, []))
+    width = len(names)
+    rows = itertools.islice((row for row in reader if row), start, stop)
+    rows = (
+        row + [None] * (width - len(row)) if len(row) < width else row for row in rows
+    )
+    return names, converters, rows
+
+
+def _iter_column_chunks(
+    csv_file: Text,
+    names: Tuple[Text, ...],
+    converters: Tuple[Callable, ...],
+    rows: Iterator[List],
+) -> Iterator[List[List]]:
+    """transpose and convert rows to columns chunk by chunk, holding one chunk at most"""
+    for chunk in iter(lambda: list(itertools.islice(rows, CHUNK_SIZE)), []):
+        chunk_columns = []
+        for name, converter, values in zip(names, converters, zip(*chunk)):
+            if converter is not str:
+                try:
+                    values = [
+                        value if value is None else converter(value) for value in values
+                    ]
+                except ValueError as ex:
+                    raise exceptions.FileFormatError(
+                        f"invalid csv value in column {name}: {ex}\n"
+                        f"csv file: {csv_file}"
+                    )
+            chunk_columns.append(values)
+
+        yield chunk_columns
+
+
+def iter_csv_file(
+    csv_file: Text, start: int = 0, stop: Optional[int] = None
+) -> Iterator[Dict]:
+    """stream rows of csv file in dict format, without loading the whole file"""
+    with open(csv_file, encoding="utf-8", newline="") as f:
+        names, converters, rows = _read_rows(f, start, stop)
+        for chunk_columns in _iter_column_chunks(csv_file, names, converters, rows):
+            for values in zip(*chunk_columns):
+                yield dict(zip(names, values))
+
+
+class CsvTable(Sequence):
+    """read-only sequence of rows in dict format, stored in columns
+
+    It compares equal to list of dicts, use list(table) to get a modifiable list.
+    """
+
+    __slots__ = ("names", "columns")
+
+    def __init__(self, names: Tuple[Text, ...], columns: Tuple[List, ...]):
+        self.names = names
+        self.columns = columns
+
+    @classmethod
+    def load(
+        cls, csv_file: Text, start: int = 0, stop: Optional[int] = None
+    ) -> "CsvTable":
+        with open(csv_file, encoding="utf-8", newline="") as f:
+            names, converters, rows = _read_rows(f, start, stop)
+            columns = tuple([] for _ in names)
+            for chunk_columns in _iter_column_chunks(csv_file, names, converters, rows):
+                for column, values in zip(columns, chunk_columns):
+                    column.extend(values)
+
+        return cls(names, columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CsvTable(self.names, tuple(column[index] for column in self.columns))
+
+        return dict(zip(self.names, (column[index] for column in self.columns)))
+
+    def __iter__(self) -> Iterator[Dict]:
+        names = self.names
+        for values in zip(*self.columns):
+            yield dict(zip(names, values))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CsvTable):
+            return self.names == other.names and self.columns == other.columns
+        if isinstance(other, list):
+            return len(self) == len(other) and all(
+                row == other_row for row, other_row in zip(self, other)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> Text:
+        return f"CsvTable(columns={list(self.names)}, rows={len(self)})"
+
+
+def load_csv_table(
+    csv_file: Text, start: int = 0, stop: Optional[int] = None
+) -> CsvTable:
+    """load csv file as CsvTable, cached until csv file is modified"""
+    if start < 0 or (stop is not None and stop < start):
+        raise exceptions.ParamsError(f"invalid csv rows slice: [{start}, {stop})")
+
+    stat = os.stat(csv_file)
+    key = (csv_file, start, stop)
+    cached = csv_tables_cache.get(key)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    table = CsvTable.load(csv_file, start, stop)
+    csv_tables_cache[key] = (stat.st_mtime_ns, stat.st_size, table)
+    return table
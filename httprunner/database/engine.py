@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 import datetime
-import json
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from httprunner import jsonlib
+
 
 class DBEngine(object):
     def __init__(self, db_uri):
@@ -32,7 +33,7 @@ class DBEngine(object):
                 row[k] = v.strftime("%Y-%m-%d")
             elif isinstance(v, str):
                 try:
-                    row[k] = json.loads(v)
+                    row[k] = jsonlib.loads(v)
                 except ValueError:
                     pass
 
@@ -0,0 +1,376 @@
+""" run YAML/JSON testcases directly, without making pytest files.
+
+Loaded testcases are converted to HttpRunner subclasses in memory, with the same
+Config and Step chain style calls as pytest files generated by make, so there is
+no rendering, formatting, writing or importing of python code.
+
+    >>> from httprunner.direct import load_testcase_class
+    >>> load_testcase_class("request_methods/request_with_functions.yml")().test_start()
+
+As pytest plugin, YAML/JSON testcase files are collected natively, parameters,
+skip and marks of config work the same as generated pytest files:
+
+    $ hrun --direct examples/postman_echo/request_methods
+    $ pytest -p httprunner.direct examples/postman_echo/request_methods/hardcode.yml
+
+Plugin is imported by hrun before pytest starts, PYTEST_DONT_REWRITE avoids warning.
+"""
+
+import os
+import types
+from typing import Callable, Dict, List, Optional, Text, Type
+
+import pytest
+from loguru import logger
+
+from httprunner import exceptions
+from httprunner.compat import convert_variables, ensure_path_sep, ensure_testcase_v4
+from httprunner.config import Config
+from httprunner.loader import load_folder_files, load_test_file, validate_testcase
+from httprunner.make import (
+    convert_testcase_path,
+    ensure_ref_testcase,
+    ensure_test_content,
+    ensure_testcase_abs_path,
+    make_config_marks,
+    make_config_skip,
+)
+from httprunner.make_graph import format_reference_chain
+from httprunner.parser import parse_parameters
+from httprunner.response import uniform_validator
+from httprunner.runner import HttpRunner
+from httprunner.step import Step
+from httprunner.step_request import RunRequest
+from httprunner.step_testcase import RunTestCase
+
+""" cache converted testcase classes, testcase absolute path => HttpRunner subclass
+"""
+testcase_classes_mapping: Dict[Text, Type[HttpRunner]] = {}
+
+""" export of converted testcases, merged to steps referencing them
+"""
+testcase_export_mapping: Dict[Text, List[Text]] = {}
+
+""" absolute paths of testcases being converted, used to detect circular references
+"""
+testcases_loading_stack: List[Text] = []
+
+
+def make_config(config: Dict) -> Config:
+    """same as make_config_chain_style, but build Config object directly"""
+    config_obj = Config(config["name"], path=config["path"])
+
+    if config["variables"]:
+        config_obj.variables(**config["variables"])
+
+    if "base_url" in config:
+        config_obj.base_url(config["base_url"])
+
+    if "verify" in config:
+        config_obj.verify(config["verify"])
+
+    if "export" in config:
+        config_obj.export(*config["export"])
+
+    retention_keys = ["retention", "max_step_results", "keep_session_data"]
+    if any(key in config for key in retention_keys):
+        retention = {key: config[key] for key in retention_keys if key in config}
+        config_obj.retain_step_results(**retention)
+
+    if "deadline" in config:
+        config_obj.deadline(config["deadline"])
+
+    return config_obj
+
+
+def make_request(step: RunRequest, request: Dict):
+    """same as make_request_chain_style, but build request step directly"""
+    step = getattr(step, request["method"].lower())(request["url"])
+
+    if "params" in request:
+        step.with_params(**request["params"])
+
+    if "headers" in request:
+        step.with_headers(**request["headers"])
+
+    if "cookies" in request:
+        step.with_cookies(**request["cookies"])
+
+    if "data" in request:
+        step.with_data(request["data"])
+
+    if "json" in request:
+        step.with_json(request["json"])
+
+    if "timeout" in request:
+        step.set_timeout(request["timeout"])
+
+    if "verify" in request:
+        step.set_verify(request["verify"])
+
+    if "allow_redirects" in request:
+        step.set_allow_redirects(request["allow_redirects"])
+
+    if "stream" in request:
+        step.set_stream(request["stream"])
+
+    if "upload" in request:
+        step.upload(**request["upload"])
+
+    return step
+
+
+def __add_hooks(add_hook: Callable, hooks: List, hook_type: Text):
+    for hook in hooks:
+        if isinstance(hook, Text):
+            add_hook(hook)
+        elif isinstance(hook, Dict) and len(hook) == 1:
+            assign_var_name, hook_content = list(hook.items())[0]
+            add_hook(hook_content, assign_var_name)
+        else:
+            raise exceptions.TestCaseFormatError(f"Invalid {hook_type} hook: {hook}")
+
+
+def make_teststep(teststep: Dict) -> Step:
+    """same as make_teststep_chain_style, but build Step object directly,
+    referenced testcase of step should be converted to HttpRunner subclass already
+    """
+    if teststep.get("request"):
+        step = RunRequest(teststep["name"])
+    elif teststep.get("testcase"):
+        step = RunTestCase(teststep["name"])
+    else:
+        raise exceptions.TestCaseFormatError(f"Invalid teststep: {teststep}")
+
+    if "variables" in teststep:
+        step.with_variables(**teststep["variables"])
+
+    if "repeat" in teststep:
+        repeat = teststep["repeat"]
+        step.repeat(
+            repeat["times"],
+            warmup=repeat.get("warmup", 0),
+            concurrency=repeat.get("concurrency", 1),
+        )
+
+    if "setup_hooks" in teststep:
+        __add_hooks(step.setup_hook, teststep["setup_hooks"], "setup")
+
+    if teststep.get("request"):
+        step = make_request(step, teststep["request"])
+    elif teststep.get("testcase"):
+        step = step.call(teststep["testcase"])
+
+    if "teardown_hooks" in teststep:
+        __add_hooks(step.teardown_hook, teststep["teardown_hooks"], "teardown")
+
+    if "extract" in teststep:
+        # request step
+        step = step.extract()
+        for extract_name, extract_path in teststep["extract"].items():
+            if extract_path.startswith("regex:"):
+                step.with_regex(extract_path[6:], extract_name)
+            else:
+                step.with_jmespath(extract_path, extract_name)
+
+    if "export" in teststep:
+        # reference testcase step
+        step.export(*teststep["export"])
+
+    if teststep.get("validate_stop_on_failure"):
+        step = step.validate(stop_on_failure=True)
+    elif "validate" in teststep or "snapshot" in teststep:
+        step = step.validate()
+
+    for v in teststep.get("validate", []):
+        validator = uniform_validator(v)
+        assert_method = getattr(step, f"assert_{validator['assert']}")
+        if validator["message"]:
+            assert_method(validator["check"], validator["expect"], validator["message"])
+        else:
+            assert_method(validator["check"], validator["expect"])
+
+    if "snapshot" in teststep:
+        snapshot = teststep["snapshot"]
+        step.assert_snapshot(
+            **{
+                key: snapshot[key]
+                for key in ["name", "ignore", "fields"]
+                if snapshot.get(key)
+            }
+        )
+
+    return Step(step)
+
+
+def __make_test_start(config: Dict) -> Callable:
+    """test_start decorated with skip, marks and parameters, same as pytest file"""
+    if config.get("parameters"):
+
+        def test_start(self, param):
+            HttpRunner.test_start(self, param)
+
+    else:
+
+        def test_start(self):
+            HttpRunner.test_start(self)
+
+    decorators = []
+    skip = make_config_skip(config)
+    if skip:
+        decorators.append(pytest.mark.skip(reason=skip))
+    for mark in make_config_marks(config) or []:
+        decorators.append(getattr(pytest.mark, mark))
+    if config.get("parameters"):
+        parameters = parse_parameters(config["parameters"], config.get("path"))
+        decorators.append(pytest.mark.parametrize("param", parameters))
+
+    # applied bottom-up like decorators in pytest file
+    for decorator in reversed(decorators):
+        test_start = decorator(test_start)
+
+    return test_start
+
+
+def make_testcase_class(testcase: Dict) -> Type[HttpRunner]:
+    """convert testcase in dict to HttpRunner subclass, same as make_testcase"""
+    # ensure compatibility with testcase format v2/v3
+    testcase = ensure_testcase_v4(testcase)
+
+    # validate testcase format
+    validate_testcase(testcase)
+
+    testcase_abs_path = ensure_testcase_abs_path(testcase["config"]["path"])
+    if testcase_abs_path in testcase_classes_mapping:
+        return testcase_classes_mapping[testcase_abs_path]
+
+    logger.info(f"start to load testcase: {testcase_abs_path}")
+    _, testcase_cls_name = convert_testcase_path(testcase_abs_path)
+
+    config = testcase["config"]
+    config["path"] = testcase_abs_path
+    config["variables"] = convert_variables(
+        config.get("variables", {}), testcase_abs_path
+    )
+
+    if testcase_abs_path in testcases_loading_stack:
+        chain = testcases_loading_stack[
+            testcases_loading_stack.index(testcase_abs_path) :
+        ]
+        raise exceptions.CircularReferenceError(
+            format_reference_chain(chain + [testcase_abs_path])
+        )
+
+    teststeps = testcase["teststeps"]
+    testcases_loading_stack.append(testcase_abs_path)
+    try:
+        for teststep in teststeps:
+            if not teststep.get("testcase"):
+                continue
+
+            ref_testcase_path = ensure_testcase_abs_path(teststep["testcase"])
+            teststep["testcase"] = load_testcase_class(ref_testcase_path)
+
+            # override testcase export
+            ref_testcase_export = testcase_export_mapping[ref_testcase_path]
+            if ref_testcase_export:
+                step_export: List = teststep.setdefault("export", [])
+                step_export.extend(ref_testcase_export)
+                # remove duplicates in stable order
+                teststep["export"] = list(dict.fromkeys(step_export))
+    finally:
+        testcases_loading_stack.pop()
+
+    testcase_cls = type(
+        f"TestCase{testcase_cls_name}",
+        (HttpRunner,),
+        {
+            "test_start": __make_test_start(config),
+            "config": make_config(config),
+            "teststeps": [make_teststep(step) for step in teststeps],
+        },
+    )
+    testcase_classes_mapping[testcase_abs_path] = testcase_cls
+    testcase_export_mapping[testcase_abs_path] = config.get("export", [])
+    return testcase_cls
+
+
+def load_testcase_class(testcase_path: Text) -> Type[HttpRunner]:
+    """load YAML/JSON testcase file as HttpRunner subclass, cached by absolute path"""
+    testcase_path = ensure_path_sep(testcase_path)
+    if not os.path.isabs(testcase_path):
+        testcase_path = os.path.join(os.getcwd(), testcase_path)
+
+    testcase_abs_path = ensure_testcase_abs_path(testcase_path)
+    if testcase_abs_path in testcase_classes_mapping:
+        return testcase_classes_mapping[testcase_abs_path]
+
+    test_content = load_test_file(testcase_abs_path)
+    if not isinstance(test_content, Dict):
+        raise exceptions.TestCaseFormatError(
+            f"Invalid testcase file: {testcase_abs_path}"
+        )
+
+    test_content = ensure_ref_testcase(testcase_abs_path, test_content)
+    return make_testcase_class(test_content)
+
+
+def _load_test_file_class(test_file: Text) -> Optional[Type[HttpRunner]]:
+    """same as making test file, invalid test files are skipped with warning"""
+    try:
+        test_content = load_test_file(test_file)
+    except (exceptions.FileNotFound, exceptions.FileFormatError) as ex:
+        logger.warning(f"Invalid test file: {test_file}\n{type(ex).__name__}: {ex}")
+        return None
+
+    test_content = ensure_test_content(test_file, test_content)
+    if test_content is None:
+        return None
+
+    try:
+        return make_testcase_class(test_content)
+    except exceptions.TestCaseFormatError as ex:
+        logger.warning(f"Invalid testcase file: {test_file}\n{type(ex).__name__}: {ex}")
+        return None
+
+
+def get_test_files(tests_paths: List[Text]) -> List[Text]:
+    """YAML/JSON testcase files and pytest files to run directly,
+    pytest files generated from YAML/JSON testcases before are excluded
+    """
+    test_files = set()
+    for tests_path in tests_paths:
+        tests_path = ensure_path_sep(tests_path)
+        if not os.path.isabs(tests_path):
+            tests_path = os.path.join(os.getcwd(), tests_path)
+
+        if os.path.isdir(tests_path):
+            test_files.update(load_folder_files(tests_path))
+        elif os.path.isfile(tests_path):
+            test_files.add(tests_path)
+        else:
+            raise exceptions.TestcaseNotFound(f"Invalid tests path: {tests_path}")
+
+    generated_files = {
+        convert_testcase_path(test_file)[0]
+        for test_file in test_files
+        if not test_file.lower().endswith("_test.py")
+    }
+    return sorted(test_files - generated_files)
+
+
+class DirectTestCaseModule(pytest.Module):
+    """YAML/JSON testcase file collected as module of converted testcase class"""
+
+    def _getobj(self):
+        module = types.ModuleType(self.path.stem)
+        module.__file__ = str(self.path)
+        testcase_cls = _load_test_file_class(str(self.path))
+        if testcase_cls is not None:
+            setattr(module, testcase_cls.__name__, testcase_cls)
+        return module
+
+
+def pytest_collect_file(file_path, parent):
+    if file_path.suffix.lower() in [".yml", ".yaml", ".json"]:
+        return DirectTestCaseModule.from_parent(parent, path=file_path)
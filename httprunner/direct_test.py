@@ -0,0 +1,134 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from httprunner import direct, exceptions, loader
+from httprunner.direct import get_test_files, load_testcase_class
+from httprunner.make import (
+    convert_testcase_path,
+    main_make,
+    pytest_files_made_cache_mapping,
+)
+
+
+class TestDirect(unittest.TestCase):
+    def setUp(self) -> None:
+        direct.testcase_classes_mapping.clear()
+        direct.testcase_export_mapping.clear()
+        pytest_files_made_cache_mapping.clear()
+        loader.project_meta = None
+        self.request_methods_dir = os.path.join(
+            os.getcwd(), "examples", "postman_echo", "request_methods"
+        )
+
+    def test_load_testcase_class(self):
+        testcase_cls = load_testcase_class(
+            "examples/postman_echo/request_methods/request_with_testcase_reference.yml"
+        )
+        self.assertEqual(testcase_cls.__name__, "TestCaseRequestWithTestcaseReference")
+        self.assertEqual(
+            testcase_cls.config.path,
+            os.path.join(
+                self.request_methods_dir, "request_with_testcase_reference.yml"
+            ),
+        )
+        self.assertEqual(len(testcase_cls.teststeps), 2)
+
+        # referenced testcase is converted once
+        ref_testcase_cls = testcase_cls.teststeps[0].testcase
+        self.assertEqual(ref_testcase_cls.__name__, "TestCaseRequestWithFunctions")
+        self.assertIs(
+            load_testcase_class(
+                os.path.join(self.request_methods_dir, "request_with_functions.yml")
+            ),
+            ref_testcase_cls,
+        )
+        self.assertEqual(testcase_cls.teststeps[0].struct().export, ["foo3"])
+
+    def test_load_testcase_class_with_circular_reference(self):
+        def testcase(name, ref):
+            step = {"name": f"call {ref}", "testcase": ref}
+            return {"config": {"name": name}, "teststeps": [step]}
+
+        with tempfile.TemporaryDirectory() as project_dir:
+            open(os.path.join(project_dir, "debugtalk.py"), "w").close()
+            for name, ref in [("a", "b.json"), ("b", "a.json")]:
+                with open(os.path.join(project_dir, f"{name}.json"), "w") as f:
+                    json.dump(testcase(name, ref), f)
+
+            a_path = os.path.join(project_dir, "a.json")
+            b_path = os.path.join(project_dir, "b.json")
+            with self.assertRaises(exceptions.CircularReferenceError) as cm:
+                load_testcase_class(a_path)
+            self.assertEqual(
+                str(cm.exception),
+                f"circular testcase reference: {a_path} -> {b_path} -> {a_path}",
+            )
+            self.assertEqual(direct.testcases_loading_stack, [])
+            self.assertEqual(direct.testcase_classes_mapping, {})
+
+    def test_load_testcase_class_same_as_make(self):
+        for file_name in ["request_with_parameters", "validate_with_functions"]:
+            testcase_path = os.path.join(self.request_methods_dir, f"{file_name}.yml")
+            testcase_cls = load_testcase_class(testcase_path)
+
+            main_make([testcase_path])
+            testcase_python_path, _ = convert_testcase_path(testcase_path)
+            spec = importlib.util.spec_from_file_location(
+                file_name, testcase_python_path
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            made_testcase_cls = getattr(module, testcase_cls.__name__)
+
+            self.assertEqual(
+                testcase_cls.config.struct().dict(exclude={"path"}),
+                made_testcase_cls.config.struct().dict(exclude={"path"}),
+            )
+            self.assertEqual(
+                [step.struct() for step in testcase_cls.teststeps],
+                [step.struct() for step in made_testcase_cls.teststeps],
+            )
+
+    def test_get_test_files(self):
+        test_files = get_test_files(["examples/postman_echo/request_methods"])
+        self.assertIn(
+            os.path.join(self.request_methods_dir, "request_with_functions.yml"),
+            test_files,
+        )
+        # pytest file made from YAML testcase is not run again
+        self.assertNotIn(
+            os.path.join(self.request_methods_dir, "request_with_functions_test.py"),
+            test_files,
+        )
+        self.assertIn(
+            os.path.join(self.request_methods_dir, "request_with_retry_test.py"),
+            test_files,
+        )
+
+    def test_collect_testcase_file(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                "-p",
+                "httprunner.direct",
+                "--collect-only",
+                "-q",
+                os.path.join(self.request_methods_dir, "request_with_parameters.yml"),
+            ],
+            capture_output=True,
+            env=dict(os.environ, PYTHONPATH=os.getcwd()),
+        )
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertIn(
+            b"request_with_parameters.yml::TestCaseRequestWithParameters::"
+            b"test_start[param11]",
+            result.stdout,
+        )
+        self.assertIn(b"12 tests collected", result.stdout)
@@ -0,0 +1,255 @@
+""" run-level error budget, skip or abort remaining testcases when exhausted.
+
+When a dependency is down, every testcase would run until request timeout.
+Error budget watches testcase failure rate, consecutive connection errors and
+status-0 responses, once any threshold is exceeded, remaining testcases are
+skipped (or the whole pytest session is aborted).
+
+Thresholds are configured with environment variables, e.g. in config/.env:
+
+    HRUN_MAX_FAILURE_RATE=0.5             # abort when more than 50% testcases failed
+    HRUN_MIN_TESTCASES=20                 # failure rate applies after 20 testcases
+    HRUN_MAX_CONSECUTIVE_CONN_ERRORS=5    # 5 connection errors in a row
+    HRUN_MAX_STATUS_ZERO=10               # 10 status-0 responses in total
+    HRUN_ERROR_BUDGET_ACTION=skip         # skip remaining testcases, or abort
+
+With pytest-xdist, workers of one run share counters in HRUN_ERROR_BUDGET_DIR
+(default to a temp directory named by the xdist run uid), so the budget is
+evaluated on the whole run and exhausted by all workers consistently.
+"""
+
+import os
+import tempfile
+import threading
+from typing import Dict, Text, Union
+
+from loguru import logger
+
+from httprunner import jsonlib
+
+ABORT_MARKER_FILE = "aborted"
+
+
+def _get_env_number(name: Text, number_type=float) -> Union[int, float, None]:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return None
+
+    try:
+        return number_type(value)
+    except ValueError:
+        logger.warning(f"invalid error budget setting {name}={value}, ignored")
+        return None
+
+
+class ErrorBudget(object):
+    def __init__(
+        self,
+        max_failure_rate: float = None,
+        min_testcases: int = 10,
+        max_consecutive_conn_errors: int = None,
+        max_status_zero: int = None,
+        action: Text = "skip",
+        shared_dir: Text = None,
+        worker_id: Text = None,
+    ):
+        self.max_failure_rate = max_failure_rate
+        self.min_testcases = min_testcases
+        self.max_consecutive_conn_errors = max_consecutive_conn_errors
+        self.max_status_zero = max_status_zero
+        self.action = action
+        self.shared_dir = shared_dir
+        self.worker_id = worker_id or str(os.getpid())
+
+        self.testcases = 0
+        self.failures = 0
+        self.status_zero = 0
+        self.consecutive_conn_errors = 0
+        self.abort_reason: Text = ""
+        self.__lock = threading.Lock()
+
+        if self.shared_dir:
+            os.makedirs(self.shared_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "ErrorBudget":
+        shared_dir = os.getenv("HRUN_ERROR_BUDGET_DIR")
+        xdist_run_uid = os.getenv("PYTEST_XDIST_TESTRUNUID")
+        if not shared_dir and xdist_run_uid:
+            shared_dir = os.path.join(
+                tempfile.gettempdir(), f"hrun-error-budget-{xdist_run_uid}"
+            )
+
+        action = os.getenv("HRUN_ERROR_BUDGET_ACTION", "skip").lower()
+        if action not in ["skip", "abort"]:
+            logger.warning(f"invalid HRUN_ERROR_BUDGET_ACTION={action}, use skip")
+            action = "skip"
+
+        min_testcases = _get_env_number("HRUN_MIN_TESTCASES", int)
+        if min_testcases is None:
+            min_testcases = 10
+
+        return cls(
+            max_failure_rate=_get_env_number("HRUN_MAX_FAILURE_RATE"),
+            min_testcases=min_testcases,
+            max_consecutive_conn_errors=_get_env_number(
+                "HRUN_MAX_CONSECUTIVE_CONN_ERRORS", int
+            ),
+            max_status_zero=_get_env_number("HRUN_MAX_STATUS_ZERO", int),
+            action=action,
+            shared_dir=shared_dir,
+            worker_id=os.getenv("PYTEST_XDIST_WORKER"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return any(
+            threshold is not None
+            for threshold in [
+                self.max_failure_rate,
+                self.max_consecutive_conn_errors,
+                self.max_status_zero,
+            ]
+        )
+
+    def record_response(self, status_code: int):
+        """record response of each request, status code 0 means connection error"""
+        if not self.enabled:
+            return
+
+        with self.__lock:
+            if status_code == 0:
+                self.status_zero += 1
+                self.consecutive_conn_errors += 1
+            elif self.consecutive_conn_errors == 0:
+                # nothing changed
+                return
+            else:
+                self.consecutive_conn_errors = 0
+
+            self.__evaluate()
+
+    def record_testcase(self, success: bool):
+        if not self.enabled:
+            return
+
+        with self.__lock:
+            self.testcases += 1
+            if not success:
+                self.failures += 1
+
+            self.__evaluate()
+
+    def __counters(self) -> Dict:
+        return {
+            "testcases": self.testcases,
+            "failures": self.failures,
+            "status_zero": self.status_zero,
+            "consecutive_conn_errors": self.consecutive_conn_errors,
+        }
+
+    def __collect_counters(self) -> Dict:
+        """save counters of current worker, and sum up counters of all workers"""
+        counters = self.__counters()
+        if not self.shared_dir:
+            return counters
+
+        counters_path = os.path.join(self.shared_dir, f"{self.worker_id}.json")
+        tmp_path = f"{counters_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            jsonlib.dump(counters, f, ensure_ascii=False)
+        os.replace(tmp_path, counters_path)
+
+        total = {key: 0 for key in counters}
+        for file_name in os.listdir(self.shared_dir):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.shared_dir, file_name)) as f:
+                    worker_counters = jsonlib.load(f)
+            except (OSError, ValueError):
+                # being replaced by other worker
+                continue
+
+            for key, value in worker_counters.items():
+                if key == "consecutive_conn_errors":
+                    # connection errors in a row are counted per worker
+                    total[key] = max(total[key], value)
+                else:
+                    total[key] += value
+
+        return total
+
+    def __evaluate(self):
+        if self.abort_reason:
+            return
+
+        counters = self.__collect_counters()
+        reason = ""
+        if (
+            self.max_status_zero is not None
+            and counters["status_zero"] >= self.max_status_zero
+        ):
+            reason = (
+                f"status-0 responses {counters['status_zero']} "
+                f"reached limit {self.max_status_zero}"
+            )
+        elif (
+            self.max_consecutive_conn_errors is not None
+            and counters["consecutive_conn_errors"] >= self.max_consecutive_conn_errors
+        ):
+            reason = (
+                f"consecutive connection errors {counters['consecutive_conn_errors']} "
+                f"reached limit {self.max_consecutive_conn_errors}"
+            )
+        elif (
+            self.max_failure_rate is not None
+            and counters["testcases"] >= self.min_testcases
+            and counters["failures"] / counters["testcases"] > self.max_failure_rate
+        ):
+            reason = (
+                f"testcase failure rate {counters['failures']}/{counters['testcases']} "
+                f"exceeded limit {self.max_failure_rate}"
+            )
+
+        if reason:
+            self.__exhaust(reason)
+
+    def __exhaust(self, reason: Text):
+        self.abort_reason = reason
+        logger.error(f"error budget exhausted: {reason}")
+        if not self.shared_dir:
+            return
+
+        marker_path = os.path.join(self.shared_dir, ABORT_MARKER_FILE)
+        try:
+            # first worker exhausting the budget decides the reason
+            with open(marker_path, "x", encoding="utf-8") as f:
+                f.write(reason)
+        except FileExistsError:
+            with open(marker_path, encoding="utf-8") as f:
+                self.abort_reason = f.read() or reason
+
+    def exhausted_reason(self) -> Text:
+        """return abort reason if error budget exhausted, otherwise empty string"""
+        if self.abort_reason or not self.shared_dir:
+            return self.abort_reason
+
+        marker_path = os.path.join(self.shared_dir, ABORT_MARKER_FILE)
+        if os.path.isfile(marker_path):
+            with open(marker_path, encoding="utf-8") as f:
+                self.abort_reason = f.read()
+
+        return self.abort_reason
+
+
+error_budget: Union[ErrorBudget, None] = None
+
+
+def get_error_budget() -> ErrorBudget:
+    """get error budget of current process, thresholds are loaded from environment once"""
+    global error_budget
+    if error_budget is None:
+        error_budget = ErrorBudget.from_env()
+
+    return error_budget
@@ -0,0 +1,118 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from httprunner import Config, HttpRunner, error_budget
+from httprunner.error_budget import ErrorBudget
+from httprunner.exceptions import ErrorBudgetExhausted
+from httprunner.runner_test import FakeStep
+
+
+class CaseWithOneStep(HttpRunner):
+    config = Config("one step")
+    teststeps = [FakeStep("step1")]
+
+
+class TestErrorBudget(unittest.TestCase):
+    def setUp(self) -> None:
+        self.shared_dir = tempfile.mkdtemp(prefix="hrun-error-budget-test-")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.shared_dir, ignore_errors=True)
+        error_budget.error_budget = None
+
+    def test_disabled_by_default(self):
+        budget = ErrorBudget()
+        for _ in range(100):
+            budget.record_response(0)
+            budget.record_testcase(False)
+        self.assertEqual(budget.exhausted_reason(), "")
+
+    def test_consecutive_conn_errors(self):
+        budget = ErrorBudget(max_consecutive_conn_errors=3)
+        budget.record_response(0)
+        budget.record_response(0)
+        budget.record_response(200)
+        budget.record_response(0)
+        budget.record_response(0)
+        self.assertEqual(budget.exhausted_reason(), "")
+        budget.record_response(0)
+        self.assertIn("consecutive connection errors 3", budget.exhausted_reason())
+
+    def test_failure_rate(self):
+        budget = ErrorBudget(max_failure_rate=0.5, min_testcases=4)
+        for success in [False, False, False]:
+            budget.record_testcase(success)
+        # not enough testcases yet
+        self.assertEqual(budget.exhausted_reason(), "")
+        budget.record_testcase(True)
+        self.assertIn("failure rate 3/4", budget.exhausted_reason())
+
+    def test_from_env(self):
+        with mock.patch.dict(os.environ, {"HRUN_MAX_FAILURE_RATE": "0.5"}):
+            self.assertEqual(ErrorBudget.from_env().min_testcases, 10)
+            with mock.patch.dict(os.environ, {"HRUN_MIN_TESTCASES": "0"}):
+                budget = ErrorBudget.from_env()
+        self.assertEqual(budget.min_testcases, 0)
+        budget.record_testcase(False)
+        self.assertIn("failure rate 1/1", budget.exhausted_reason())
+
+    def test_shared_between_workers(self):
+        budget_gw0 = ErrorBudget(
+            max_status_zero=2, shared_dir=self.shared_dir, worker_id="gw0"
+        )
+        budget_gw1 = ErrorBudget(
+            max_status_zero=2, shared_dir=self.shared_dir, worker_id="gw1"
+        )
+        budget_gw0.record_response(0)
+        self.assertEqual(budget_gw1.exhausted_reason(), "")
+        budget_gw1.record_response(0)
+        self.assertIn("status-0 responses 2", budget_gw1.exhausted_reason())
+        self.assertEqual(budget_gw0.exhausted_reason(), budget_gw1.exhausted_reason())
+
+    def test_skip_testcase_when_exhausted(self):
+        error_budget.error_budget = ErrorBudget(max_status_zero=1)
+        error_budget.error_budget.record_response(0)
+
+        runner = CaseWithOneStep()
+        with self.assertRaises(ErrorBudgetExhausted):
+            runner.test_start()
+        summary = runner.get_summary()
+        self.assertEqual(summary.step_results, [])
+        self.assertIn("status-0 responses 1", summary.abort_reason)
+
+    def test_pytest_plugin(self):
+        test_path = os.path.join(self.shared_dir, "budget_test.py")
+        with open(test_path, "w") as f:
+            f.write(
+                "from httprunner.exceptions import ErrorBudgetExhausted\n"
+                "def test_exhausted():\n"
+                "    raise ErrorBudgetExhausted('budget exhausted')\n"
+                "def test_next():\n"
+                "    pass\n"
+            )
+
+        def run_pytest(action):
+            return subprocess.run(
+                [sys.executable, "-m", "pytest", "-p", "httprunner.pytest_plugin"]
+                + ["-p", "no:cacheprovider", test_path],
+                capture_output=True,
+                env=dict(
+                    os.environ,
+                    PYTHONPATH=os.getcwd(),
+                    HRUN_ERROR_BUDGET_ACTION=action,
+                ),
+            )
+
+        result = run_pytest("skip")
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertIn(b"1 passed, 1 skipped", result.stdout)
+
+        # session stops at exhausted testcase
+        result = run_pytest("abort")
+        self.assertEqual(result.returncode, 1, result.stdout)
+        self.assertIn(b"1 failed in", result.stdout)
@@ -27,6 +27,14 @@ class TeardownHooksFailure(MyBaseFailure):
     pass
 
 
+class ErrorBudgetExhausted(MyBaseFailure):
+    pass
+
+
+class DeadlineExceeded(MyBaseFailure):
+    pass
+
+
 """ error type exceptions
     these exceptions will mark test as error
 """
@@ -44,6 +52,10 @@ class TestCaseFormatError(FileFormatError):
     pass
 
 
+class CircularReferenceError(TestCaseFormatError):
+    pass
+
+
 class TestSuiteFormatError(FileFormatError):
     pass
 
@@ -0,0 +1,101 @@
+""" distributed load testing extension.
+
+Single host load is capped by its CPU and sockets, so load can be generated by
+several workers, coordinated by one master over tcp:
+
+- workers connect to master and wait
+- master packs testcases, referenced testcases, csv files, .env files and
+  debugtalk.py into a bundle, and sends it to each worker with assigned users
+- each worker makes the bundle to pytest files, runs its users in loop,
+  and streams aggregated histograms and counters back to master every second
+- master aggregates stats, stops workers when duration elapsed and prints report
+
+Start master, waiting for 2 workers, 20 users in total, run for 60 seconds:
+
+    $ httprunner load --master --expect-workers 2 -u 20 -t 60 testcases/demo.yml
+
+Start worker on each load host:
+
+    $ httprunner load --worker --master-host 192.168.1.10
+
+"""
+
+import sys
+
+from loguru import logger
+
+from httprunner.ext.distributed.master import Master, build_bundle
+from httprunner.ext.distributed.stats import RequestStats, StatsEntry
+from httprunner.ext.distributed.worker import Worker
+
+__all__ = [
+    "Master",
+    "Worker",
+    "RequestStats",
+    "StatsEntry",
+    "build_bundle",
+    "init_load_parser",
+    "main_load",
+]
+
+
+def init_load_parser(subparsers):
+    """load testing: parse command line options and run commands."""
+    parser = subparsers.add_parser(
+        "load",
+        help="Run distributed load testing with master/worker mode.",
+    )
+    parser.add_argument(
+        "testcase_path", nargs="*", help="Specify YAML/JSON testcase file/folder path"
+    )
+    role = parser.add_mutually_exclusive_group(required=True)
+    role.add_argument("--master", action="store_true", help="run as master")
+    role.add_argument("--worker", action="store_true", help="run as worker")
+    parser.add_argument(
+        "--master-host",
+        dest="master_host",
+        default="127.0.0.1",
+        help="master host for worker to connect",
+    )
+    parser.add_argument(
+        "--host", default="0.0.0.0", help="master bind host, default 0.0.0.0"
+    )
+    parser.add_argument(
+        "--port", type=int, default=5557, help="master port, default 5557"
+    )
+    parser.add_argument(
+        "--expect-workers",
+        dest="expect_workers",
+        type=int,
+        default=1,
+        help="number of workers master waits for before spawning",
+    )
+    parser.add_argument(
+        "-u", "--users", type=int, default=1, help="total number of users"
+    )
+    parser.add_argument(
+        "-t", "--duration", type=float, default=60, help="run time in seconds"
+    )
+
+    return parser
+
+
+def main_load(args) -> int:
+    if args.master:
+        if not args.testcase_path:
+            logger.error("No testcase path specified for master.")
+            sys.exit(1)
+
+        master = Master(
+            args.testcase_path,
+            expect_workers=args.expect_workers,
+            users=args.users,
+            duration=args.duration,
+            host=args.host,
+            port=args.port,
+        )
+        stats = master.run()
+        return 0 if stats.total.num_failures == 0 else 1
+
+    Worker(args.master_host, args.port).run()
+    return 0
@@ -0,0 +1,208 @@
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from httprunner import loader
+from httprunner.ext.distributed import Master, RequestStats, Worker, build_bundle
+from httprunner.ext.distributed import master as master_module
+from httprunner.ext.distributed.master import split_users
+from httprunner.ext.distributed.protocol import (
+    MSG_DONE,
+    MSG_HELLO,
+    MSG_SPAWN,
+    MSG_STOP,
+    MessageReader,
+    send_message,
+)
+from httprunner.ext.distributed.stats import round_response_time
+
+TESTCASE_CONTENT = """
+config:
+    name: loopback load testing
+    base_url: http://127.0.0.1:{port}
+
+teststeps:
+-
+    name: get json
+    request:
+        method: GET
+        url: /get
+    validate:
+        - eq: ["status_code", 200]
+        - eq: ["body.ok", "${{ok_value()}}"]
+"""
+
+DEBUGTALK_CONTENT = """
+def ok_value():
+    return True
+"""
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"ok": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_worker(port: int, worker_id: str):
+    Worker("127.0.0.1", port, worker_id=worker_id).run()
+
+
+class TestStats(unittest.TestCase):
+    def test_round_response_time(self):
+        self.assertEqual(round_response_time(58.7), 59)
+        self.assertEqual(round_response_time(147), 150)
+        self.assertEqual(round_response_time(3432), 3400)
+
+    def test_merge_stats(self):
+        stats_a = RequestStats()
+        stats_a.log_request("get", 10)
+        stats_a.log_request("get", 30, success=False)
+        stats_a.incr("testcases", 2)
+
+        stats_b = RequestStats.from_dict(
+            json.loads(json.dumps(stats_a.to_dict()))
+        )
+        stats_b.log_request("post", 500)
+        stats_b.merge(stats_a)
+
+        self.assertEqual(stats_b.total.num_requests, 5)
+        self.assertEqual(stats_b.total.num_failures, 2)
+        self.assertEqual(stats_b.entries["get"].num_requests, 4)
+        self.assertEqual(stats_b.entries["get"].min_response_time, 10)
+        self.assertEqual(stats_b.total.max_response_time, 500)
+        self.assertEqual(stats_b.counters["testcases"], 4)
+        self.assertEqual(stats_b.total.get_percentile(0.5), 30)
+        self.assertEqual(stats_b.total.get_percentile(1), 500)
+
+    def test_split_users(self):
+        self.assertEqual(split_users(5, 2), [3, 2])
+        self.assertEqual(split_users(4, 4), [1, 1, 1, 1])
+
+
+class TestMasterWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.project_dir = tempfile.mkdtemp(prefix="hrun-load-test-")
+        with open(os.path.join(self.project_dir, "debugtalk.py"), "w") as f:
+            f.write(DEBUGTALK_CONTENT)
+        os.makedirs(os.path.join(self.project_dir, "testcases"))
+        self.testcase_path = os.path.join(self.project_dir, "testcases", "load.yml")
+        with open(self.testcase_path, "w") as f:
+            f.write(TESTCASE_CONTENT.format(port=self.server.server_address[1]))
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.project_dir, ignore_errors=True)
+        if self.project_dir in sys.path:
+            sys.path.remove(self.project_dir)
+        loader.project_meta = None
+
+    def test_build_bundle(self):
+        bundle, testcases = build_bundle([self.testcase_path])
+        self.assertEqual(testcases, ["testcases/load.yml"])
+        self.assertIn("debugtalk.py", bundle)
+        self.assertIn("testcases/load.yml", bundle)
+
+    def test_run_with_local_workers(self):
+        master = Master(
+            [self.testcase_path],
+            expect_workers=2,
+            users=3,
+            duration=2,
+            host="127.0.0.1",
+            port=0,
+            wait_workers_timeout=60,
+        )
+        port = master.bind()
+
+        ctx = multiprocessing.get_context("spawn")
+        workers = [
+            ctx.Process(target=run_worker, args=(port, f"worker-{index}"))
+            for index in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            stats = master.run()
+        finally:
+            for worker in workers:
+                worker.join(timeout=30)
+
+        self.assertEqual(sorted(master.worker_stats), ["worker-0", "worker-1"])
+        for worker_stats in master.worker_stats.values():
+            self.assertGreater(worker_stats.total.num_requests, 0)
+        self.assertGreater(stats.total.num_requests, 0)
+        self.assertEqual(stats.total.num_failures, 0)
+        self.assertEqual(stats.entries["get json"].num_requests, stats.total.num_requests)
+        self.assertEqual(stats.counters["testcases"], stats.total.num_requests)
+        self.assertNotIn("testcase_failures", stats.counters)
+
+    def test_reject_silent_and_duplicate_workers(self):
+        master = Master(
+            [self.testcase_path],
+            expect_workers=2,
+            users=2,
+            duration=0.1,
+            host="127.0.0.1",
+            port=0,
+            wait_workers_timeout=30,
+        )
+        address = ("127.0.0.1", master.bind())
+        sockets = []
+
+        def connect(worker_id: str = None) -> MessageReader:
+            sock = socket.create_connection(address)
+            sockets.append(sock)
+            if worker_id:
+                send_message(sock, MSG_HELLO, worker_id=worker_id)
+            return MessageReader(sock)
+
+        with mock.patch.object(master_module, "HELLO_TIMEOUT", 0.5):
+            master_thread = threading.Thread(target=master.run)
+            master_thread.start()
+            try:
+                # silent peer is closed after hello timeout
+                connect()
+                worker_0 = connect("worker-0")
+                duplicate = connect("worker-0")
+                self.assertEqual(duplicate.read_message()["type"], MSG_STOP)
+                worker_1 = connect("worker-1")
+
+                for worker_id, reader in [
+                    ("worker-0", worker_0),
+                    ("worker-1", worker_1),
+                ]:
+                    self.assertEqual(reader.read_message()["type"], MSG_SPAWN)
+                    send_message(
+                        reader.sock,
+                        MSG_DONE,
+                        worker_id=worker_id,
+                        stats=RequestStats().to_dict(),
+                    )
+                master_thread.join(timeout=30)
+            finally:
+                for sock in sockets:
+                    sock.close()
+
+        self.assertFalse(master_thread.is_alive())
+        self.assertEqual(sorted(master.worker_stats), ["worker-0", "worker-1"])
@@ -0,0 +1,396 @@
+import os
+import re
+import selectors
+import socket
+import time
+from typing import Dict, List, Text, Tuple
+
+from loguru import logger
+
+from httprunner import exceptions
+from httprunner.compat import ensure_path_sep
+from httprunner.ext.distributed.protocol import (
+    MSG_DONE,
+    MSG_HELLO,
+    MSG_SPAWN,
+    MSG_STATS,
+    MSG_STOP,
+    MessageReader,
+    send_message,
+)
+from httprunner.ext.distributed.stats import RequestStats
+from httprunner.loader import load_folder_files, load_project_meta, load_test_file
+
+# csv file referenced in parameters, e.g. ${parameterize(account.csv)} or ${P(account.csv)}
+# or ${parameterize(account.csv, 0, 100)} with rows slice
+csv_regex_compile = re.compile(r"\$\{(?:parameterize|P)\(([^,)$]+)[^)$]*\)\}")
+
+# seconds to wait for hello message after a peer connected
+HELLO_TIMEOUT = 10
+
+
+def __read_text(path: Text) -> Text:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def __collect_test_files(
+    test_abs_path: Text, root_dir: Text, bundle: Dict[Text, Text]
+) -> List[Text]:
+    """add testcase file and its referenced testcases/csv files to bundle
+
+    Returns:
+        list: testcase paths relative to project root, referenced testcases excluded
+
+    """
+    if os.path.isdir(test_abs_path):
+        files_list = load_folder_files(test_abs_path)
+    else:
+        files_list = [test_abs_path]
+
+    entries = []
+    for file_path in files_list:
+        if not file_path.lower().endswith((".yml", ".yaml", ".json")):
+            continue
+
+        relative_path = __add_test_file(file_path, root_dir, bundle)
+        if relative_path:
+            entries.append(relative_path)
+
+    return entries
+
+
+def __add_test_file(file_path: Text, root_dir: Text, bundle: Dict[Text, Text]):
+    file_path = os.path.abspath(file_path)
+    if not file_path.startswith(root_dir + os.sep):
+        logger.warning(f"skip file out of project root {root_dir}: {file_path}")
+        return None
+
+    relative_path = file_path[len(root_dir) + 1 :].replace(os.sep, "/")
+    if relative_path in bundle:
+        return relative_path
+
+    bundle[relative_path] = __read_text(file_path)
+
+    try:
+        test_content = load_test_file(file_path)
+    except (exceptions.FileNotFound, exceptions.FileFormatError) as ex:
+        logger.warning(f"Invalid test file: {file_path}\n{type(ex).__name__}: {ex}")
+        return None
+
+    if not isinstance(test_content, Dict):
+        return None
+
+    config = test_content.get("config") or {}
+    parameters = config.get("parameters") if isinstance(config, Dict) else None
+    for csv_file in csv_regex_compile.findall(str(parameters or "")):
+        csv_path = os.path.join(root_dir, *csv_file.strip().split("/"))
+        if os.path.isfile(csv_path):
+            bundle[csv_file.strip()] = __read_text(csv_path)
+
+    # referenced testcases are located relative to project root
+    for step in test_content.get("teststeps") or []:
+        if not isinstance(step, Dict):
+            continue
+        ref_path = step.get("testcase") or step.get("api")
+        if isinstance(ref_path, Text):
+            ref_abs_path = os.path.join(root_dir, ensure_path_sep(ref_path))
+            if os.path.isfile(ref_abs_path):
+                __add_test_file(ref_abs_path, root_dir, bundle)
+
+    return relative_path
+
+
+def build_bundle(tests_paths: List[Text]) -> Tuple[Dict[Text, Text], List[Text]]:
+    """pack testcases, referenced testcases, csv files, .env files and debugtalk.py
+
+    Returns:
+        (dict, list): bundle mapping relative path to file content, testcases to run
+
+    """
+    if not tests_paths:
+        raise exceptions.ParamsError("no testcase path specified for load testing")
+
+    tests_abs_paths = [
+        os.path.abspath(ensure_path_sep(path)) for path in tests_paths
+    ]
+    project_meta = load_project_meta(tests_abs_paths[0], reload=True)
+    root_dir = project_meta.RootDir
+
+    bundle: Dict[Text, Text] = {}
+    if project_meta.debugtalk_path:
+        bundle["debugtalk.py"] = __read_text(project_meta.debugtalk_path)
+
+    config_dir = os.path.join(root_dir, "config")
+    if os.path.isdir(config_dir):
+        for file_name in os.listdir(config_dir):
+            if file_name.startswith(".env"):
+                bundle[f"config/{file_name}"] = __read_text(
+                    os.path.join(config_dir, file_name)
+                )
+
+    testcases = []
+    for test_abs_path in tests_abs_paths:
+        for relative_path in __collect_test_files(test_abs_path, root_dir, bundle):
+            if relative_path not in testcases:
+                testcases.append(relative_path)
+
+    if not testcases:
+        raise exceptions.TestcaseNotFound(f"no valid testcases in {tests_paths}")
+
+    return bundle, testcases
+
+
+def split_users(users: int, workers: int) -> List[int]:
+    """split users to workers as evenly as possible, e.g. 5 users, 2 workers => [3, 2]"""
+    base, remainder = divmod(users, workers)
+    return [base + 1 if index < remainder else base for index in range(workers)]
+
+
+def log_stats(stats: RequestStats, title: Text = "load testing stats"):
+    content_format = "{:<40} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8}\n"
+    content = f"\n==================== {title} ====================\n"
+    content += content_format.format(
+        "Name", "reqs", "fails", "avg", "min", "max", "p50", "p95", "p99"
+    )
+    for entry in list(stats.entries.values()) + [stats.total]:
+        content += content_format.format(
+            entry.name[:40],
+            entry.num_requests,
+            entry.num_failures,
+            round(entry.avg_response_time, 1),
+            round(entry.min_response_time or 0, 1),
+            round(entry.max_response_time, 1),
+            entry.get_percentile(0.5),
+            entry.get_percentile(0.95),
+            entry.get_percentile(0.99),
+        )
+
+    for counter, value in sorted(stats.counters.items()):
+        content += f"{counter}: {value}\n"
+    for error, occurrences in stats.errors.items():
+        content += f"error ({occurrences} times): {error}\n"
+
+    logger.info(content)
+
+
+class Master(object):
+    """distribute users to connected workers and aggregate their stats
+
+    Examples:
+        >>> master = Master(["testcases/demo.yml"], expect_workers=2, users=10, duration=60)
+        >>> master.bind()
+        >>> stats = master.run()
+
+    """
+
+    def __init__(
+        self,
+        tests_paths: List[Text],
+        expect_workers: int = 1,
+        users: int = 1,
+        duration: float = 60,
+        host: Text = "0.0.0.0",
+        port: int = 5557,
+        wait_workers_timeout: float = 60,
+        report_interval: float = 1.0,
+    ):
+        if expect_workers < 1:
+            raise exceptions.ParamsError("expect at least one worker")
+        if users < expect_workers:
+            raise exceptions.ParamsError(
+                f"users({users}) should not be less than workers({expect_workers})"
+            )
+
+        self.tests_paths = tests_paths
+        self.expect_workers = expect_workers
+        self.users = users
+        self.duration = duration
+        self.host = host
+        self.port = port
+        self.wait_workers_timeout = wait_workers_timeout
+        self.report_interval = report_interval
+
+        self.stats = RequestStats()
+        # worker_id => stats reported by that worker
+        self.worker_stats: Dict[Text, RequestStats] = {}
+        self.__server: socket.socket = None
+        self.__workers: Dict[socket.socket, Tuple[Text, MessageReader]] = {}
+
+    def bind(self) -> int:
+        """listen on host/port, return actual port (useful when port is 0)"""
+        self.__server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.__server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__server.bind((self.host, self.port))
+        self.__server.listen(self.expect_workers)
+        self.port = self.__server.getsockname()[1]
+        logger.info(f"master listening on {self.host}:{self.port}")
+        return self.port
+
+    def __wait_workers(self):
+        deadline = time.time() + self.wait_workers_timeout
+        while len(self.__workers) < self.expect_workers:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise exceptions.MyBaseError(
+                    f"only {len(self.__workers)}/{self.expect_workers} workers connected "
+                    f"in {self.wait_workers_timeout} seconds"
+                )
+
+            self.__server.settimeout(remaining)
+            try:
+                conn, address = self.__server.accept()
+            except socket.timeout:
+                continue
+
+            conn.settimeout(min(remaining, HELLO_TIMEOUT))
+            reader = MessageReader(conn)
+            try:
+                msg = reader.read_message()
+            except (OSError, ValueError) as ex:
+                # silent or closed peer, e.g. port scanning
+                logger.warning(f"no hello message from {address}: {ex}")
+                conn.close()
+                continue
+
+            if msg.get("type") != MSG_HELLO:
+                logger.warning(f"unexpected message from {address}: {msg}")
+                conn.close()
+                continue
+
+            worker_id = msg["worker_id"]
+            if any(worker_id == item[0] for item in self.__workers.values()):
+                logger.warning(f"reject worker {worker_id} from {address}, id in use")
+                try:
+                    send_message(conn, MSG_STOP)
+                except OSError:
+                    pass
+                conn.close()
+                continue
+
+            conn.settimeout(None)
+            self.__workers[conn] = (worker_id, reader)
+            self.worker_stats[worker_id] = RequestStats()
+            logger.info(
+                f"worker connected: {worker_id} from {address} "
+                f"({len(self.__workers)}/{self.expect_workers})"
+            )
+
+    def __spawn(self, bundle: Dict[Text, Text], testcases: List[Text]):
+        users_list = split_users(self.users, len(self.__workers))
+        for conn, users in zip(self.__workers, users_list):
+            worker_id, _ = self.__workers[conn]
+            logger.info(f"spawn {users} users on worker {worker_id}")
+            send_message(
+                conn,
+                MSG_SPAWN,
+                users=users,
+                duration=self.duration,
+                bundle=bundle,
+                testcases=testcases,
+            )
+
+    def __stop_workers(self):
+        for conn in list(self.__workers):
+            try:
+                send_message(conn, MSG_STOP)
+            except OSError:
+                pass
+
+    def __handle_message(self, worker_id: Text, msg: Dict, interval_stats):
+        if msg.get("type") not in [MSG_STATS, MSG_DONE]:
+            logger.warning(f"unexpected message from worker {worker_id}: {msg}")
+            return
+
+        stats = RequestStats.from_dict(msg["stats"])
+        self.stats.merge(stats)
+        self.worker_stats[worker_id].merge(stats)
+        interval_stats.merge(stats)
+
+    def run(self) -> RequestStats:
+        """wait for workers, spawn users and aggregate stats until all workers done"""
+        bundle, testcases = build_bundle(self.tests_paths)
+        logger.info(f"load testcases: {testcases}")
+
+        if self.__server is None:
+            self.bind()
+
+        try:
+            self.__wait_workers()
+            self.__spawn(bundle, testcases)
+
+            selector = selectors.DefaultSelector()
+            for conn in self.__workers:
+                selector.register(conn, selectors.EVENT_READ)
+
+            start_at = time.time()
+            stop_at = start_at + self.duration
+            # workers finish running iterations before reporting done
+            give_up_at = stop_at + max(10.0, self.duration)
+            stop_sent = False
+            done_workers = set()
+            interval_stats = RequestStats()
+            next_report_at = start_at + self.report_interval
+
+            while len(done_workers) < len(self.__workers):
+                now = time.time()
+                if now >= give_up_at:
+                    logger.error(
+                        f"workers not done in time: "
+                        f"{len(done_workers)}/{len(self.__workers)} workers done"
+                    )
+                    break
+
+                if now >= stop_at and not stop_sent:
+                    self.__stop_workers()
+                    stop_sent = True
+
+                if now >= next_report_at:
+                    rps = interval_stats.total.num_requests / self.report_interval
+                    logger.info(
+                        f"users: {self.users}, workers: {len(self.__workers)}, "
+                        f"current rps: {rps:.1f}, "
+                        f"total requests: {self.stats.total.num_requests}, "
+                        f"total failures: {self.stats.total.num_failures}"
+                    )
+                    interval_stats = RequestStats()
+                    next_report_at = now + self.report_interval
+
+                wake_up_at = min(next_report_at, give_up_at)
+                if not stop_sent:
+                    wake_up_at = min(wake_up_at, stop_at)
+
+                for key, _ in selector.select(timeout=max(0.01, wake_up_at - now)):
+                    conn = key.fileobj
+                    worker_id, reader = self.__workers[conn]
+                    try:
+                        messages = reader.read_available()
+                    except (ConnectionError, OSError) as ex:
+                        logger.error(f"worker {worker_id} disconnected: {ex}")
+                        selector.unregister(conn)
+                        done_workers.add(worker_id)
+                        continue
+
+                    for msg in messages:
+                        self.__handle_message(worker_id, msg, interval_stats)
+                        if msg.get("type") == MSG_DONE:
+                            logger.info(f"worker done: {worker_id}")
+                            selector.unregister(conn)
+                            done_workers.add(worker_id)
+
+            selector.close()
+        finally:
+            self.close()
+
+        log_stats(self.stats)
+        return self.stats
+
+    def close(self):
+        for conn in list(self.__workers):
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+        if self.__server is not None:
+            self.__server.close()
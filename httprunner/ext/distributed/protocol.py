@@ -0,0 +1,67 @@
+""" master/worker wire protocol: one json message per line over tcp.
+
+worker => master
+    {"type": "hello", "worker_id": "..."}
+    {"type": "stats", "worker_id": "...", "stats": {...}}
+    {"type": "done", "worker_id": "...", "stats": {...}}
+
+master => worker
+    {"type": "spawn", "users": 5, "duration": 60, "bundle": {...}, "testcases": [...]}
+    {"type": "stop"}  # also rejects worker with worker_id in use
+"""
+
+import socket
+from typing import Dict, List, Text
+
+from httprunner import jsonlib
+
+MSG_HELLO = "hello"
+MSG_SPAWN = "spawn"
+MSG_STATS = "stats"
+MSG_DONE = "done"
+MSG_STOP = "stop"
+
+
+def send_message(sock: socket.socket, msg_type: Text, **data):
+    data["type"] = msg_type
+    payload = jsonlib.dumps(data, ensure_ascii=False) + "\n"
+    sock.sendall(payload.encode("utf-8"))
+
+
+class MessageReader(object):
+    """buffer received bytes and split them into json messages"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.__buffer = b""
+
+    def read_available(self) -> List[Dict]:
+        """read once from socket, return complete messages received so far
+
+        Raises:
+            ConnectionError: peer closed the connection.
+
+        """
+        chunk = self.sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("connection closed by peer")
+
+        self.__buffer += chunk
+        messages = []
+        while b"\n" in self.__buffer:
+            line, self.__buffer = self.__buffer.split(b"\n", 1)
+            if line.strip():
+                messages.append(jsonlib.loads(line))
+
+        return messages
+
+    def read_message(self) -> Dict:
+        """block until one complete message received"""
+        while b"\n" not in self.__buffer:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("connection closed by peer")
+            self.__buffer += chunk
+
+        line, self.__buffer = self.__buffer.split(b"\n", 1)
+        return jsonlib.loads(line)
@@ -0,0 +1,198 @@
+""" aggregated request statistics for distributed load runs.
+
+Response times are kept in a rounded histogram, so stats collected by many
+workers can be merged by the master without shipping every single sample.
+"""
+
+from typing import Dict, Text, Union
+
+
+def round_response_time(response_time_ms: float) -> int:
+    """round response time to histogram bucket, keep two significant digits at most
+
+    Examples:
+        >>> round_response_time(58.7)
+        59
+        >>> round_response_time(147)
+        150
+        >>> round_response_time(3432)
+        3400
+
+    """
+    if response_time_ms < 100:
+        return int(round(response_time_ms))
+    elif response_time_ms < 1000:
+        return int(round(response_time_ms, -1))
+    elif response_time_ms < 10000:
+        return int(round(response_time_ms, -2))
+    else:
+        return int(round(response_time_ms, -3))
+
+
+class StatsEntry(object):
+    """request stats of one name, e.g. teststep name or total"""
+
+    def __init__(self, name: Text):
+        self.name = name
+        self.num_requests = 0
+        self.num_failures = 0
+        self.total_response_time = 0.0
+        self.min_response_time: Union[float, None] = None
+        self.max_response_time = 0.0
+        self.total_content_length = 0
+        # rounded response time (ms) => count
+        self.response_times: Dict[int, int] = {}
+
+    def log(self, response_time_ms: float, content_length: int = 0, success=True):
+        self.num_requests += 1
+        if not success:
+            self.num_failures += 1
+
+        self.total_response_time += response_time_ms
+        if self.min_response_time is None:
+            self.min_response_time = response_time_ms
+        else:
+            self.min_response_time = min(self.min_response_time, response_time_ms)
+        self.max_response_time = max(self.max_response_time, response_time_ms)
+        self.total_content_length += content_length
+
+        bucket = round_response_time(response_time_ms)
+        self.response_times[bucket] = self.response_times.get(bucket, 0) + 1
+
+    def merge(self, other: "StatsEntry"):
+        self.num_requests += other.num_requests
+        self.num_failures += other.num_failures
+        self.total_response_time += other.total_response_time
+        if other.min_response_time is not None:
+            if self.min_response_time is None:
+                self.min_response_time = other.min_response_time
+            else:
+                self.min_response_time = min(
+                    self.min_response_time, other.min_response_time
+                )
+        self.max_response_time = max(self.max_response_time, other.max_response_time)
+        self.total_content_length += other.total_content_length
+        for bucket, count in other.response_times.items():
+            self.response_times[bucket] = self.response_times.get(bucket, 0) + count
+
+    @property
+    def avg_response_time(self) -> float:
+        if not self.num_requests:
+            return 0.0
+        return self.total_response_time / self.num_requests
+
+    @property
+    def fail_ratio(self) -> float:
+        if not self.num_requests:
+            return 0.0
+        return self.num_failures / self.num_requests
+
+    def get_percentile(self, percent: float) -> int:
+        """get response time (ms) percentile from histogram, percent in range (0, 1]"""
+        if not self.num_requests:
+            return 0
+
+        target = self.num_requests * percent
+        processed = 0
+        for bucket in sorted(self.response_times):
+            processed += self.response_times[bucket]
+            if processed >= target:
+                return bucket
+
+        return max(self.response_times)
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "num_requests": self.num_requests,
+            "num_failures": self.num_failures,
+            "total_response_time": self.total_response_time,
+            "min_response_time": self.min_response_time,
+            "max_response_time": self.max_response_time,
+            "total_content_length": self.total_content_length,
+            # json object keys must be strings
+            "response_times": {
+                str(bucket): count for bucket, count in self.response_times.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StatsEntry":
+        entry = cls(data["name"])
+        entry.num_requests = data["num_requests"]
+        entry.num_failures = data["num_failures"]
+        entry.total_response_time = data["total_response_time"]
+        entry.min_response_time = data["min_response_time"]
+        entry.max_response_time = data["max_response_time"]
+        entry.total_content_length = data["total_content_length"]
+        entry.response_times = {
+            int(bucket): count for bucket, count in data["response_times"].items()
+        }
+        return entry
+
+
+class RequestStats(object):
+    """request stats grouped by name, plus total and custom counters"""
+
+    def __init__(self):
+        self.entries: Dict[Text, StatsEntry] = {}
+        self.total = StatsEntry("Aggregated")
+        # e.g. testcases, testcase_failures
+        self.counters: Dict[Text, int] = {}
+        # error message => occurrences
+        self.errors: Dict[Text, int] = {}
+
+    def log_request(
+        self,
+        name: Text,
+        response_time_ms: float,
+        content_length: int = 0,
+        success: bool = True,
+    ):
+        entry = self.entries.get(name)
+        if entry is None:
+            entry = self.entries[name] = StatsEntry(name)
+
+        entry.log(response_time_ms, content_length, success)
+        self.total.log(response_time_ms, content_length, success)
+
+    def log_error(self, error: Text):
+        self.errors[error] = self.errors.get(error, 0) + 1
+
+    def incr(self, counter: Text, value: int = 1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def merge(self, other: "RequestStats"):
+        for name, entry in other.entries.items():
+            if name not in self.entries:
+                self.entries[name] = StatsEntry(name)
+            self.entries[name].merge(entry)
+
+        self.total.merge(other.total)
+        for counter, value in other.counters.items():
+            self.incr(counter, value)
+        for error, occurrences in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + occurrences
+
+    def is_empty(self) -> bool:
+        return not (self.total.num_requests or self.counters or self.errors)
+
+    def to_dict(self) -> Dict:
+        return {
+            "entries": [entry.to_dict() for entry in self.entries.values()],
+            "total": self.total.to_dict(),
+            "counters": dict(self.counters),
+            "errors": dict(self.errors),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RequestStats":
+        stats = cls()
+        for entry_data in data["entries"]:
+            entry = StatsEntry.from_dict(entry_data)
+            stats.entries[entry.name] = entry
+
+        stats.total = StatsEntry.from_dict(data["total"])
+        stats.counters = dict(data["counters"])
+        stats.errors = dict(data["errors"])
+        return stats
@@ -0,0 +1,263 @@
+import importlib.util
+import os
+import select
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, List, Text, Tuple
+
+from loguru import logger
+
+from httprunner import loader
+from httprunner.ext.distributed.protocol import (
+    MSG_DONE,
+    MSG_HELLO,
+    MSG_SPAWN,
+    MSG_STATS,
+    MSG_STOP,
+    MessageReader,
+    send_message,
+)
+from httprunner.ext.distributed.stats import RequestStats
+from httprunner.make import main_make
+from httprunner.models import SessionData, StepResult
+from httprunner.runner import HttpRunner
+
+
+def unpack_bundle(bundle: Dict[Text, Text], workspace: Text):
+    """write bundle files into workspace, keep relative paths"""
+    for relative_path, content in bundle.items():
+        file_path = os.path.join(workspace, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+def __get_parametrize_params(testcase_cls) -> List:
+    """get params of @pytest.mark.parametrize("param", Parameters(...)) on test_start"""
+    for mark in getattr(testcase_cls.test_start, "pytestmark", []):
+        if mark.name == "parametrize" and len(mark.args) >= 2:
+            return list(mark.args[1])
+
+    return []
+
+
+def load_testcase_classes(
+    workspace: Text, testcases: List[Text]
+) -> List[Tuple[type, List]]:
+    """make testcases in workspace to pytest files and import HttpRunner classes
+
+    Returns:
+        list: (testcase class, parameters list) pairs
+
+    """
+    testcase_paths = [
+        os.path.join(workspace, *testcase.split("/")) for testcase in testcases
+    ]
+    # project meta of workspace, debugtalk.py is reloaded from workspace
+    loader.load_project_meta(testcase_paths[0], reload=True)
+    pytest_files = main_make(testcase_paths)
+
+    testcase_classes = []
+    for pytest_file in sorted(pytest_files):
+        module_name = f"hrun_load_{uuid.uuid4().hex}"
+        spec = importlib.util.spec_from_file_location(module_name, pytest_file)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        for item in vars(module).values():
+            if (
+                isinstance(item, type)
+                and issubclass(item, HttpRunner)
+                and item.__module__ == module_name
+            ):
+                testcase_classes.append((item, __get_parametrize_params(item)))
+
+    return testcase_classes
+
+
+class Worker(object):
+    """connect to master, run assigned users and report stats every second
+
+    Examples:
+        >>> Worker("127.0.0.1", 5557).run()
+
+    """
+
+    def __init__(
+        self,
+        master_host: Text,
+        master_port: int,
+        worker_id: Text = None,
+        report_interval: float = 1.0,
+        connect_timeout: float = 30,
+    ):
+        self.master_host = master_host
+        self.master_port = master_port
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.report_interval = report_interval
+        self.connect_timeout = connect_timeout
+
+        self.stats = RequestStats()
+        self.__stats_lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__testcases: List[Tuple[type, List]] = []
+
+    def __connect(self) -> socket.socket:
+        deadline = time.time() + self.connect_timeout
+        while True:
+            try:
+                return socket.create_connection((self.master_host, self.master_port))
+            except OSError as ex:
+                if time.time() >= deadline:
+                    raise
+                logger.warning(f"failed to connect master, retry later: {ex}")
+                time.sleep(0.5)
+
+    def __record_step_results(self, step_results: List[StepResult]):
+        for step_result in step_results:
+            if step_result.step_type == "testcase" and isinstance(
+                step_result.data, list
+            ):
+                self.__record_step_results(step_result.data)
+                continue
+
+            if isinstance(step_result.data, SessionData) and step_result.step_type in [
+                "request"
+            ]:
+                response_time_ms = step_result.data.stat.response_time_ms
+            else:
+                response_time_ms = step_result.elapsed * 1000
+
+            self.stats.log_request(
+                step_result.name,
+                response_time_ms,
+                int(step_result.content_size or 0),
+                step_result.success,
+            )
+
+    def __run_testcase(self, testcase_cls: type, param: Dict = None):
+        runner = testcase_cls()
+        error = None
+        try:
+            if param is None:
+                runner.test_start()
+            else:
+                runner.test_start(param)
+        except Exception as ex:
+            error = f"{type(ex).__name__}: {str(ex).splitlines()[0] if str(ex) else ''}"
+
+        try:
+            summary = runner.get_summary()
+            step_results, steps_total = summary.step_results, summary.steps_total
+        except Exception:
+            step_results, steps_total = [], 0
+
+        with self.__stats_lock:
+            self.stats.incr("testcases")
+            self.__record_step_results(step_results)
+            if error is None:
+                return
+
+            self.stats.incr("testcase_failures")
+            self.stats.log_error(error)
+            # the failed step raised without step result, counted as the last step
+            if 0 < steps_total <= len(runner.teststeps):
+                failed_step = runner.teststeps[steps_total - 1]
+                self.stats.log_request(
+                    failed_step.name(),
+                    runner.session.data.stat.response_time_ms,
+                    int(runner.session.data.stat.content_size),
+                    False,
+                )
+
+    def __user_loop(self, user_index: int):
+        iteration = user_index
+        while not self.__stop_event.is_set():
+            testcase_cls, params = self.__testcases[iteration % len(self.__testcases)]
+            param = params[iteration % len(params)] if params else None
+            iteration += 1
+            try:
+                self.__run_testcase(testcase_cls, param)
+            except Exception as ex:
+                logger.error(f"unexpected error in user {user_index}: {ex}")
+
+    def __pop_stats(self) -> RequestStats:
+        with self.__stats_lock:
+            stats, self.stats = self.stats, RequestStats()
+        return stats
+
+    def run(self) -> RequestStats:
+        """run until master sends stop or duration elapsed, return stats of this worker"""
+        # testcase log files are useless in load testing, and will be created lazily
+        os.environ.setdefault("LOGGER_FILE_LEVEL", "CRITICAL")
+
+        sock = self.__connect()
+        reader = MessageReader(sock)
+        send_message(sock, MSG_HELLO, worker_id=self.worker_id)
+        logger.info(f"worker {self.worker_id} connected to master")
+
+        msg = reader.read_message()
+        if msg.get("type") != MSG_SPAWN:
+            logger.info(f"worker {self.worker_id} got {msg.get('type')}, quit")
+            sock.close()
+            return RequestStats()
+
+        workspace = tempfile.mkdtemp(prefix="hrun-worker-")
+        total_stats = RequestStats()
+        users: List[threading.Thread] = []
+        try:
+            unpack_bundle(msg["bundle"], workspace)
+            self.__testcases = load_testcase_classes(workspace, msg["testcases"])
+            logger.info(
+                f"worker {self.worker_id} spawn {msg['users']} users "
+                f"for {len(self.__testcases)} testcases"
+            )
+
+            for user_index in range(msg["users"]):
+                user = threading.Thread(
+                    target=self.__user_loop, args=(user_index,), daemon=True
+                )
+                user.start()
+                users.append(user)
+
+            stop_at = time.time() + msg["duration"]
+            while not self.__stop_event.is_set():
+                readable, _, _ = select.select([sock], [], [], self.report_interval)
+                if readable:
+                    for received in reader.read_available():
+                        if received.get("type") == MSG_STOP:
+                            self.__stop_event.set()
+
+                if time.time() >= stop_at:
+                    self.__stop_event.set()
+
+                stats = self.__pop_stats()
+                total_stats.merge(stats)
+                if not stats.is_empty():
+                    send_message(
+                        sock, MSG_STATS, worker_id=self.worker_id, stats=stats.to_dict()
+                    )
+        except ConnectionError as ex:
+            logger.error(f"lost connection to master: {ex}")
+            self.__stop_event.set()
+        finally:
+            self.__stop_event.set()
+            for user in users:
+                user.join()
+
+            stats = self.__pop_stats()
+            total_stats.merge(stats)
+            try:
+                send_message(
+                    sock, MSG_DONE, worker_id=self.worker_id, stats=stats.to_dict()
+                )
+            except OSError:
+                pass
+            sock.close()
+            shutil.rmtree(workspace, ignore_errors=True)
+
+        return total_stats
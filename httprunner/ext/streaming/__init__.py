@@ -0,0 +1,192 @@
+""" streaming json extraction extension.
+
+Extracting a few fields from a huge json response body normally requires decoding
+the whole document. With stream enabled on a request step, simple body paths are
+extracted by parsing the response incrementally, and parsing stops as soon as
+all requested paths are found.
+
+If you want to use this extension, you should install the following dependency first.
+
+- ijson
+
+Then you can enable stream in request:
+
+    - test:
+        name: export all orders
+        request:
+            url: /orders/export
+            method: GET
+            stream: true
+        extract:
+            total: body.meta.total
+            first_id: body.items[0].id
+
+Simple paths are made of plain field names and non-negative indexes, e.g.
+body.meta.total, body.items[0].id. Other expressions, regex extractors and
+validators on body fall back to decoding the full response content.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Text, Tuple, Union
+
+from loguru import logger
+from requests import Response
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+
+    STREAMING_READY = True
+except ModuleNotFoundError:
+    STREAMING_READY = False
+
+# body.meta.total, body.items[0].id
+SIMPLE_PATH_REGEX = re.compile(r"^body(?:\.[A-Za-z_][A-Za-z0-9_]*|\[\d+\])+$")
+PATH_COMPONENT_REGEX = re.compile(r"\.([A-Za-z_][A-Za-z0-9_]*)|\[(\d+)\]")
+
+PathComponents = Tuple[Union[Text, int], ...]
+
+
+def parse_simple_path(expr: Text) -> Union[PathComponents, None]:
+    """parse simple body path to components, return None if expression is not simple
+
+    Examples:
+        >>> parse_simple_path("body.items[0].id")
+        ("items", 0, "id")
+
+    """
+    if not SIMPLE_PATH_REGEX.match(expr):
+        return None
+
+    return tuple(
+        name if name else int(index)
+        for name, index in PATH_COMPONENT_REGEX.findall(expr[len("body") :])
+    )
+
+
+class ResponseStreamReader(object):
+    """file-like reader over response content chunks
+
+    Consumed bytes are kept, so that the full content can be restored when
+    decoding the whole response is required afterwards.
+    """
+
+    def __init__(self, resp: Response, chunk_size: int = 64 * 1024):
+        self.__resp = resp
+        self.__chunks = resp.iter_content(chunk_size)
+        self.__consumed: List[bytes] = []
+
+    def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            # ijson checks type of content with empty read
+            return b""
+
+        chunk = next(self.__chunks, b"")
+        self.__consumed.append(chunk)
+        return chunk
+
+    def restore_content(self) -> bytes:
+        """read remaining content, and set full content back to response"""
+        content = b"".join(self.__consumed) + b"".join(self.__chunks)
+        self.__consumed = [content]
+        self.__resp._content = content
+        self.__resp._content_consumed = True
+        return content
+
+
+class _Frame(object):
+    __slots__ = ("is_array", "key")
+
+    def __init__(self, is_array: bool):
+        self.is_array = is_array
+        self.key: Union[Text, int, None] = -1 if is_array else None
+
+
+def stream_extract(
+    reader, paths: Iterable[PathComponents]
+) -> Dict[PathComponents, Any]:
+    """extract values of simple paths in one pass, stop once all paths found
+
+    Paths not found in document are resolved to None, same as jmespath.
+    """
+    pending = set(paths)
+    results: Dict[PathComponents, Any] = {path: None for path in pending}
+    stack: List[_Frame] = []
+    builder = None
+    builder_depth = 0
+    builder_path = None
+
+    for event, value in ijson.basic_parse(reader, use_float=True):
+        if builder is not None:
+            # building container value of target path
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                builder_depth += 1
+            elif event in ("end_map", "end_array"):
+                builder_depth -= 1
+                if builder_depth == 0:
+                    results[builder_path] = builder.value
+                    builder = None
+                    if not pending:
+                        break
+            continue
+
+        if event == "map_key":
+            stack[-1].key = value
+            continue
+        elif event in ("end_map", "end_array"):
+            stack.pop()
+            continue
+
+        # start of a value
+        if stack and stack[-1].is_array:
+            stack[-1].key += 1
+
+        current_path = tuple(frame.key for frame in stack)
+        if current_path in pending:
+            pending.remove(current_path)
+            if event in ("start_map", "start_array"):
+                builder = ObjectBuilder()
+                builder.event(event, value)
+                builder_depth = 1
+                builder_path = current_path
+                continue
+
+            results[current_path] = value
+            if not pending:
+                break
+
+        if event == "start_map":
+            stack.append(_Frame(is_array=False))
+        elif event == "start_array":
+            stack.append(_Frame(is_array=True))
+
+    return results
+
+
+def stream_extract_response(
+    reader: ResponseStreamReader, exprs: Iterable[Text]
+) -> Union[Dict[Text, Any], None]:
+    """extract simple body paths from response stream
+
+    Returns:
+        expression => value mapping, None if streaming is not available or
+        response is not valid json.
+
+    """
+    if not STREAMING_READY:
+        logger.warning(
+            "streaming extension dependency ijson uninstalled, "
+            "decode full response instead. install with pip: $ pip install ijson"
+        )
+        return None
+
+    expr_paths = {expr: parse_simple_path(expr) for expr in exprs}
+    try:
+        path_values = stream_extract(reader, expr_paths.values())
+    except ijson.JSONError as ex:
+        logger.warning(f"failed to extract from response stream: {ex}")
+        return None
+
+    logger.debug(f"extracted from response stream: {list(expr_paths)}")
+    return {expr: path_values[path] for expr, path in expr_paths.items()}
@@ -0,0 +1,127 @@
+import io
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from httprunner import Config, HttpRunner, RunRequest, Step
+from httprunner.ext.streaming import parse_simple_path, stream_extract
+
+DOCUMENT = {
+    "meta": {"total": 3000, "ratio": 0.5, "tags": ["a", "b"]},
+    "items": [{"id": index, "name": f"item-{index}"} for index in range(3000)],
+    "tail": {"done": True},
+}
+CONTENT = json.dumps(DOCUMENT).encode("utf-8")
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, content: bytes):
+        super().__init__(content)
+        self.read_size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = super().read(min(size, 1024))
+        self.read_size += len(chunk)
+        return chunk
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(CONTENT)))
+        self.end_headers()
+        self.wfile.write(CONTENT)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestStreamExtract(unittest.TestCase):
+    def test_parse_simple_path(self):
+        self.assertEqual(parse_simple_path("body.meta.total"), ("meta", "total"))
+        self.assertEqual(parse_simple_path("body.items[0].id"), ("items", 0, "id"))
+        self.assertIsNone(parse_simple_path("body.items[-1].id"))
+        self.assertIsNone(parse_simple_path("length(body.items)"))
+        self.assertIsNone(parse_simple_path("headers.Server"))
+
+    def test_stop_once_paths_found(self):
+        reader = CountingReader(CONTENT)
+        results = stream_extract(
+            reader, [("meta", "total"), ("meta", "tags"), ("items", 1, "name")]
+        )
+        self.assertEqual(
+            results,
+            {
+                ("meta", "total"): 3000,
+                ("meta", "tags"): ["a", "b"],
+                ("items", 1, "name"): "item-1",
+            },
+        )
+        self.assertLess(reader.read_size, len(CONTENT) / 10)
+
+    def test_missing_paths(self):
+        results = stream_extract(
+            CountingReader(CONTENT),
+            [("tail", "done"), ("meta", "missing"), ("meta", 0), ("items", 5000)],
+        )
+        self.assertEqual(
+            results,
+            {
+                ("tail", "done"): True,
+                ("meta", "missing"): None,
+                ("meta", 0): None,
+                ("items", 5000): None,
+            },
+        )
+
+
+class TestStreamRequest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ExportHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_stream_extract_with_fallback(self):
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        class CaseWithStreamRequest(HttpRunner):
+            config = (
+                Config("stream request")
+                .base_url(base_url)
+                .export("total", "first_id", "last_id")
+            )
+            teststeps = [
+                Step(
+                    RunRequest("export")
+                    .get("/export")
+                    .set_stream()
+                    .extract()
+                    .with_jmespath("body.meta.total", "total")
+                    .with_jmespath("body.items[0].id", "first_id")
+                    .validate()
+                    .assert_equal("status_code", 200)
+                ),
+                Step(
+                    RunRequest("export with complex expression")
+                    .get("/export")
+                    .set_stream()
+                    .extract()
+                    .with_jmespath("body.meta.total", "total")
+                    .with_jmespath("body.items[-1].id", "last_id")
+                    .validate()
+                    .assert_equal("body.items[2].name", "item-2")
+                ),
+            ]
+
+        summary = CaseWithStreamRequest().test_start().get_summary()
+        self.assertTrue(summary.success)
+        self.assertEqual(
+            summary.in_out.export_vars, {"total": 3000, "first_id": 0, "last_id": 2999}
+        )
+        response_data = summary.step_results[0].data.req_resps[0].response
+        self.assertEqual(response_data.body, "stream body (OMITTED)")
@@ -0,0 +1,114 @@
+"""ignore rules of test discovery, directories are pruned before descending into.
+
+Patterns are in .gitignore style, one pattern per line in .hrunignore file:
+
+    # comment
+    fixtures/           directory only, in any level
+    *.data.json         file or directory name, in any level
+    api/mocks/*.yml     path relative to directory of .hrunignore
+
+Hidden directories, caches, and reports/ and logs/ of project RootDir are ignored
+by default. The nearest .hrunignore upward from the discovered folder is applied, and
+.hrunignore found in sub-directories applies to that sub-directory tree.
+Negation patterns (!pattern) are not supported.
+"""
+
+import fnmatch
+import os
+import re
+from typing import List, Optional, Pattern, Text, Tuple
+
+IGNORE_FILE_NAME = ".hrunignore"
+
+# hidden directories (e.g. .git, .venv) and caches, in any level
+DEFAULT_IGNORE_PATTERNS = [
+    ".*/",
+    "__pycache__/",
+    "node_modules/",
+    "site-packages/",
+]
+
+# outputs of httprunner, relative to project RootDir
+PROJECT_IGNORE_PATTERNS = ["/reports/", "/logs/"]
+
+# files marking virtualenv or conda environment directories
+ENV_DIR_MARKERS = ["pyvenv.cfg", "conda-meta"]
+
+
+def _compile_patterns(patterns: List[Text]) -> Optional[Pattern]:
+    if not patterns:
+        return None
+
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+class IgnoreRules(object):
+    """compiled ignore patterns, matched against name or relative path"""
+
+    def __init__(self):
+        # (base dir, name regex, dir name regex, path regex, dir path regex)
+        self.rules: List[Tuple[Text, ...]] = []
+
+    def add_patterns(self, patterns: List[Text], base_dir: Text = "") -> "IgnoreRules":
+        names, dir_names, paths, dir_paths = [], [], [], []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith(("#", "!")):
+                continue
+
+            is_dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            is_anchored = "/" in pattern
+            pattern = os.path.normcase(pattern).replace(os.sep, "/").lstrip("/")
+            if is_anchored:
+                # relative to base dir, like .gitignore
+                (dir_paths if is_dir_only else paths).append(pattern)
+            else:
+                (dir_names if is_dir_only else names).append(pattern)
+
+        compiled = tuple(map(_compile_patterns, [names, dir_names, paths, dir_paths]))
+        if any(compiled):
+            self.rules.append((base_dir, *compiled))
+
+        return self
+
+    def add_ignore_file(self, ignore_file_path: Text) -> "IgnoreRules":
+        try:
+            with open(ignore_file_path, encoding="utf-8") as f:
+                patterns = f.read().splitlines()
+        except OSError:
+            return self
+
+        return self.add_patterns(patterns, os.path.dirname(ignore_file_path))
+
+    def copy(self) -> "IgnoreRules":
+        rules = IgnoreRules()
+        rules.rules = list(self.rules)
+        return rules
+
+    def is_ignored(self, path: Text, name: Text, is_dir: bool) -> bool:
+        name = os.path.normcase(name)
+        for base_dir, names, dir_names, paths, dir_paths in self.rules:
+            if names and names.match(name):
+                return True
+            if is_dir and dir_names and dir_names.match(name):
+                return True
+            if not (paths or dir_paths) or not base_dir:
+                continue
+
+            relative_path = os.path.relpath(path, base_dir)
+            if relative_path.startswith(os.pardir):
+                continue
+
+            relative_path = os.path.normcase(relative_path).replace(os.sep, "/")
+            if paths and paths.match(relative_path):
+                return True
+            if is_dir and dir_paths and dir_paths.match(relative_path):
+                return True
+
+        return False
+
+
+def is_env_dir(entry_names: List[Text]) -> bool:
+    """virtualenv or conda environment directory, e.g. venv named in any way"""
+    return any(marker in entry_names for marker in ENV_DIR_MARKERS)
@@ -0,0 +1,114 @@
+""" json facade, use accelerated orjson if installed, otherwise standard library json.
+
+Backend is selected once on import, and can be specified with environment variable:
+
+    $ HRUN_JSON_BACKEND=stdlib hrun testcases/   # json in standard library
+    $ HRUN_JSON_BACKEND=orjson hrun testcases/   # fall back to stdlib if not installed
+
+Differences of orjson backend:
+
+- indent is always 2 spaces when indent is specified
+- ensure_ascii is not supported, stdlib is used if it is required
+- data orjson can not handle, e.g. integers exceed 64-bit, is handled by stdlib
+"""
+
+import json
+import os
+from typing import IO, Any, Callable, Text, Union
+
+from loguru import logger
+from requests import Response
+
+try:
+    import orjson
+
+    ORJSON_READY = True
+except ModuleNotFoundError:
+    ORJSON_READY = False
+
+# orjson.JSONDecodeError is subclass of json.JSONDecodeError
+JSONDecodeError = json.JSONDecodeError
+
+
+def get_backend() -> Text:
+    backend = os.getenv("HRUN_JSON_BACKEND", "orjson" if ORJSON_READY else "stdlib")
+    if backend not in ["stdlib", "orjson"]:
+        logger.warning(f"invalid HRUN_JSON_BACKEND={backend}, use stdlib")
+        return "stdlib"
+
+    if backend == "orjson" and not ORJSON_READY:
+        logger.warning("orjson uninstalled, use stdlib json backend")
+        return "stdlib"
+
+    return backend
+
+
+BACKEND = get_backend()
+
+
+def loads(s: Union[Text, bytes, bytearray]) -> Any:
+    if BACKEND == "orjson":
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # e.g. integers exceed 64-bit, raise with stdlib if data is invalid
+            pass
+
+    return json.loads(s)
+
+
+def load(fp: IO) -> Any:
+    return loads(fp.read())
+
+
+def dumps(
+    obj: Any,
+    indent: int = None,
+    ensure_ascii: bool = True,
+    sort_keys: bool = False,
+    default: Callable = None,
+) -> Text:
+    if BACKEND == "orjson" and not ensure_ascii:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. integers exceed 64-bit, subclass of builtin types
+            pass
+
+    return json.dumps(
+        obj,
+        indent=indent,
+        ensure_ascii=ensure_ascii,
+        sort_keys=sort_keys,
+        default=default,
+    )
+
+
+def dump(obj: Any, fp: IO, **kwargs):
+    fp.write(dumps(obj, **kwargs))
+
+
+def loads_response(resp: Response) -> Any:
+    """decode json response body, same as resp.json()
+
+    Raises:
+        ValueError: response body is not valid json
+
+    """
+    if (
+        BACKEND == "orjson"
+        and resp.content
+        and resp.encoding in [None, "utf-8", "UTF-8"]
+    ):
+        try:
+            return orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
+            # content maybe in other utf encodings, let requests detect
+            pass
+
+    return resp.json()
@@ -0,0 +1,48 @@
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+from httprunner import jsonlib
+
+BACKENDS = ["stdlib", "orjson"] if jsonlib.ORJSON_READY else ["stdlib"]
+
+
+class TestJsonlib(unittest.TestCase):
+    def test_loads_dumps(self):
+        data = {"name": "中文", "list": [1, 2.5, None, True], "nested": {"a": "b"}}
+        for backend in BACKENDS:
+            with mock.patch.object(jsonlib, "BACKEND", backend):
+                content = jsonlib.dumps(data, ensure_ascii=False)
+                self.assertIn("中文", content)
+                self.assertEqual(jsonlib.loads(content), data)
+                self.assertEqual(jsonlib.loads(content.encode("utf-8")), data)
+                self.assertEqual(
+                    jsonlib.dumps(data, sort_keys=True),
+                    json.dumps(data, sort_keys=True),
+                )
+
+    def test_fallback_to_stdlib(self):
+        big_int = 2**70
+        for backend in BACKENDS:
+            with mock.patch.object(jsonlib, "BACKEND", backend):
+                self.assertEqual(
+                    jsonlib.loads(jsonlib.dumps({"v": big_int}, ensure_ascii=False)),
+                    {"v": big_int},
+                )
+                content = jsonlib.dumps({1: object()}, ensure_ascii=False, default=repr)
+                self.assertTrue(jsonlib.loads(content)["1"].startswith("<object"))
+                with self.assertRaises(jsonlib.JSONDecodeError):
+                    jsonlib.loads("{invalid")
+
+    def test_loads_response(self):
+        resp = requests.Response()
+        resp.status_code = 200
+        for backend in BACKENDS:
+            with mock.patch.object(jsonlib, "BACKEND", backend):
+                resp._content = '{"a": "中文"}'.encode("utf-16")
+                self.assertEqual(jsonlib.loads_response(resp), {"a": "中文"})
+                resp._content = b"<html></html>"
+                with self.assertRaises(ValueError):
+                    jsonlib.loads_response(resp)
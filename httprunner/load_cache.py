@@ -0,0 +1,171 @@
+""" persistent cache of loaded YAML/JSON test files, skip parsing and validating.
+
+Each test file is cached in .hrun_cache/load folder of project RootDir, keyed by its
+absolute path, and is reused only when mtime and size of the test file are
+unchanged. Content is saved with marshal, which loads much faster than parsing
+YAML even with libyaml, and each load gets a fresh copy that callers can modify.
+
+Digests of testcases validated with pydantic are saved with the test file they are
+converted from, validation of the same testcase is skipped until the file changes.
+Loaded test file is usually validated soon after, entry is saved to disk then, or
+at exit if it is never validated, so that each test file is written once.
+
+Cache can be disabled with environment variable HRUN_LOAD_CACHE=false.
+"""
+
+import atexit
+import hashlib
+import marshal
+import os
+import sys
+import threading
+from typing import Any, Dict, Optional, Set, Text, Tuple
+
+from loguru import logger
+
+from httprunner import __version__
+
+CACHE_DIR_NAME = ".hrun_cache"
+LOAD_CACHE_DIR_NAME = "load"
+
+# marshal format is specific to python version
+SALT = f"{__version__}:{sys.version_info[:2]}:{marshal.version}"
+
+# content of test file maybe None, e.g. empty YAML file
+MISSING = object()
+
+
+def is_load_cache_enabled() -> bool:
+    return os.getenv("HRUN_LOAD_CACHE", "true").lower() not in ["0", "false", "no"]
+
+
+def get_file_stat(path: Text) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def digest_content(content: Any) -> Optional[bytes]:
+    """digest of content, None if content can not be marshalled, e.g. datetime.
+    marshal version 2 writes no object references, same content same bytes
+    """
+    try:
+        return hashlib.sha1(marshal.dumps(content, 2)).digest()
+    except ValueError:
+        return None
+
+
+class _Entry(object):
+    __slots__ = ("file_stat", "content", "validated")
+
+    def __init__(self, file_stat: Tuple[int, int], content: bytes, validated: Set):
+        self.file_stat = file_stat
+        self.content = content  # marshalled test file content
+        self.validated = validated  # digests of validated testcases
+
+
+class LoadCache(object):
+    def __init__(self):
+        # test file absolute path => entry, loaded from disk on demand
+        self.entries: Dict[Text, _Entry] = {}
+        # test file directory => cache directory
+        self.cache_dirs: Dict[Text, Text] = {}
+        # loaded test files, not saved to disk yet
+        self.pending: Set[Text] = set()
+        atexit.register(self.save)
+
+    def __cache_dir(self, path: Text) -> Text:
+        dir_path = os.path.dirname(path)
+        if dir_path not in self.cache_dirs:
+            from httprunner.loader import locate_project_root_directory
+
+            _, root_dir = locate_project_root_directory(path)
+            self.cache_dirs[dir_path] = os.path.join(
+                root_dir, CACHE_DIR_NAME, LOAD_CACHE_DIR_NAME
+            )
+
+        return self.cache_dirs[dir_path]
+
+    def __cache_path(self, path: Text) -> Text:
+        file_name = hashlib.sha1(path.encode("utf-8")).hexdigest()
+        return os.path.join(self.__cache_dir(path), f"{file_name}.marshal")
+
+    def __get_entry(self, path: Text, file_stat: Tuple[int, int]) -> Optional[_Entry]:
+        entry = self.entries.get(path)
+        if entry is None:
+            try:
+                with open(self.__cache_path(path), "rb") as f:
+                    salt, cached_path, file_stat_, content, validated = marshal.load(f)
+            except (OSError, EOFError, ValueError, TypeError):
+                return None
+
+            if salt != SALT or cached_path != path:
+                return None
+
+            entry = self.entries[path] = _Entry(tuple(file_stat_), content, validated)
+
+        if entry.file_stat != file_stat:
+            # test file modified
+            return None
+
+        return entry
+
+    def __save_entry(self, path: Text, entry: _Entry):
+        self.pending.discard(path)
+        cache_path = self.__cache_path(path)
+        cache_dir = os.path.dirname(cache_path)
+        data = (SALT, path, entry.file_stat, entry.content, entry.validated)
+        # unique in processes and threads, cheaper than tempfile.mkstemp
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                marshal.dump(data, f)
+            os.replace(temp_path, cache_path)
+        except OSError as ex:
+            logger.debug(f"failed to save load cache: {ex}")
+
+    def get(self, path: Text, file_stat: Tuple[int, int]) -> Any:
+        """get fresh copy of cached content, MISSING if not cached or outdated"""
+        entry = self.__get_entry(path, file_stat)
+        if entry is None:
+            return MISSING
+
+        return marshal.loads(entry.content)
+
+    def add(self, path: Text, file_stat: Tuple[int, int], content: Any):
+        try:
+            content = marshal.dumps(content)
+        except ValueError:
+            # e.g. datetime in YAML, can not be marshalled
+            return
+
+        self.entries[path] = _Entry(file_stat, content, set())
+        self.pending.add(path)
+
+    def is_validated(self, path: Text, digest: bytes) -> bool:
+        try:
+            entry = self.__get_entry(path, get_file_stat(path))
+        except OSError:
+            return False
+
+        return entry is not None and digest in entry.validated
+
+    def add_validated(self, path: Text, digest: bytes):
+        try:
+            entry = self.__get_entry(path, get_file_stat(path))
+        except OSError:
+            return
+
+        if entry is not None and (
+            digest not in entry.validated or path in self.pending
+        ):
+            entry.validated.add(digest)
+            self.__save_entry(path, entry)
+
+    def save(self):
+        """save loaded test files to disk, which are not validated as testcase"""
+        for path in list(self.pending):
+            entry = self.entries.get(path)
+            if entry is not None:
+                self.__save_entry(path, entry)
+        self.pending.clear()
@@ -1,26 +1,73 @@
-import csv
+import hashlib
 import importlib
-import json
+import importlib.machinery
+import importlib.util
 import os
 import sys
 import types
-from typing import Callable, Dict, List, Text, Tuple, Union
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Text, Tuple, Union
 
 import yaml
 from loguru import logger
 from pydantic import ValidationError
 
-from httprunner import builtin, exceptions, utils
-from httprunner.models import ProjectMeta, TestCase
+from httprunner import builtin, exceptions, jsonlib, utils
+from httprunner.csv_table import CsvTable, load_csv_table
+from httprunner.ignore import (
+    DEFAULT_IGNORE_PATTERNS,
+    IGNORE_FILE_NAME,
+    PROJECT_IGNORE_PATTERNS,
+    IgnoreRules,
+    is_env_dir,
+)
+from httprunner.load_cache import (
+    MISSING,
+    LoadCache,
+    digest_content,
+    get_file_stat,
+    is_load_cache_enabled,
+)
+from httprunner.models import FunctionsMapping, ProjectMeta, TestCase
+
+# libyaml is bundled with PyYAML wheels, parsing is several times faster with it
+LIBYAML_READY = getattr(yaml, "__with_libyaml__", False)
+YAML_LOADER = yaml.CFullLoader if LIBYAML_READY else yaml.FullLoader
 
 project_meta: Union[ProjectMeta, None] = None
 
+# keys in testcase or v2/v3 api file, searched in raw content when discovering
+TESTCASE_SNIFF_MARKERS = (b"config", b"request")
+SNIFF_CHUNK_SIZE = 64 * 1024
+
+""" located files of each directory, (directory, file name) => file path or None
+"""
+located_files_cache: Dict[Tuple[Text, Text], Optional[Text]] = {}
+
+""" loaded project meta of each project RootDir, projects coexist in one process
+"""
+project_meta_mapping: Dict[Text, ProjectMeta] = {}
+
+""" project RootDir of testcase running in current thread, set by SessionRunner
+"""
+running_root_dir: ContextVar[Text] = ContextVar("running_root_dir", default="")
+
+""" loaded debugtalk.py, path => (file stat, content digest, functions mapping)
+"""
+debugtalk_functions_cache: Dict[
+    Text, Tuple[Tuple[int, int], bytes, FunctionsMapping]
+] = {}
+
+""" loaded test files and validated testcases, persisted in .hrun_cache/load
+"""
+load_cache = LoadCache()
+
 
 def _load_yaml_file(yaml_file: Text) -> Dict:
     """load yaml file and check file content format"""
     with open(yaml_file, mode="rb") as stream:
         try:
-            yaml_content = yaml.load(stream, Loader=yaml.FullLoader)
+            yaml_content = yaml.load(stream, Loader=YAML_LOADER)
         except yaml.YAMLError as ex:
             err_msg = f"YAMLError:\nfile: {yaml_file}\nerror: {ex}"
             logger.error(err_msg)
@@ -33,8 +80,8 @@ def _load_json_file(json_file: Text) -> Dict:
     """load json file and check file content format"""
     with open(json_file, mode="rb") as data_file:
         try:
-            json_content = json.load(data_file)
-        except json.JSONDecodeError as ex:
+            json_content = jsonlib.load(data_file)
+        except jsonlib.JSONDecodeError as ex:
             err_msg = f"JSONDecodeError:\nfile: {json_file}\nerror: {ex}"
             raise exceptions.FileFormatError(err_msg)
 
@@ -50,16 +97,29 @@ def load_test_file(test_file: Text) -> Dict:
         raise exceptions.FileNotFound(f"test file not exists: {test_file}")
 
     file_suffix = os.path.splitext(test_file)[1].lower()
-    if file_suffix == ".json":
-        test_file_content = _load_json_file(test_file)
-    elif file_suffix in [".yaml", ".yml"]:
-        test_file_content = _load_yaml_file(test_file)
-    else:
+    if file_suffix not in [".json", ".yaml", ".yml"]:
         # '' or other suffix
         raise exceptions.FileFormatError(
             f"testcase/testsuite file should be YAML/JSON format, invalid format file: {test_file}"
         )
 
+    cache_enabled = is_load_cache_enabled()
+    if cache_enabled:
+        test_file_abs_path = os.path.abspath(test_file)
+        # stat before loading, file modified while loading is loaded again next time
+        file_stat = get_file_stat(test_file_abs_path)
+        test_file_content = load_cache.get(test_file_abs_path, file_stat)
+        if test_file_content is not MISSING:
+            return test_file_content
+
+    if file_suffix == ".json":
+        test_file_content = _load_json_file(test_file)
+    else:
+        test_file_content = _load_yaml_file(test_file)
+
+    if cache_enabled:
+        load_cache.add(test_file_abs_path, file_stat, test_file_content)
+
     return test_file_content
 
 
@@ -74,6 +134,30 @@ def load_testcase(testcase: Dict) -> TestCase:
     return testcase_obj
 
 
+def validate_testcase(testcase: Dict):
+    """validate testcase format, skipped if the same testcase converted from
+    unchanged test file is validated before
+
+    Raises:
+        exceptions.TestCaseFormatError: testcase format invalid
+
+    """
+    testcase_path = None
+    config = testcase.get("config")
+    if isinstance(config, Dict) and isinstance(config.get("path"), Text):
+        testcase_path = config["path"]
+
+    digest = None
+    if testcase_path and is_load_cache_enabled():
+        digest = digest_content(testcase)
+        if digest and load_cache.is_validated(testcase_path, digest):
+            return
+
+    load_testcase(testcase)
+    if digest:
+        load_cache.add_validated(testcase_path, digest)
+
+
 def load_testcase_file(testcase_file: Text) -> TestCase:
     """load testcase file and validate with pydantic model"""
     testcase_content = load_test_file(testcase_file)
@@ -131,14 +215,17 @@ def load_dot_env_file(dot_env_path: Text) -> Dict:
     return env_variables_mapping
 
 
-def load_csv_file(csv_file: Text) -> List[Dict]:
+def load_csv_file(csv_file: Text, start: int = 0, stop: int = None) -> CsvTable:
     """load csv file and check file content format
 
     Args:
         csv_file (str): csv file path, csv file content is like below:
+        start (int): index of first row to load
+        stop (int): index of row to stop loading at, load to end if None
 
     Returns:
-        list: list of parameters, each parameter is in dict format
+        CsvTable: list of parameters, each parameter is in dict format.
+            Table is read-only, cached and shared until csv file is modified.
 
     Examples:
         >>> cat csv_file
@@ -167,22 +254,21 @@ def load_csv_file(csv_file: Text) -> List[Dict]:
         # file path not exist
         raise exceptions.CSVNotFound(csv_file)
 
-    csv_content_list = []
+    return load_csv_table(csv_file, start, stop)
 
-    with open(csv_file, encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            csv_content_list.append(row)
 
-    return csv_content_list
-
-
-def load_folder_files(folder_path: Text, recursive: bool = True) -> List:
+def load_folder_files(
+    folder_path: Text, recursive: bool = True, ignore_patterns: List[Text] = None
+) -> List:
     """load folder path, return all files endswith .yml/.yaml/.json/_test.py in list.
+        ignored directories are not walked into, e.g. .git, node_modules, virtualenv,
+        and YAML/JSON files which are not testcases are skipped without parsing.
 
     Args:
         folder_path (str): specified folder path to load
         recursive (bool): load files recursively if True
+        ignore_patterns (list): ignore patterns in .hrunignore style,
+            besides default patterns and .hrunignore files, relative to folder_path
 
     Returns:
         list: files endswith yml/yaml/json
@@ -190,32 +276,109 @@ def load_folder_files(folder_path: Text, recursive: bool = True) -> List:
     if isinstance(folder_path, (list, set)):
         files = []
         for path in set(folder_path):
-            files.extend(load_folder_files(path, recursive))
+            files.extend(load_folder_files(path, recursive, ignore_patterns))
 
         return files
 
-    if not os.path.exists(folder_path):
+    if not os.path.isdir(folder_path):
         return []
 
+    _, project_root_directory = locate_project_root_directory(folder_path)
+    ignore_rules = (
+        IgnoreRules()
+        .add_patterns(DEFAULT_IGNORE_PATTERNS)
+        .add_patterns(PROJECT_IGNORE_PATTERNS, project_root_directory)
+    )
+    try:
+        ignore_file_path = locate_file(folder_path, IGNORE_FILE_NAME)
+        ignore_rules.add_ignore_file(ignore_file_path)
+    except exceptions.FileNotFound:
+        ignore_file_path = None
+
+    if ignore_patterns:
+        ignore_rules.add_patterns(ignore_patterns, os.path.abspath(folder_path))
+
     file_list = []
+    __scan_folder_files(
+        folder_path, ignore_rules, recursive, file_list, ignore_file_path is not None
+    )
+    return file_list
 
-    for dirpath, dirnames, filenames in os.walk(folder_path):
-        filenames_list = []
 
-        for filename in filenames:
-            if not filename.lower().endswith((".yml", ".yaml", ".json", "_test.py")):
-                continue
+def __scan_folder_files(
+    dir_path: Text,
+    ignore_rules: IgnoreRules,
+    recursive: bool,
+    file_list: List[Text],
+    ignore_file_loaded: bool = False,
+):
+    try:
+        with os.scandir(dir_path) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    entry_names = [entry.name for entry in entries]
+    if is_env_dir(entry_names):
+        logger.info(f"skip virtual environment folder: {dir_path}")
+        return
+
+    if IGNORE_FILE_NAME in entry_names and not ignore_file_loaded:
+        # applies to this directory tree only
+        ignore_rules = ignore_rules.copy().add_ignore_file(
+            os.path.join(dir_path, IGNORE_FILE_NAME)
+        )
 
-            filenames_list.append(filename)
+    sub_dir_paths = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+
+        if ignore_rules.is_ignored(entry.path, entry.name, is_dir):
+            if is_dir and not entry.name.startswith("."):
+                logger.info(f"skip ignored folder: {entry.path}")
+            continue
+
+        if is_dir:
+            # symlinks to directories are not followed, same as os.walk
+            if recursive and not entry.is_symlink():
+                sub_dir_paths.append(entry.path)
+        elif entry.name.lower().endswith(
+            (".yml", ".yaml", ".json", "_test.py")
+        ) and sniff_test_file(entry.path):
+            file_list.append(entry.path)
+
+    for sub_dir_path in sub_dir_paths:
+        __scan_folder_files(sub_dir_path, ignore_rules, recursive, file_list)
+
+
+def sniff_test_file(file_path: Text) -> bool:
+    """check if YAML/JSON file maybe a testcase by searching keys in raw content,
+    without parsing. testcase and v2/v3 api file contain config or request key at least.
+    """
+    if file_path.lower().endswith("_test.py"):
+        return True
 
-        for filename in filenames_list:
-            file_path = os.path.join(dirpath, filename)
-            file_list.append(file_path)
+    max_marker_length = max(map(len, TESTCASE_SNIFF_MARKERS))
+    try:
+        with open(file_path, "rb") as f:
+            tail = b""
+            while True:
+                chunk = f.read(SNIFF_CHUNK_SIZE)
+                if not chunk:
+                    return False
 
-        if not recursive:
-            break
+                data = tail + chunk
+                if any(marker in data for marker in TESTCASE_SNIFF_MARKERS):
+                    return True
 
-    return file_list
+                # marker maybe split between chunks
+                tail = data[-(max_marker_length - 1) :]
+    except OSError:
+        # error will be reported when loading
+        return True
 
 
 def load_module_functions(module) -> Dict[Text, Callable]:
@@ -250,6 +413,7 @@ def load_builtin_functions() -> Dict[Text, Callable]:
 def locate_file(start_path: Text, file_name: Text) -> Text:
     """locate filename and return absolute file path.
         searching will be recursive upward until system root dir.
+        located results of each directory are cached, including not found.
 
     Args:
         file_name (str): target locate file name
@@ -262,27 +426,54 @@ def locate_file(start_path: Text, file_name: Text) -> Text:
         exceptions.FileNotFound: If failed to locate file.
 
     """
-    if os.path.isfile(start_path):
-        start_dir_path = os.path.dirname(start_path)
-    elif os.path.isdir(start_path):
-        start_dir_path = start_path
+    cache_key = (os.path.abspath(start_path), file_name) if start_path else None
+    if cache_key in located_files_cache:
+        file_path = located_files_cache[cache_key]
     else:
-        raise exceptions.FileNotFound(f"invalid path: {start_path}")
-
-    file_path = os.path.join(start_dir_path, file_name)
-    if os.path.isfile(file_path):
-        # ensure absolute
-        return os.path.abspath(file_path)
-
-    # system root dir
-    # Windows, e.g. 'E:\\'
-    # Linux/Darwin, '/'
-    parent_dir = os.path.dirname(start_dir_path)
-    if parent_dir == start_dir_path:
+        if os.path.isfile(start_path):
+            start_dir_path = os.path.dirname(start_path)
+        elif os.path.isdir(start_path):
+            start_dir_path = start_path
+        else:
+            raise exceptions.FileNotFound(f"invalid path: {start_path}")
+
+        file_path = __locate_file_upward(os.path.abspath(start_dir_path), file_name)
+        located_files_cache[cache_key] = file_path
+
+    if file_path is None:
         raise exceptions.FileNotFound(f"{file_name} not found in {start_path}")
 
-    # locate recursive upward
-    return locate_file(parent_dir, file_name)
+    return file_path
+
+
+def __locate_file_upward(dir_path: Text, file_name: Text) -> Optional[Text]:
+    visited_dirs = []
+    while True:
+        cache_key = (dir_path, file_name)
+        if cache_key in located_files_cache:
+            file_path = located_files_cache[cache_key]
+            break
+
+        visited_dirs.append(dir_path)
+        file_path = os.path.join(dir_path, file_name)
+        if os.path.isfile(file_path):
+            break
+
+        # system root dir
+        # Windows, e.g. 'E:\\'
+        # Linux/Darwin, '/'
+        parent_dir = os.path.dirname(dir_path)
+        if parent_dir == dir_path:
+            file_path = None
+            break
+
+        dir_path = parent_dir
+
+    # all directories on the way share the same located result
+    for visited_dir in visited_dirs:
+        located_files_cache[(visited_dir, file_name)] = file_path
+
+    return file_path
 
 
 def locate_debugtalk_py(start_path: Text) -> Text:
@@ -342,9 +533,16 @@ def locate_project_root_directory(test_path: Text) -> Tuple[Text, Text]:
     return debugtalk_path, project_root_directory
 
 
-def load_debugtalk_functions() -> Dict[Text, Callable]:
+def load_debugtalk_functions(debugtalk_path: Text = None) -> Dict[Text, Callable]:
     """load project debugtalk.py module functions
         debugtalk.py should be located in project root directory.
+        debugtalk.py is executed again only if its content is modified,
+        otherwise functions mapping loaded before is returned.
+
+    Args:
+        debugtalk_path (str): debugtalk.py file path, each file is loaded as new module
+            so that debugtalk.py of different projects do not share module globals.
+            locate debugtalk.py in sys.path if not specified.
 
     Returns:
         dict: debugtalk module functions mapping
@@ -354,42 +552,136 @@ def load_debugtalk_functions() -> Dict[Text, Callable]:
             }
 
     """
-    # load debugtalk.py module
+    if not debugtalk_path:
+        # locate debugtalk.py like importing debugtalk module
+        spec = importlib.machinery.PathFinder.find_spec("debugtalk")
+        if spec is None or not spec.origin:
+            logger.error("error occurred in debugtalk.py: No module named 'debugtalk'")
+            sys.exit(1)
+
+        debugtalk_path = spec.origin
+
     try:
-        imported_module = importlib.import_module("debugtalk")
+        return __load_debugtalk_functions(os.path.abspath(debugtalk_path))
     except Exception as ex:
         logger.error(f"error occurred in debugtalk.py: {ex}")
         sys.exit(1)
 
-    # reload to refresh previously loaded module
-    imported_module = importlib.reload(imported_module)
-    return load_module_functions(imported_module)
+
+def __load_debugtalk_functions(debugtalk_path: Text) -> FunctionsMapping:
+    file_stat = get_file_stat(debugtalk_path)
+    loaded = debugtalk_functions_cache.get(debugtalk_path)
+    if loaded and loaded[0] == file_stat:
+        return loaded[2]
+
+    with open(debugtalk_path, "rb") as f:
+        digest = hashlib.sha1(f.read()).digest()
+    if loaded and loaded[1] == digest:
+        # touched but content not modified
+        debugtalk_functions_cache[debugtalk_path] = (file_stat, digest, loaded[2])
+        return loaded[2]
+
+    spec = importlib.util.spec_from_file_location("debugtalk", debugtalk_path)
+    imported_module = importlib.util.module_from_spec(spec)
+    # debugtalk of current project
+    previous_module = sys.modules.get("debugtalk")
+    sys.modules["debugtalk"] = imported_module
+    try:
+        spec.loader.exec_module(imported_module)
+    except BaseException:
+        if previous_module is None:
+            sys.modules.pop("debugtalk", None)
+        else:
+            sys.modules["debugtalk"] = previous_module
+        raise
+
+    functions = load_module_functions(imported_module)
+    debugtalk_functions_cache[debugtalk_path] = (file_stat, digest, functions)
+    return functions
+
+
+def reload_debugtalk_functions() -> List[Tuple[FunctionsMapping, FunctionsMapping]]:
+    """reload modified debugtalk.py of loaded projects, used in watch mode.
+        functions mapping in project meta is replaced, previous functions are kept
+        if modified debugtalk.py fails to load, until it is modified again.
+
+    Returns:
+        list: (previous functions mapping, reloaded functions mapping) pairs
+
+    """
+    reloaded = []
+    for _project_meta in list(project_meta_mapping.values()):
+        debugtalk_path = _project_meta.debugtalk_path
+        if not debugtalk_path:
+            continue
+
+        previous_functions = _project_meta.functions
+        try:
+            functions = __load_debugtalk_functions(debugtalk_path)
+        except Exception as ex:
+            logger.error(f"failed to reload {debugtalk_path}, keep previous: {ex}")
+            try:
+                debugtalk_functions_cache[debugtalk_path] = (
+                    get_file_stat(debugtalk_path),
+                    b"",
+                    previous_functions,
+                )
+            except OSError:
+                pass
+            continue
+
+        if functions is not previous_functions:
+            logger.info(f"reloaded modified {debugtalk_path}")
+            _project_meta.functions = functions
+            reloaded.append((previous_functions, functions))
+
+    return reloaded
 
 
 def load_project_meta(test_path: Text, reload: bool = False) -> ProjectMeta:
     """load testcases, .env, debugtalk.py functions.
         testcases folder is relative to project_root_directory
-        by default, project_meta will be loaded only once, unless set reload to true.
+        by default, project_meta of each project will be loaded only once,
+        unless set reload to true.
 
     Args:
         test_path (str): test file/folder path, locate project RootDir from this path.
+            maybe relative to RootDir of current project.
         reload: reload project meta if set true, default to false
 
     Returns:
         project loaded api/testcases definitions,
             environments and debugtalk.py functions.
+        loaded project meta is also set as current project_meta.
 
     """
     global project_meta
-    if project_meta and (not reload):
+    if not test_path:
+        if reload or project_meta is None:
+            project_meta = ProjectMeta()
         return project_meta
 
-    project_meta = ProjectMeta()
-
-    if not test_path:
+    if project_meta and (not reload) and not os.path.exists(test_path):
+        # path relative to RootDir of current project
         return project_meta
 
+    if reload:
+        located_files_cache.clear()
+
     debugtalk_path, project_root_directory = locate_project_root_directory(test_path)
+    if reload or project_root_directory not in project_meta_mapping:
+        project_meta_mapping[project_root_directory] = __load_project_meta(
+            debugtalk_path, project_root_directory
+        )
+
+    project_meta = project_meta_mapping[project_root_directory]
+    return project_meta
+
+
+def __load_project_meta(
+    debugtalk_path: Optional[Text], project_root_directory: Text
+) -> ProjectMeta:
+    _project_meta = ProjectMeta()
 
     # add project RootDir to sys.path
     sys.path.insert(0, project_root_directory)
@@ -402,21 +694,21 @@ def load_project_meta(test_path: Text, reload: bool = False) -> ProjectMeta:
     dot_env_path = os.path.join(project_root_directory, "config", env_file)
     dot_env = load_dot_env_file(dot_env_path)
     if dot_env:
-        project_meta.env = dot_env
-        project_meta.dot_env_path = dot_env_path
+        _project_meta.env = dot_env
+        _project_meta.dot_env_path = dot_env_path
 
     if debugtalk_path:
         # load debugtalk.py functions
-        debugtalk_functions = load_debugtalk_functions()
+        debugtalk_functions = load_debugtalk_functions(debugtalk_path)
     else:
         debugtalk_functions = {}
 
     # locate project RootDir and load debugtalk.py functions
-    project_meta.RootDir = project_root_directory
-    project_meta.functions = debugtalk_functions
-    project_meta.debugtalk_path = debugtalk_path
+    _project_meta.RootDir = project_root_directory
+    _project_meta.functions = debugtalk_functions
+    _project_meta.debugtalk_path = debugtalk_path
 
-    return project_meta
+    return _project_meta
 
 
 def convert_relative_project_root_dir(abs_path: Text) -> Text:
@@ -1,7 +1,10 @@
 import os
+import tempfile
 import unittest
+from unittest import mock
 
 from httprunner import exceptions, loader
+from httprunner.load_cache import LoadCache
 
 
 class TestLoader(unittest.TestCase):
@@ -69,6 +72,42 @@ class TestLoader(unittest.TestCase):
             ],
         )
 
+    def test_load_csv_file_typed_and_sliced(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_file_path = os.path.join(temp_dir, "users.csv")
+            with open(csv_file_path, "w") as f:
+                f.write("username,age:int,score:float,active:bool\n")
+                for index in range(5):
+                    f.write(f"user{index},{18 + index},{index}.5,{index % 2}\n")
+
+            csv_content = loader.load_csv_file(csv_file_path)
+            self.assertEqual(len(csv_content), 5)
+            self.assertEqual(
+                csv_content[1],
+                {"username": "user1", "age": 19, "score": 1.5, "active": True},
+            )
+            self.assertEqual(
+                loader.load_csv_file(csv_file_path, 1, 3),
+                [
+                    {"username": "user1", "age": 19, "score": 1.5, "active": True},
+                    {"username": "user2", "age": 20, "score": 2.5, "active": False},
+                ],
+            )
+            self.assertEqual(len(loader.load_csv_file(csv_file_path, 3)), 2)
+            with self.assertRaises(exceptions.ParamsError):
+                loader.load_csv_file(csv_file_path, 3, 1)
+
+            # loaded once until csv file is modified
+            self.assertIs(loader.load_csv_file(csv_file_path), csv_content)
+            with open(csv_file_path, "a") as f:
+                f.write("user5,23,5.5,true\n")
+            self.assertEqual(len(loader.load_csv_file(csv_file_path)), 6)
+
+            with open(csv_file_path, "a") as f:
+                f.write("user6,unknown,6.5,true\n")
+            with self.assertRaises(exceptions.FileFormatError):
+                loader.load_csv_file(csv_file_path)
+
     def test_load_folder_files(self):
         folder = os.path.join(os.getcwd(), "examples")
         file1 = os.path.join(os.getcwd(), "examples", "test_utils.py")
@@ -87,6 +126,77 @@ class TestLoader(unittest.TestCase):
         files = loader.load_folder_files(file2, recursive=False)
         self.assertEqual([], files)
 
+    def test_load_folder_files_ignored(self):
+        testcase_content = "config:\n    name: demo\nteststeps: []\n"
+        with tempfile.TemporaryDirectory() as folder:
+            files = {
+                "a.yml": testcase_content,
+                "a.skip.yml": testcase_content,
+                "data.json": '{"users": []}',
+                "node_modules/pkg/b.yml": testcase_content,
+                ".github/workflows/c.yml": testcase_content,
+                "my_venv/pyvenv.cfg": "",
+                "my_venv/lib/d.yml": testcase_content,
+                "fixtures/e.yml": testcase_content,
+                "api/mocks/f.yml": testcase_content,
+                "api/g.yml": testcase_content,
+                "sub/.hrunignore": "*.skip.yml\n",
+                "sub/h.yml": testcase_content,
+                "sub/h.skip.yml": testcase_content,
+                ".hrunignore": "# comment\nfixtures/\napi/mocks/*.yml\n",
+            }
+            for relative_path, content in files.items():
+                path = os.path.join(folder, *relative_path.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as f:
+                    f.write(content)
+
+            def relative_paths(paths):
+                return sorted(
+                    os.path.relpath(path, folder).replace(os.sep, "/") for path in paths
+                )
+
+            self.assertEqual(
+                relative_paths(loader.load_folder_files(folder)),
+                ["a.skip.yml", "a.yml", "api/g.yml", "sub/h.yml"],
+            )
+            self.assertEqual(
+                relative_paths(
+                    loader.load_folder_files(folder, ignore_patterns=["api/"])
+                ),
+                ["a.skip.yml", "a.yml", "sub/h.yml"],
+            )
+            # nearest .hrunignore upward is applied
+            self.assertEqual(
+                relative_paths(loader.load_folder_files(os.path.join(folder, "api"))),
+                ["api/g.yml"],
+            )
+
+    def test_load_folder_files_project_outputs_ignored(self):
+        testcase_content = "config:\n    name: demo\nteststeps: []\n"
+        with tempfile.TemporaryDirectory() as project_dir:
+            for relative_path in [
+                "debugtalk.py",
+                "reports/a.yml",
+                "logs/b.yml",
+                "testcases/logs/c.yml",
+                "api/reports/d.yml",
+            ]:
+                path = os.path.join(project_dir, *relative_path.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as f:
+                    f.write(testcase_content)
+
+            # reports and logs of project RootDir only
+            files = loader.load_folder_files(project_dir)
+            self.assertEqual(
+                sorted(
+                    os.path.relpath(path, project_dir).replace(os.sep, "/")
+                    for path in files
+                ),
+                ["api/reports/d.yml", "testcases/logs/c.yml"],
+            )
+
     def test_load_custom_dot_env_file(self):
         dot_env_path = os.path.join(os.getcwd(), "examples", "httpbin", "test.env")
         env_variables_mapping = loader.load_dot_env_file(dot_env_path)
@@ -125,3 +235,141 @@ class TestLoader(unittest.TestCase):
             loader.locate_file("examples/httpbin/", "debugtalk.py"),
             os.path.join(os.getcwd(), "examples", "httpbin", "debugtalk.py"),
         )
+
+    def test_locate_file_cached(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            open(os.path.join(project_dir, "debugtalk.py"), "w").close()
+            start_path = os.path.join(project_dir, "a", "b")
+            os.makedirs(start_path)
+
+            debugtalk_path = os.path.join(project_dir, "debugtalk.py")
+            self.assertEqual(
+                loader.locate_file(start_path, "debugtalk.py"), debugtalk_path
+            )
+            self.assertEqual(
+                loader.located_files_cache[
+                    (os.path.join(project_dir, "a"), "debugtalk.py")
+                ],
+                debugtalk_path,
+            )
+            with self.assertRaises(exceptions.FileNotFound):
+                loader.locate_file(start_path, "not_exist.py")
+
+            # located from cache, without checking files upward
+            with mock.patch("os.path.isfile", side_effect=AssertionError):
+                self.assertEqual(
+                    loader.locate_file(start_path, "debugtalk.py"), debugtalk_path
+                )
+                with self.assertRaises(exceptions.FileNotFound):
+                    loader.locate_file(start_path, "not_exist.py")
+
+    def test_load_project_meta_multiple_projects(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dirs = []
+            for name in ["project1", "project2"]:
+                project_dir = os.path.join(temp_dir, name)
+                os.makedirs(project_dir)
+                with open(os.path.join(project_dir, "debugtalk.py"), "w") as f:
+                    f.write(f"NAME = '{name}'\n\ndef get_name():\n    return NAME\n")
+                project_dirs.append(project_dir)
+
+            try:
+                project_meta1 = loader.load_project_meta(project_dirs[0])
+                project_meta2 = loader.load_project_meta(project_dirs[1])
+                self.assertIs(loader.project_meta, project_meta2)
+                self.assertEqual(project_meta1.RootDir, project_dirs[0])
+                self.assertEqual(project_meta2.RootDir, project_dirs[1])
+
+                # debugtalk.py of each project has its own module globals
+                self.assertEqual(project_meta1.functions["get_name"](), "project1")
+                self.assertEqual(project_meta2.functions["get_name"](), "project2")
+
+                # loaded once for each project
+                self.assertIs(loader.load_project_meta(project_dirs[0]), project_meta1)
+                self.assertIs(loader.project_meta, project_meta1)
+                self.assertIsNot(
+                    loader.load_project_meta(project_dirs[0], reload=True),
+                    project_meta1,
+                )
+            finally:
+                loader.project_meta = None
+
+    def test_load_debugtalk_functions_once_until_modified(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            debugtalk_path = os.path.join(project_dir, "debugtalk.py")
+            with open(debugtalk_path, "w") as f:
+                f.write("def get_name():\n    return 'foo'\n")
+
+            functions = loader.load_debugtalk_functions(debugtalk_path)
+            self.assertEqual(functions["get_name"](), "foo")
+            self.assertIs(loader.load_debugtalk_functions(debugtalk_path), functions)
+
+            # touched without modification
+            os.utime(debugtalk_path, ns=(0, 0))
+            self.assertIs(loader.load_debugtalk_functions(debugtalk_path), functions)
+
+            with open(debugtalk_path, "w") as f:
+                f.write("def get_name():\n    return 'bar'\n")
+            reloaded_functions = loader.load_debugtalk_functions(debugtalk_path)
+            self.assertIsNot(reloaded_functions, functions)
+            self.assertEqual(reloaded_functions["get_name"](), "bar")
+
+    def test_load_test_file_from_cache(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            open(os.path.join(project_dir, "debugtalk.py"), "w").close()
+            testcase_path = os.path.join(project_dir, "testcase.yml")
+            with open(testcase_path, "w") as f:
+                f.write("config:\n    name: demo\nteststeps: []\n")
+
+            with mock.patch.object(loader, "load_cache", LoadCache()):
+                content = loader.load_test_file(testcase_path)
+                # each load gets a fresh copy
+                content["config"]["name"] = "modified"
+                self.assertEqual(
+                    loader.load_test_file(testcase_path)["config"]["name"], "demo"
+                )
+                # not validated as testcase, saved at exit
+                loader.load_cache.save()
+
+            # loaded from disk in new process, without parsing YAML
+            with mock.patch.object(loader, "load_cache", LoadCache()):
+                with mock.patch.object(loader, "_load_yaml_file") as load_yaml:
+                    content = loader.load_test_file(testcase_path)
+                load_yaml.assert_not_called()
+                self.assertEqual(content, {"config": {"name": "demo"}, "teststeps": []})
+
+                with open(testcase_path, "w") as f:
+                    f.write("config:\n    name: demo v2\nteststeps: []\n")
+                self.assertEqual(
+                    loader.load_test_file(testcase_path)["config"]["name"], "demo v2"
+                )
+
+    def test_validate_testcase_from_cache(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            open(os.path.join(project_dir, "debugtalk.py"), "w").close()
+            testcase_path = os.path.join(project_dir, "testcase.yml")
+            with open(testcase_path, "w") as f:
+                f.write("config:\n    name: demo\nteststeps: []\n")
+
+            with mock.patch.object(loader, "load_cache", LoadCache()):
+                with mock.patch.object(
+                    loader, "load_testcase", wraps=loader.load_testcase
+                ) as load_testcase:
+                    for _ in range(2):
+                        testcase = loader.load_test_file(testcase_path)
+                        testcase["config"]["path"] = testcase_path
+                        loader.validate_testcase(testcase)
+                    self.assertEqual(load_testcase.call_count, 1)
+
+                    # invalid testcase is validated every time
+                    testcase["teststeps"] = [{"name": "invalid step", "request": {}}]
+                    for _ in range(2):
+                        with self.assertRaises(exceptions.TestCaseFormatError):
+                            loader.validate_testcase(testcase)
+                    self.assertEqual(load_testcase.call_count, 3)
+
+    def test_yaml_loader(self):
+        if loader.LIBYAML_READY:
+            self.assertIs(loader.YAML_LOADER, loader.yaml.CFullLoader)
+        else:
+            self.assertIs(loader.YAML_LOADER, loader.yaml.FullLoader)
@@ -1,14 +1,16 @@
+import copy
 import os
 import shutil
 import string
 import subprocess
 import sys
-from typing import Dict, List, Optional, Set, Text, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Text, Tuple
 
 import jinja2
 from loguru import logger
 
-from httprunner import __version__, exceptions
+from httprunner import __version__, exceptions, loader
 from httprunner.compat import (
     convert_variables,
     ensure_path_sep,
@@ -20,8 +22,11 @@ from httprunner.loader import (
     load_folder_files,
     load_project_meta,
     load_test_file,
-    load_testcase,
+    validate_testcase,
 )
+from httprunner.make_cache import MakeCache, is_make_cache_enabled
+from httprunner.make_format import format_expr, format_import, format_str
+from httprunner.make_graph import LoadFiles, TestcaseGraph, format_reference_chain
 from httprunner.response import uniform_validator
 from httprunner.utils import is_support_multiprocessing
 
@@ -33,64 +38,88 @@ pytest_files_made_cache_mapping: Dict[Text, Text] = {}
 """
 pytest_files_run_set: Set = set()
 
+""" pytest files made from persistent cache, skip formatting with black
+"""
+pytest_files_cache_hit_set: Set = set()
+
+""" persistent caches of generated pytest files, (project RootDir, formatter) => cache,
+loaded on first make of each project and saved together at the end of make
+"""
+make_caches: Dict[Tuple[Text, Text], MakeCache] = {}
+
+""" referenced testcases loaded by parallel make, avoid loading again in workers
+"""
+ref_testcases_loaded_mapping: Dict[Text, Any] = {}
+
+""" testcases being made with references recursively, detect circular references
+"""
+testcases_making_stack: List[Text] = []
+
+# process pool is not worth starting for a few test files
+PARALLEL_MAKE_MIN_FILES = 16
+
 __TEMPLATE__ = jinja2.Template(
 """# NOTE: Generated By HttpRunner {{ version }}
 # FROM: {{ testcase_path }}
-
 {% if parameters or skip or marks %}
 import pytest
+
 {% endif %}
 from httprunner import HttpRunner, Config, Step, RunRequest
-
 {% if parameters %}
 from httprunner import Parameters
 {% endif %}
-
 {% if reference_testcase %}
 from httprunner import RunTestCase
 {% endif %}
+{% if imports_list %}
+
+import sys
+from pathlib import Path
+
+{{ sys_path_insert }}
 
 {% for import_str in imports_list %}
 {{ import_str }}
 {% endfor %}
+{% endif %}
 
-class {{ class_name }}(HttpRunner):
-
-    {% if skip %}
-    @pytest.mark.skip(reason="{{ skip }}")
-    {% endif %}
-
-    {% if marks %}
-    {% for mark in marks %}
-    @pytest.mark.{{ mark }}
-    {% endfor %}
-    {% endif %}
 
-    {% if parameters %}
-    @pytest.mark.parametrize("param", Parameters({{ parameters }}))
+class {{ class_name }}(HttpRunner):
+{% for decorator in decorators %}
+{{ decorator }}
+{% endfor %}
+{% if parameters %}
     def test_start(self, param):
         super().test_start(param)
-    {% else %}
+{% else %}
     def test_start(self):
         super().test_start()
-    {% endif %}
+{% endif %}
 
-    config = {{ config_chain_style }}
+{{ config_chain_style }}
 
+{% if teststeps_chain_style %}
     teststeps = [
-        {% for step_chain_style in teststeps_chain_style %}
-            {{ step_chain_style }},
-        {% endfor %}
+{% for step_chain_style in teststeps_chain_style %}
+{{ step_chain_style }}
+{% endfor %}
     ]
+{% else %}
+    teststeps = []
+{% endif %}
+
 
 if __name__ == "__main__":
     {{ class_name }}().test_start()
-
-"""
+""",
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
 )
 
 
-def __ensure_absolute(path: Text) -> Text:
+def ensure_testcase_abs_path(path: Text) -> Text:
     if path.startswith("./"):
         # Linux/Darwin, hrun ./test.yml
         path = path[2:]
@@ -160,8 +189,48 @@ def __ensure_testcase_module(path: Text):
     if os.path.isfile(init_file):
         return
 
-    with open(init_file, "w", encoding="utf-8") as f:
-        f.write("# NOTICE: Generated By HttpRunner. DO NOT EDIT!\n")
+    try:
+        with open(init_file, "x", encoding="utf-8") as f:
+            f.write("# NOTICE: Generated By HttpRunner. DO NOT EDIT!\n")
+    except FileExistsError:
+        # generated by other make worker
+        pass
+
+
+def __ensure_make_cache(root_dir: Text, formatter: Text) -> MakeCache:
+    if (root_dir, formatter) not in make_caches:
+        make_caches[(root_dir, formatter)] = MakeCache(root_dir, formatter)
+
+    return make_caches[(root_dir, formatter)]
+
+
+def __get_make_cache(testcase_abs_path: Text) -> Optional[MakeCache]:
+    if not is_make_cache_enabled():
+        return None
+
+    root_dir = load_project_meta(testcase_abs_path).RootDir
+    formatter = "black" if is_black_format_enabled() else "builtin"
+    return __ensure_make_cache(root_dir, formatter)
+
+
+def __make_from_cache(testcase_abs_path: Text, dir_path: Text = None) -> Optional[Text]:
+    """reuse generated pytest file if testcase and its references are unchanged"""
+    cache = __get_make_cache(testcase_abs_path)
+    if cache is None:
+        return None
+
+    hit_entries = cache.lookup(testcase_abs_path, dir_path)
+    if not hit_entries:
+        return None
+
+    for entry in hit_entries:
+        python_path = entry["python_path"]
+        pytest_files_made_cache_mapping[python_path] = entry["class_name"]
+        pytest_files_cache_hit_set.add(python_path)
+        __ensure_testcase_module(python_path)
+
+    logger.info(f"make testcase from cache: {testcase_abs_path}")
+    return hit_entries[-1]["python_path"]
 
 
 def convert_testcase_path(testcase_abs_path: Text) -> Tuple[Text, Text]:
@@ -178,6 +247,35 @@ def convert_testcase_path(testcase_abs_path: Text) -> Tuple[Text, Text]:
     return testcase_python_abs_path, name_in_title_case
 
 
+def get_testcase_python_path(
+    testcase_abs_path: Text, dir_path: Text = None
+) -> Tuple[Text, Text]:
+    """pytest file path and class name of testcase, saved in dir_path if specified"""
+    testcase_python_abs_path, testcase_cls_name = convert_testcase_path(
+        testcase_abs_path
+    )
+    if dir_path:
+        testcase_python_abs_path = os.path.join(
+            dir_path, os.path.basename(testcase_python_abs_path)
+        )
+
+    return testcase_python_abs_path, testcase_cls_name
+
+
+def get_make_workers() -> int:
+    """count of make worker processes, HRUN_MAKE_WORKERS=1 to make serially"""
+    try:
+        return int(os.getenv("HRUN_MAKE_WORKERS", os.cpu_count() or 1))
+    except ValueError:
+        logger.warning("invalid HRUN_MAKE_WORKERS, make serially")
+        return 1
+
+
+def is_black_format_enabled() -> bool:
+    """generated pytest files are formatted already, black is optional"""
+    return os.getenv("HRUN_MAKE_BLACK", "").lower() in ["1", "true", "yes"]
+
+
 def format_pytest_with_black(*python_paths: Text):
     logger.info("format pytest cases with black ...")
     try:
@@ -217,6 +315,14 @@ def make_config_chain_style(config: Dict) -> Text:
     if "export" in config:
         config_chain_style += f'.export(*{config["export"]})'
 
+    retention_keys = ["retention", "max_step_results", "keep_session_data"]
+    if any(key in config for key in retention_keys):
+        retention = {key: config[key] for key in retention_keys if key in config}
+        config_chain_style += f".retain_step_results(**{retention})"
+
+    if "deadline" in config:
+        config_chain_style += f'.deadline({config["deadline"]})'
+
     return config_chain_style
 
 
@@ -277,6 +383,10 @@ def make_request_chain_style(request: Dict) -> Text:
         allow_redirects = request["allow_redirects"]
         request_chain_style += f".set_allow_redirects({allow_redirects})"
 
+    if "stream" in request:
+        stream = request["stream"]
+        request_chain_style += f".set_stream({stream})"
+
     if "upload" in request:
         upload = request["upload"]
         request_chain_style += f".upload(**{upload})"
@@ -296,6 +406,14 @@ def make_teststep_chain_style(teststep: Dict) -> Text:
         variables = teststep["variables"]
         step_info += f".with_variables(**{variables})"
 
+    if "repeat" in teststep:
+        repeat = teststep["repeat"]
+        repeat_args = [str(repeat["times"])]
+        for key in ["warmup", "concurrency"]:
+            if key in repeat:
+                repeat_args.append(f"{key}={repeat[key]}")
+        step_info += f".repeat({', '.join(repeat_args)})"
+
     if "setup_hooks" in teststep:
         setup_hooks = teststep["setup_hooks"]
         for hook in setup_hooks:
@@ -344,9 +462,12 @@ def make_teststep_chain_style(teststep: Dict) -> Text:
         export: List[Text] = teststep["export"]
         step_info += f".export(*{export})"
 
-    if "validate" in teststep:
+    if teststep.get("validate_stop_on_failure"):
+        step_info += ".validate(stop_on_failure=True)"
+    elif "validate" in teststep or "snapshot" in teststep:
         step_info += ".validate()"
 
+    if "validate" in teststep:
         for v in teststep["validate"]:
             validator = uniform_validator(v)
             assert_method = validator["assert"]
@@ -366,27 +487,89 @@ def make_teststep_chain_style(teststep: Dict) -> Text:
             else:
                 step_info += f".assert_{assert_method}({check}, {expect})"
 
+    if "snapshot" in teststep:
+        snapshot_args = []
+        for key in ["name", "ignore", "fields"]:
+            if teststep["snapshot"].get(key):
+                snapshot_args.append(f"{key}={repr(teststep['snapshot'][key])}")
+        step_info += f".assert_snapshot({', '.join(snapshot_args)})"
+
     return f"Step({step_info})"
 
 
+def ensure_ref_testcase(ref_testcase_path: Text, test_content: Dict) -> Dict:
+    # api in v2/v3 format, convert to v4 testcase
+    if "request" in test_content and "name" in test_content:
+        test_content = ensure_testcase_v4_api(test_content)
+
+    test_content.setdefault("config", {})["path"] = ref_testcase_path
+    return test_content
+
+
+def __make_ref_testcase(teststep: Dict) -> Tuple[Text, Text]:
+    """make pytest file of testcase referenced by teststep, made from cache if possible
+
+    Returns:
+        referenced testcase absolute path and import expression of its pytest class
+
+    """
+    ref_testcase_path = ensure_testcase_abs_path(teststep["testcase"])
+    if ref_testcase_path in ref_testcases_loaded_mapping:
+        test_content = copy.deepcopy(ref_testcases_loaded_mapping[ref_testcase_path])
+    else:
+        test_content = load_test_file(ref_testcase_path)
+
+    if not isinstance(test_content, Dict):
+        raise exceptions.TestCaseFormatError(f"Invalid teststep: {teststep}")
+
+    test_content = ensure_ref_testcase(ref_testcase_path, test_content)
+    ref_testcase_python_abs_path, _ = get_testcase_python_path(ref_testcase_path)
+    if ref_testcase_python_abs_path not in pytest_files_made_cache_mapping:
+        ref_testcase_python_abs_path = __make_from_cache(
+            ref_testcase_path
+        ) or make_testcase(test_content)
+
+    # override testcase export
+    ref_testcase_export: List = test_content["config"].get("export", [])
+    if ref_testcase_export:
+        step_export: List = teststep.setdefault("export", [])
+        step_export.extend(ref_testcase_export)
+        # remove duplicates in stable order
+        teststep["export"] = list(dict.fromkeys(step_export))
+
+    # prepare ref testcase class name
+    ref_testcase_cls_name = pytest_files_made_cache_mapping[
+        ref_testcase_python_abs_path
+    ]
+    teststep["testcase"] = ref_testcase_cls_name
+
+    # prepare import ref testcase
+    ref_testcase_python_relative_path = convert_relative_project_root_dir(
+        ref_testcase_python_abs_path
+    )
+    ref_module_name, _ = os.path.splitext(ref_testcase_python_relative_path)
+    ref_module_name = ref_module_name.replace(os.sep, ".")
+    import_expr = format_import(
+        ref_module_name,
+        f"TestCase{ref_testcase_cls_name} as {ref_testcase_cls_name}",
+    )
+    return ref_testcase_path, import_expr
+
+
 def make_testcase(testcase: Dict, dir_path: Text = None) -> Text:
     """将字典格式的测试用例转换为pytest文件"""
     # ensure compatibility with testcase format v2/v3
     testcase = ensure_testcase_v4(testcase)
 
     # validate testcase format
-    load_testcase(testcase)
+    validate_testcase(testcase)
 
-    testcase_abs_path = __ensure_absolute(testcase["config"]["path"])
+    testcase_abs_path = ensure_testcase_abs_path(testcase["config"]["path"])
     logger.info(f"start to make testcase: {testcase_abs_path}")
 
-    testcase_python_abs_path, testcase_cls_name = convert_testcase_path(
-        testcase_abs_path
+    testcase_python_abs_path, testcase_cls_name = get_testcase_python_path(
+        testcase_abs_path, dir_path
     )
-    if dir_path:
-        testcase_python_abs_path = os.path.join(
-            dir_path, os.path.basename(testcase_python_abs_path)
-        )
 
     global pytest_files_made_cache_mapping
     if testcase_python_abs_path in pytest_files_made_cache_mapping:
@@ -394,98 +577,377 @@ def make_testcase(testcase: Dict, dir_path: Text = None) -> Text:
 
     config = testcase["config"]
     config["path"] = testcase_abs_path
+    # variables evaluated by function on making can not be cached
+    cacheable = isinstance(config.get("variables", {}), Dict)
     config["variables"] = convert_variables(
         config.get("variables", {}), testcase_abs_path
     )
 
+    if testcase_abs_path in testcases_making_stack:
+        chain = testcases_making_stack[
+            testcases_making_stack.index(testcase_abs_path) :
+        ]
+        raise exceptions.CircularReferenceError(
+            format_reference_chain(chain + [testcase_abs_path])
+        )
+
     # prepare reference testcase
     imports_list = []
+    ref_testcase_paths = []
     teststeps = testcase["teststeps"]
-    for teststep in teststeps:
-        if not teststep.get("testcase"):
-            continue
-
-        # make ref testcase pytest file
-        ref_testcase_path = __ensure_absolute(teststep["testcase"])
-        test_content = load_test_file(ref_testcase_path)
-
-        if not isinstance(test_content, Dict):
-            raise exceptions.TestCaseFormatError(f"Invalid teststep: {teststep}")
-
-        # api in v2/v3 format, convert to v4 testcase
-        if "request" in test_content and "name" in test_content:
-            test_content = ensure_testcase_v4_api(test_content)
-
-        test_content.setdefault("config", {})["path"] = ref_testcase_path
-        ref_testcase_python_abs_path = make_testcase(test_content)
-
-        # override testcase export
-        ref_testcase_export: List = test_content["config"].get("export", [])
-        if ref_testcase_export:
-            step_export: List = teststep.setdefault("export", [])
-            step_export.extend(ref_testcase_export)
-            teststep["export"] = list(set(step_export))
-
-        # prepare ref testcase class name
-        ref_testcase_cls_name = pytest_files_made_cache_mapping[
-            ref_testcase_python_abs_path
-        ]
-        teststep["testcase"] = ref_testcase_cls_name
-
-        # prepare import ref testcase
-        ref_testcase_python_relative_path = convert_relative_project_root_dir(
-            ref_testcase_python_abs_path
-        )
-        ref_module_name, _ = os.path.splitext(ref_testcase_python_relative_path)
-        ref_module_name = ref_module_name.replace(os.sep, ".")
-        import_expr = f"from {ref_module_name} import TestCase{ref_testcase_cls_name} as {ref_testcase_cls_name}"
-        if import_expr not in imports_list:
-            imports_list.append(import_expr)
+    testcases_making_stack.append(testcase_abs_path)
+    try:
+        for teststep in teststeps:
+            if not teststep.get("testcase"):
+                continue
+
+            # make ref testcase pytest file
+            ref_testcase_path, import_expr = __make_ref_testcase(teststep)
+            ref_testcase_paths.append(ref_testcase_path)
+            if import_expr not in imports_list:
+                imports_list.append(import_expr)
+    finally:
+        testcases_making_stack.pop()
 
     testcase_path = convert_relative_project_root_dir(testcase_abs_path)
     # current file compared to ProjectRootDir
     diff_levels = len(testcase_path.split(os.sep))
-    if len(imports_list) > 0 and diff_levels > 0:
-        parent = ".parent" * diff_levels
-        import_deps = f"""
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__){parent}))
-"""
-        imports_list.insert(0, import_deps)
+    parent = ".parent" * diff_levels
+    sys_path_insert = format_expr(f"sys.path.insert(0, str(Path(__file__){parent}))")
+
+    skip = make_config_skip(config)
+    marks = make_config_marks(config)
+    parameters = config.get("parameters")
+    decorators = []
+    if skip:
+        decorators.append(f"pytest.mark.skip(reason={format_str(skip)})")
+    for mark in marks or []:
+        decorators.append(f"pytest.mark.{mark}")
+    if parameters:
+        # parse with functions and csv files of the project that pytest file belongs to
+        decorators.append(
+            f'pytest.mark.parametrize("param", Parameters({parameters}, __file__))'
+        )
 
+    # generated code is formatted in black code style already
     data = {
         "version": __version__,
         "testcase_path": testcase_path,
         "class_name": f"TestCase{testcase_cls_name}",
         "imports_list": imports_list,
-        "config_chain_style": make_config_chain_style(config),
-        "skip": make_config_skip(config),
-        "marks": make_config_marks(config),
-        "parameters": config.get("parameters"),
+        "sys_path_insert": sys_path_insert,
+        "config_chain_style": format_expr(
+            make_config_chain_style(config), depth=1, prefix="config = "
+        ),
+        "skip": skip,
+        "marks": marks,
+        "parameters": parameters,
+        "decorators": [
+            format_expr(decorator, depth=1, prefix="@") for decorator in decorators
+        ],
         "reference_testcase": any(step.get("testcase") for step in teststeps),
         "teststeps_chain_style": [
-            make_teststep_chain_style(step) for step in teststeps
+            format_expr(
+                make_teststep_chain_style(step), depth=2, suffix=",", in_brackets=True
+            )
+            for step in teststeps
         ],
     }
     content = __TEMPLATE__.render(data)
 
     # ensure new file's directory exists
-    dir_path = os.path.dirname(testcase_python_abs_path)
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
+    python_dir_path = os.path.dirname(testcase_python_abs_path)
+    if not os.path.exists(python_dir_path):
+        os.makedirs(python_dir_path)
 
     with open(testcase_python_abs_path, "w", encoding="utf-8") as f:
         f.write(content)
 
     pytest_files_made_cache_mapping[testcase_python_abs_path] = testcase_cls_name
+    pytest_files_cache_hit_set.discard(testcase_python_abs_path)
     __ensure_testcase_module(testcase_python_abs_path)
 
+    cache = __get_make_cache(testcase_abs_path)
+    if cache and cacheable:
+        cache.add(
+            testcase_abs_path,
+            testcase_python_abs_path,
+            testcase_cls_name,
+            ref_testcase_paths,
+            dir_path,
+        )
+
     logger.info(f"generated testcase: {testcase_python_abs_path}")
 
     return testcase_python_abs_path
 
 
+def __load_test_file(test_file: Text) -> Tuple[Any, Optional[Exception]]:
+    """load test file, return exception instead of raising it"""
+    try:
+        return load_test_file(test_file), None
+    except (exceptions.FileNotFound, exceptions.FileFormatError) as ex:
+        return None, ex
+
+
+def __load_test_file_in_worker(test_file: Text) -> Tuple[Any, Optional[Exception]]:
+    try:
+        return __load_test_file(test_file)
+    finally:
+        # worker process exits without calling atexit handlers
+        loader.load_cache.save()
+
+
+def ensure_test_content(test_file: Text, test_content: Any) -> Optional[Dict]:
+    """check loaded test file content, return None if it is not a valid testcase"""
+    if not isinstance(test_content, Dict):
+        logger.warning(
+            f"Invalid test file: {test_file}\n"
+            f"reason: test content not in dict format."
+        )
+        return None
+
+    # api in v2/v3 format, convert to v4 testcase
+    if "request" in test_content and "name" in test_content:
+        test_content = ensure_testcase_v4_api(test_content)
+
+    if "config" not in test_content:
+        logger.warning(
+            f"Invalid testcase file: {test_file}\nreason: missing config part."
+        )
+        return None
+    elif not isinstance(test_content["config"], Dict):
+        logger.warning(
+            f"Invalid testcase file: {test_file}\n"
+            f"reason: config should be dict type, got {test_content['config']}"
+        )
+        return None
+
+    # ensure path absolute
+    test_content.setdefault("config", {})["path"] = test_file
+
+    # invalid format
+    if "teststeps" not in test_content:
+        logger.warning(f"Invalid testcase file: {test_file}")
+
+    return test_content
+
+
+def __get_ref_testcase_paths(test_content: Any) -> List[Text]:
+    """absolute paths of testcases referenced by steps, same as make_testcase"""
+    if not isinstance(test_content, Dict):
+        return []
+
+    teststeps = test_content.get("teststeps")
+    if not isinstance(teststeps, List):
+        return []
+
+    ref_testcase_paths = []
+    for step in teststeps:
+        if not isinstance(step, Dict) or "request" in step:
+            continue
+        ref_testcase = step.get("api") if "api" in step else step.get("testcase")
+        if ref_testcase:
+            ref_testcase_paths.append(ensure_testcase_abs_path(ref_testcase))
+
+    return ref_testcase_paths
+
+
+def __make_testcase_in_worker(
+    testcase: Dict,
+    dir_path: Optional[Text],
+    ref_testcases: Dict[Text, Any],
+    made_ref_testcases: Dict[Text, Text],
+) -> Tuple[Text, Text, Dict]:
+    """make testcase in worker process, referenced testcases are made already
+
+    Returns:
+        generated pytest file path, class name and make cache entries grouped by
+        (project RootDir, formatter)
+
+    """
+    ref_testcases_loaded_mapping.clear()
+    ref_testcases_loaded_mapping.update(ref_testcases)
+    pytest_files_made_cache_mapping.clear()
+    pytest_files_made_cache_mapping.update(made_ref_testcases)
+    for cache in make_caches.values():
+        # entries inherited from forked parent process
+        cache.pending.clear()
+
+    testcase_python_abs_path = make_testcase(testcase, dir_path)
+    cache_entries = {
+        cache_key: dict(cache.pending)
+        for cache_key, cache in make_caches.items()
+        if cache.pending
+    }
+    return (
+        testcase_python_abs_path,
+        pytest_files_made_cache_mapping[testcase_python_abs_path],
+        cache_entries,
+    )
+
+
+def __plan_make_tasks(
+    test_files: List[Text], output_dir: Optional[Text], load_files: LoadFiles
+) -> Tuple[TestcaseGraph, List[List[Tuple[Text, Dict, Optional[Text], bool]]]]:
+    """index test files and referenced testcases in graph, plan tasks to make them
+
+    Each testcase is loaded once, and tasks are grouped by level in topological
+    order, referenced testcases come first. Test files with circular references are
+    skipped with warnings.
+
+    Returns:
+        testcase graph, and tasks grouped by level, each task is (testcase path,
+        testcase, dir path, whether generated pytest file is to run)
+
+    """
+
+    def get_ref_paths(path: Text, test_content: Any) -> List[Text]:
+        # referenced testcase paths are relative to project of testcase
+        load_project_meta(path)
+        return __get_ref_testcase_paths(test_content)
+
+    graph = TestcaseGraph()
+    for test_file, (test_content, ex) in zip(test_files, load_files(test_files)):
+        if ex is not None:
+            logger.warning(f"Invalid test file: {test_file}\n{type(ex).__name__}: {ex}")
+            continue
+
+        test_content = ensure_test_content(test_file, test_content)
+        if test_content is not None:
+            graph.add(test_file, test_content, get_ref_paths(test_file, test_content))
+
+    testcases = set(graph.contents)
+    graph.load_refs(load_files, get_ref_paths)
+    levels_mapping, errors = graph.build_levels()
+    referenced = {path for ref_paths in graph.refs.values() for path in ref_paths}
+
+    # generated pytest file path => task
+    tasks: Dict[Text, Tuple[Text, Dict, Optional[Text], bool]] = {}
+    for test_file in sorted(testcases):
+        if test_file in errors:
+            logger.warning(
+                f"Invalid testcase file: {test_file}\n"
+                f"{exceptions.CircularReferenceError.__name__}: {errors[test_file]}"
+            )
+            continue
+
+        test_content = graph.contents[test_file]
+        if test_file in referenced:
+            # made as referenced testcase as well
+            test_content = copy.deepcopy(test_content)
+        python_path, _ = get_testcase_python_path(test_file, output_dir)
+        tasks.setdefault(python_path, (test_file, test_content, output_dir, True))
+
+    for ref_path in sorted(referenced):
+        test_content = graph.contents[ref_path]
+        python_path, _ = get_testcase_python_path(ref_path)
+        if (
+            ref_path in errors
+            or not isinstance(test_content, Dict)
+            or python_path in tasks
+            or python_path in pytest_files_made_cache_mapping
+            or __make_from_cache(ref_path)
+        ):
+            # invalid testcase fails when making testcases referencing it
+            continue
+        test_content = ensure_ref_testcase(ref_path, copy.deepcopy(test_content))
+        tasks[python_path] = (ref_path, test_content, None, False)
+
+    levels: Dict[int, List[Tuple[Text, Dict, Optional[Text], bool]]] = {}
+    for python_path in sorted(tasks):
+        task = tasks[python_path]
+        levels.setdefault(levels_mapping[task[0]], []).append(task)
+
+    return graph, [levels[level] for level in sorted(levels)]
+
+
+def __make_test_files(test_files: List[Text], output_dir: Optional[Text]):
+    """make testcases in current process, in the same order as parallel make"""
+    graph, levels = __plan_make_tasks(
+        test_files, output_dir, lambda paths: [__load_test_file(p) for p in paths]
+    )
+    # referenced testcases are made in lower levels, avoid loading again
+    ref_testcases_loaded_mapping.update(graph.contents)
+    try:
+        for level_tasks in levels:
+            for test_file, test_content, dir_path, is_run in level_tasks:
+                try:
+                    python_path = make_testcase(test_content, dir_path)
+                except exceptions.TestCaseFormatError as ex:
+                    logger.warning(
+                        f"Invalid testcase file: {test_file}\n{type(ex).__name__}: {ex}"
+                    )
+                    continue
+
+                if is_run:
+                    pytest_files_run_set.add(python_path)
+    finally:
+        ref_testcases_loaded_mapping.clear()
+
+
+def __make_test_files_parallel(
+    test_files: List[Text], output_dir: Optional[Text], workers: int
+):
+    """make testcases with process pool
+
+    Test files and all referenced testcases are loaded by workers at first, then
+    testcases are made level by level, referenced testcases come first. Each
+    pytest file is generated exactly once, and results are collected in stable
+    order, generated files are the same regardless of workers count.
+    """
+    logger.info(f"make {len(test_files)} test files with {workers} workers")
+    # loaded before forking workers, referenced testcase paths are relative to it
+    load_project_meta(test_files[0])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def load_files(paths: List[Text]) -> List[Tuple[Any, Optional[Exception]]]:
+            chunksize = max(1, len(paths) // (workers * 4))
+            return list(
+                executor.map(__load_test_file_in_worker, paths, chunksize=chunksize)
+            )
+
+        graph, levels = __plan_make_tasks(test_files, output_dir, load_files)
+        for level_tasks in levels:
+            futures = []
+            for test_file, test_content, dir_path, _ in level_tasks:
+                made_ref_testcases = {}
+                for ref_path in graph.refs[test_file]:
+                    ref_python_path, _ = get_testcase_python_path(ref_path)
+                    if ref_python_path in pytest_files_made_cache_mapping:
+                        made_ref_testcases[ref_python_path] = (
+                            pytest_files_made_cache_mapping[ref_python_path]
+                        )
+                futures.append(
+                    executor.submit(
+                        __make_testcase_in_worker,
+                        test_content,
+                        dir_path,
+                        {
+                            ref_path: graph.contents[ref_path]
+                            for ref_path in graph.refs[test_file]
+                        },
+                        made_ref_testcases,
+                    )
+                )
+
+            for (test_file, _, _, is_run), future in zip(level_tasks, futures):
+                try:
+                    python_path, class_name, cache_entries = future.result()
+                except exceptions.TestCaseFormatError as ex:
+                    logger.warning(
+                        f"Invalid testcase file: {test_file}\n{type(ex).__name__}: {ex}"
+                    )
+                    continue
+
+                pytest_files_made_cache_mapping[python_path] = class_name
+                pytest_files_cache_hit_set.discard(python_path)
+                for (root_dir, formatter), entries in cache_entries.items():
+                    __ensure_make_cache(root_dir, formatter).pending.update(entries)
+                if is_run:
+                    pytest_files_run_set.add(python_path)
+
+
 def __make(tests_path: Text, output_dir: Text = None):
     """make testcase(s) with testcase/folder absolute path
         generated pytest file path will be cached in pytest_files_made_cache_mapping
@@ -505,58 +967,28 @@ def __make(tests_path: Text, output_dir: Text = None):
     else:
         raise exceptions.TestcaseNotFound(f"Invalid tests path: {tests_path}")
 
+    make_test_files = []
     for test_file in test_files:
         if test_file.lower().endswith("_test.py"):
             pytest_files_run_set.add(test_file)
             continue
 
-        try:
-            # 解析测试用例文件，转换为字典
-            test_content = load_test_file(test_file)
-        except (exceptions.FileNotFound, exceptions.FileFormatError) as ex:
-            logger.warning(f"Invalid test file: {test_file}\n{type(ex).__name__}: {ex}")
-            continue
-
-        if not isinstance(test_content, Dict):
-            logger.warning(
-                f"Invalid test file: {test_file}\n"
-                f"reason: test content not in dict format."
-            )
-            continue
-
-        # api in v2/v3 format, convert to v4 testcase
-        if "request" in test_content and "name" in test_content:
-            test_content = ensure_testcase_v4_api(test_content)
-
-        if "config" not in test_content:
-            logger.warning(
-                f"Invalid testcase file: {test_file}\nreason: missing config part."
-            )
-            continue
-        elif not isinstance(test_content["config"], Dict):
-            logger.warning(
-                f"Invalid testcase file: {test_file}\n"
-                f"reason: config should be dict type, got {test_content['config']}"
-            )
-            continue
-
-        # ensure path absolute
-        test_content.setdefault("config", {})["path"] = test_file
-
-        # invalid format
-        if "teststeps" not in test_content:
-            logger.warning(f"Invalid testcase file: {test_file}")
-
-        # testcase
-        try:
-            testcase_pytest_path = make_testcase(test_content, output_dir)
+        testcase_pytest_path = __make_from_cache(test_file, output_dir)
+        if testcase_pytest_path:
             pytest_files_run_set.add(testcase_pytest_path)
-        except exceptions.TestCaseFormatError as ex:
-            logger.warning(
-                f"Invalid testcase file: {test_file}\n{type(ex).__name__}: {ex}"
-            )
             continue
 
+        make_test_files.append(test_file)
+
+    workers = min(get_make_workers(), len(make_test_files))
+    if (
+        workers > 1
+        and len(make_test_files) >= PARALLEL_MAKE_MIN_FILES
+        and is_support_multiprocessing()
+    ):
+        __make_test_files_parallel(make_test_files, output_dir, workers)
+    elif make_test_files:
+        __make_test_files(make_test_files, output_dir)
 
 
 def main_make(tests_paths: List[Text], output_dir: Text = None) -> List[Text]:
@@ -584,11 +1016,21 @@ def main_make(tests_paths: List[Text], output_dir: Text = None) -> List[Text]:
             logger.error(ex)
             sys.exit(1)
 
-    # format pytest files
-    pytest_files_format_list = pytest_files_made_cache_mapping.keys()
-    format_pytest_with_black(*pytest_files_format_list)
+    # format pytest files with black optionally, skip files made from cache
+    pytest_files_format_list = [
+        path
+        for path in pytest_files_made_cache_mapping.keys()
+        if path not in pytest_files_cache_hit_set
+    ]
+    if pytest_files_format_list and is_black_format_enabled():
+        format_pytest_with_black(*pytest_files_format_list)
+
+    if is_make_cache_enabled():
+        for cache in make_caches.values():
+            cache.save()
+            cache.log_stat()
 
-    return list(pytest_files_run_set)
+    return sorted(pytest_files_run_set)
 
 
 def init_make_parser(subparsers):
@@ -601,9 +1043,22 @@ def init_make_parser(subparsers):
         "testcase_path", nargs="*", help="Specify YAML/JSON testcase file/folder path"
     )
     parser.add_argument(
-        "--output-dir", "-o",
+        "--output-dir",
+        "-o",
         dest="output_dir",
-        help="Specify output directory for generated pytest files"
+        help="Specify output directory for generated pytest files",
+    )
+    parser.add_argument(
+        "--black",
+        dest="format_with_black",
+        action="store_true",
+        help="Format generated pytest files with black, same as HRUN_MAKE_BLACK=true",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        help="Specify count of make worker processes, same as HRUN_MAKE_WORKERS",
     )
 
     return parser
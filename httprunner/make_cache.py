@@ -0,0 +1,191 @@
+"""persistent cache of generated pytest files, skip making unchanged testcases.
+
+Each YAML/JSON testcase is keyed by hash of its file content, generated pytest file
+path, HttpRunner version, formatter and hash of modules rendering it: make.py and
+make_format.py, where template, chain style conversion and code formatting are
+defined, as well as modules transforming loaded content before rendering, e.g.
+compat.py for v2/v3 conversion and response.py for validators. Testcase is made
+from cache only when its key is unchanged, the generated pytest file is not modified
+since it was made, and all referenced testcases are made from cache as well.
+
+Cache is saved in .hrun_cache folder of project RootDir, and can be disabled with
+environment variable HRUN_MAKE_CACHE=false.
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Dict, List, Set, Text, Tuple, Union
+
+from loguru import logger
+
+from httprunner import __version__, jsonlib
+
+CACHE_DIR_NAME = ".hrun_cache"
+CACHE_FILE_NAME = "make.json"
+
+
+def is_make_cache_enabled() -> bool:
+    return os.getenv("HRUN_MAKE_CACHE", "true").lower() not in ["0", "false", "no"]
+
+
+def hash_file(path: Text) -> Union[Text, None]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def get_template_hash() -> Text:
+    from httprunner import compat, loader, make, make_format, parser, response, utils
+
+    # make & make_format render testcase, the others transform loaded content
+    modules = [make, make_format, compat, loader, parser, response, utils]
+    return ":".join(hash_file(module.__file__) or "" for module in modules)
+
+
+class MakeCache(object):
+    def __init__(self, root_dir: Text, formatter: Text = "builtin"):
+        self.root_dir = root_dir
+        self.formatter = formatter
+        self.cache_path = os.path.join(root_dir, CACHE_DIR_NAME, CACHE_FILE_NAME)
+        self.salt = f"{__version__}:{formatter}:{get_template_hash()}"
+        # relative testcase path => entry
+        self.entries: Dict[Text, Dict] = self.__load()
+        # generated in current run, output hash is saved after formatting
+        self.pending: Dict[Text, Dict] = {}
+        self.hits: Set[Text] = set()
+        self.misses: Set[Text] = set()
+        # (relative testcase path, dir path) => hit entries, looked up in current run
+        self.lookups: Dict[Tuple[Text, Text], List[Dict]] = {}
+
+    def __load(self) -> Dict[Text, Dict]:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cache = jsonlib.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if cache.get("salt") != self.salt:
+            # HttpRunner upgraded, make template or formatter changed
+            return {}
+
+        return cache.get("entries", {})
+
+    def __relative(self, path: Text) -> Text:
+        return os.path.relpath(path, self.root_dir)
+
+    def __absolute(self, path: Text) -> Text:
+        return os.path.normpath(os.path.join(self.root_dir, path))
+
+    def make_key(self, testcase_path: Text, dir_path: Text = None) -> Union[Text, None]:
+        content_hash = hash_file(testcase_path)
+        if content_hash is None:
+            return None
+
+        relative_path = self.__relative(testcase_path)
+        source = f"{self.salt}:{relative_path}:{dir_path}:{content_hash}"
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def lookup(self, testcase_path: Text, dir_path: Text = None) -> List[Dict]:
+        """lookup cached testcase and its referenced testcases
+
+        Testcase referenced by many testcases is looked up once in a run, a modified
+        testcase misses and so do testcases referencing it, others are still hit.
+
+        Returns:
+            list of hit entries, testcase itself comes last. empty list if missed.
+
+        """
+        relative_path = self.__relative(testcase_path)
+        lookup_key = (relative_path, dir_path)
+        if lookup_key not in self.lookups:
+            # missed in circular references of outdated entries
+            self.lookups[lookup_key] = []
+            self.lookups[lookup_key] = self.__lookup(relative_path, dir_path)
+
+        return self.lookups[lookup_key]
+
+    def __lookup(self, relative_path: Text, dir_path: Text = None) -> List[Dict]:
+        testcase_path = self.__absolute(relative_path)
+        entry = self.entries.get(relative_path)
+        if not entry or entry["key"] != self.make_key(testcase_path, dir_path):
+            self.misses.add(relative_path)
+            return []
+
+        python_path = self.__absolute(entry["python_path"])
+        if hash_file(python_path) != entry["output_hash"]:
+            # generated pytest file modified or removed
+            self.misses.add(relative_path)
+            return []
+
+        hit_entries = []
+        for ref_path in entry["refs"]:
+            ref_entries = self.lookup(self.__absolute(ref_path))
+            if not ref_entries:
+                self.misses.add(relative_path)
+                return []
+            hit_entries.extend(ref_entries)
+
+        self.hits.add(relative_path)
+        hit_entries.append(
+            {
+                "python_path": python_path,
+                "class_name": entry["class_name"],
+            }
+        )
+        return hit_entries
+
+    def add(
+        self,
+        testcase_path: Text,
+        python_path: Text,
+        class_name: Text,
+        refs: List[Text],
+        dir_path: Text = None,
+    ):
+        """add generated testcase, saved to cache after pytest file formatted"""
+        key = self.make_key(testcase_path, dir_path)
+        if key is None:
+            return
+
+        self.pending[self.__relative(testcase_path)] = {
+            "key": key,
+            "python_path": self.__relative(python_path),
+            "class_name": class_name,
+            "refs": [self.__relative(ref_path) for ref_path in refs],
+        }
+
+    def save(self):
+        # testcases may be modified before next run
+        self.lookups.clear()
+        if not self.pending:
+            return
+
+        for relative_path, entry in self.pending.items():
+            output_hash = hash_file(self.__absolute(entry["python_path"]))
+            if output_hash is None:
+                continue
+            entry["output_hash"] = output_hash
+            self.entries[relative_path] = entry
+        self.pending = {}
+
+        cache_dir = os.path.dirname(self.cache_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                cache = {"salt": self.salt, "entries": self.entries}
+                jsonlib.dump(cache, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except OSError as ex:
+            logger.warning(f"failed to save make cache: {ex}")
+
+    def log_stat(self):
+        logger.info(
+            f"make cache: {len(self.hits)} hits, {len(self.misses)} misses, "
+            f"saved in {self.cache_path}"
+        )
+        self.hits.clear()
+        self.misses.clear()
@@ -0,0 +1,291 @@
+""" format generated pytest code in black code style, without running black.
+
+Code generated by make is limited to chain style expressions of config and teststeps,
+and literals of variables, headers, parameters etc. These expressions are parsed with
+ast and laid out the way black does:
+
+- line fits in 88 characters is kept as it is
+- chain style with more than one call is split one call per line, wrapped with
+  parentheses if it is not in brackets already
+- otherwise split at the last bracket, items of collections are put one per line
+  with trailing comma
+
+Black is optional for generated pytest files, enable it with `hmake --black` or
+environment variable HRUN_MAKE_BLACK=true.
+"""
+
+import ast
+import unicodedata
+from typing import List, Text, Tuple
+
+LINE_LENGTH = 88
+INDENT = "    "
+
+# (prefix, node), e.g. ("**", dict), ("key=", value), ('"key": ', value)
+Item = Tuple[Text, ast.AST]
+
+
+class _Unsupported(Exception):
+    """expression is not generated by make, keep it as it is"""
+
+
+def _width(line: Text) -> int:
+    """display width, east asian wide characters take two columns like black"""
+    if line.isascii():
+        return len(line)
+
+    return sum(
+        2 if unicodedata.east_asian_width(char) in ["W", "F"] else 1 for char in line
+    )
+
+
+def format_str(value: Text) -> Text:
+    """string literal, prefer double quotes unless it needs more escapes"""
+    literal = repr(value)
+    if literal[0] == '"' or value.count('"') > value.count("'"):
+        return literal
+
+    body = literal[1:-1].replace("\\'", "'").replace('"', '\\"')
+    return f'"{body}"'
+
+
+def _call_items(node: ast.Call) -> List[Item]:
+    items = [
+        ("*", arg.value) if isinstance(arg, ast.Starred) else ("", arg)
+        for arg in node.args
+    ]
+    for keyword in node.keywords:
+        prefix = "**" if keyword.arg is None else f"{keyword.arg}="
+        items.append((prefix, keyword.value))
+
+    # keep original order of positional and keyword arguments
+    items.sort(key=lambda item: (item[1].lineno, item[1].col_offset))
+    return items
+
+
+def _collection(node: ast.AST) -> Tuple[Text, Text, List[Item]]:
+    if isinstance(node, ast.Dict):
+        items = [
+            ("**", value) if key is None else (f"{_flat(key)}: ", value)
+            for key, value in zip(node.keys, node.values)
+        ]
+        return "{", "}", items
+    if isinstance(node, ast.List):
+        return "[", "]", [("", elt) for elt in node.elts]
+    if isinstance(node, ast.Set):
+        return "{", "}", [("", elt) for elt in node.elts]
+    if isinstance(node, ast.Tuple):
+        return "(", ")", [("", elt) for elt in node.elts]
+
+    raise _Unsupported(type(node).__name__)
+
+
+def _flat_items(items: List[Item]) -> Text:
+    return ", ".join(f"{prefix}{_flat(node)}" for prefix, node in items)
+
+
+def _flat(node: ast.AST) -> Text:
+    """format expression in one line, cached on node for enclosing lines"""
+    text = getattr(node, "_flat_text", None)
+    if text is None:
+        text = node._flat_text = _format_flat(node)
+    return text
+
+
+def _format_flat(node: ast.AST) -> Text:
+    if isinstance(node, ast.Call):
+        return f"{_flat(node.func)}({_flat_items(_call_items(node))})"
+    if isinstance(node, ast.Attribute):
+        return f"{_flat(node.value)}.{node.attr}"
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, (ast.Dict, ast.List, ast.Set, ast.Tuple)):
+        opening, closing, items = _collection(node)
+        if isinstance(node, ast.Tuple) and len(items) == 1:
+            return f"({_flat_items(items)},)"
+        return f"{opening}{_flat_items(items)}{closing}"
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+    else:
+        # negative numbers, or literals of python<3.8
+        try:
+            value = ast.literal_eval(node)
+        except ValueError:
+            raise _Unsupported(type(node).__name__)
+
+    if isinstance(value, str):
+        return format_str(value)
+    return repr(value)
+
+
+def _split_chain(node: ast.AST) -> Tuple[ast.AST, List[ast.Call]]:
+    """split chain style, e.g. Config("x").variables(**{}).verify(False)
+    => Config("x"), [.variables(**{}), .verify(False)]
+    """
+    calls = []
+    while (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Call)
+    ):
+        calls.append(node)
+        node = node.func.value
+
+    calls.reverse()
+    return node, calls
+
+
+def _lines(
+    node: ast.AST,
+    depth: int,
+    prefix: Text = "",
+    suffix: Text = "",
+    in_brackets: bool = False,
+) -> List[Text]:
+    indent = INDENT * depth
+    line = f"{indent}{prefix}{_flat(node)}{suffix}"
+    if _width(line) <= LINE_LENGTH:
+        return [line]
+
+    head, calls = _split_chain(node)
+    if len(calls) > 1:
+        if not in_brackets:
+            return (
+                [f"{indent}{prefix}("]
+                + _lines(node, depth + 1, in_brackets=True)
+                + [f"{indent}){suffix}"]
+            )
+
+        lines = _lines(head, depth, prefix, in_brackets=True)
+        for index, call in enumerate(calls):
+            lines.extend(
+                _bracket_lines(
+                    f".{call.func.attr}(",
+                    _call_items(call),
+                    ")",
+                    depth,
+                    suffix if index == len(calls) - 1 else "",
+                    is_call=True,
+                )
+            )
+        return lines
+
+    if calls and _width(f"{indent}{prefix}{_flat(node.func)}(") > LINE_LENGTH:
+        # split at the first bracket if line is still too long at the last one
+        # e.g. RunRequest(\n    "long name"\n).get("/get")
+        lines = _bracket_lines(
+            f"{prefix}{_flat(head.func)}(",
+            _call_items(head),
+            ")",
+            depth,
+            "",
+            is_call=True,
+            force_split=True,
+        )
+        lines[-1:] = _bracket_lines(
+            f").{node.func.attr}(", _call_items(node), ")", depth, suffix, is_call=True
+        )
+        return lines
+
+    if isinstance(node, ast.Call):
+        return _bracket_lines(
+            f"{prefix}{_flat(node.func)}(",
+            _call_items(node),
+            ")",
+            depth,
+            suffix,
+            is_call=True,
+        )
+
+    if isinstance(node, (ast.Dict, ast.List, ast.Set, ast.Tuple)):
+        opening, closing, items = _collection(node)
+        return _bracket_lines(
+            f"{prefix}{opening}",
+            items,
+            closing,
+            depth,
+            suffix,
+            explode=len(items) > 1 or isinstance(node, ast.Tuple),
+        )
+
+    # atom can not be split, e.g. long string
+    return [line]
+
+
+def _bracket_lines(
+    head: Text,
+    items: List[Item],
+    closing: Text,
+    depth: int,
+    suffix: Text,
+    is_call: bool = False,
+    explode: bool = False,
+    force_split: bool = False,
+) -> List[Text]:
+    """split at bracket if line is too long, put items in body lines"""
+    indent = INDENT * depth
+    line = f"{indent}{head}{_flat_items(items)}{closing}{suffix}"
+    if not items or (
+        not (explode or force_split) and _width(line) <= LINE_LENGTH
+    ):
+        return [line]
+
+    body_indent = INDENT * (depth + 1)
+    body_line = f"{body_indent}{_flat_items(items)}"
+    if not explode and _width(body_line) <= LINE_LENGTH:
+        body_lines = [body_line]
+    elif not explode and len(items) == 1:
+        item_prefix, item_node = items[0]
+        body_lines = _lines(item_node, depth + 1, item_prefix, in_brackets=True)
+    else:
+        # trailing comma after *args or **kwargs is invalid in python<3.6 calls
+        has_varargs = any(prefix in ["*", "**"] for prefix, _ in items)
+        trailing_comma = "" if is_call and has_varargs else ","
+        body_lines = []
+        for index, (item_prefix, item_node) in enumerate(items):
+            item_suffix = "," if index < len(items) - 1 else trailing_comma
+            body_lines.extend(
+                _lines(item_node, depth + 1, item_prefix, item_suffix, True)
+            )
+
+    return [f"{indent}{head}"] + body_lines + [f"{indent}{closing}{suffix}"]
+
+
+def format_expr(
+    source: Text,
+    depth: int = 0,
+    prefix: Text = "",
+    suffix: Text = "",
+    in_brackets: bool = False,
+) -> Text:
+    """format expression source code, e.g. chain style of config and teststeps
+
+    Args:
+        source: expression source code in one line
+        depth: indentation level
+        prefix: code before expression, e.g. "config = "
+        suffix: code after expression, e.g. ","
+        in_brackets: expression is item of list or arguments
+
+    Returns:
+        formatted lines, kept as it is if expression is not supported
+
+    """
+    try:
+        node = ast.parse(source.strip(), mode="eval").body
+        return "\n".join(_lines(node, depth, prefix, suffix, in_brackets))
+    except (SyntaxError, _Unsupported):
+        return f"{INDENT * depth}{prefix}{source}{suffix}"
+
+
+def format_import(module: Text, name: Text) -> Text:
+    """e.g. from request_methods.request_with_functions_test import (
+        TestCaseRequestWithFunctions as RequestWithFunctions,
+    )
+    """
+    line = f"from {module} import {name}"
+    if _width(line) <= LINE_LENGTH:
+        return line
+
+    return f"from {module} import (\n{INDENT}{name},\n)"
@@ -0,0 +1,95 @@
+import unittest
+
+from httprunner.make_format import format_expr, format_import, format_str
+
+
+class TestMakeFormat(unittest.TestCase):
+    def test_format_str(self):
+        self.assertEqual(format_str("foo"), '"foo"')
+        self.assertEqual(format_str("it's"), '"it\'s"')
+        self.assertEqual(format_str('say "hi"'), "'say \"hi\"'")
+        self.assertEqual(format_str("\\d+'\""), '"\\\\d+\'\\""')
+        self.assertEqual(format_str("中文"), '"中文"')
+
+    def test_format_expr_in_one_line(self):
+        self.assertEqual(
+            format_expr(
+                """Config("demo").variables(**{'foo': 'bar'}).verify(False)""",
+                depth=1,
+                prefix="config = ",
+            ),
+            """    config = Config("demo").variables(**{"foo": "bar"}).verify(False)""",
+        )
+
+    def test_format_expr_chain_style(self):
+        self.assertEqual(
+            format_expr(
+                """Config("request methods testcase with functions").variables(**{'foo1': 'config_bar1', 'foo2': 'config_bar2', 'expect_foo1': 'config_bar1', 'expect_foo2': 'config_bar2'}).base_url("https://postman-echo.com").verify(False).export(*['foo3'])""",
+                depth=1,
+                prefix="config = ",
+            ),
+            """    config = (
+        Config("request methods testcase with functions")
+        .variables(
+            **{
+                "foo1": "config_bar1",
+                "foo2": "config_bar2",
+                "expect_foo1": "config_bar1",
+                "expect_foo2": "config_bar2",
+            }
+        )
+        .base_url("https://postman-echo.com")
+        .verify(False)
+        .export(*["foo3"])
+    )""",
+        )
+
+    def test_format_expr_in_brackets(self):
+        self.assertEqual(
+            format_expr(
+                """Step(RunRequest("get with params").get("/get").with_params(**{'foo1': '$foo1', 'foo2': '$foo2'}).validate().assert_equal("status_code", 200))""",
+                depth=2,
+                suffix=",",
+                in_brackets=True,
+            ),
+            """        Step(
+            RunRequest("get with params")
+            .get("/get")
+            .with_params(**{"foo1": "$foo1", "foo2": "$foo2"})
+            .validate()
+            .assert_equal("status_code", 200)
+        ),""",
+        )
+
+    def test_format_expr_split_at_first_bracket(self):
+        self.assertEqual(
+            format_expr(
+                """RunRequest("request with a very long name, which takes most of the line").get("/get")""",
+                depth=3,
+            ),
+            """            RunRequest(
+                "request with a very long name, which takes most of the line"
+            ).get("/get")""",
+        )
+
+    def test_format_expr_unsupported(self):
+        self.assertEqual(
+            format_expr("""Config("invalid "name"")""", depth=1, prefix="config = "),
+            """    config = Config("invalid "name"")""",
+        )
+        self.assertEqual(format_expr("a + b", depth=1), "    a + b")
+
+    def test_format_import(self):
+        self.assertEqual(
+            format_import("demo_test", "TestCaseDemo as Demo"),
+            "from demo_test import TestCaseDemo as Demo",
+        )
+        self.assertEqual(
+            format_import(
+                "request_methods.request_with_functions_test",
+                "TestCaseRequestWithFunctions as RequestWithFunctions",
+            ),
+            """from request_methods.request_with_functions_test import (
+    TestCaseRequestWithFunctions as RequestWithFunctions,
+)""",
+        )
@@ -0,0 +1,134 @@
+""" graph of referenced testcases, indexed once per make.
+
+Nodes are testcase absolute paths, and edges are testcase => testcases referenced
+in its teststeps. Each testcase in the graph is loaded once however many testcases
+refer to it, and testcases are made level by level in topological order, referenced
+testcases come first, so that making a testcase never recurses into its references.
+
+Testcases in circular references and testcases referencing them can not be made,
+they are reported with the reference chain, e.g. a.yml -> b.yml -> a.yml.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Text, Tuple
+
+# load test files, return (content, exception) of each file in the same order
+LoadFiles = Callable[[List[Text]], List[Tuple[Any, Optional[Exception]]]]
+
+
+def format_reference_chain(chain: List[Text]) -> Text:
+    return f"circular testcase reference: {' -> '.join(chain)}"
+
+
+class TestcaseGraph(object):
+    def __init__(self):
+        # testcase path => loaded content
+        self.contents: Dict[Text, Any] = {}
+        # testcase path => referenced testcase paths
+        self.refs: Dict[Text, List[Text]] = {}
+
+    def add(self, path: Text, content: Any, ref_paths: List[Text]):
+        self.contents[path] = content
+        self.refs[path] = ref_paths
+
+    def load_refs(
+        self, load_files: LoadFiles, get_ref_paths: Callable[[Text, Any], List[Text]]
+    ):
+        """load referenced testcases recursively, each one is loaded once.
+        get_ref_paths gets referenced testcase paths with testcase path and content.
+
+        Raises:
+            exception of loading referenced testcase, e.g. exceptions.FileNotFound
+
+        """
+        pending_paths = self.__pending_ref_paths(self.refs)
+        while pending_paths:
+            for path, (content, ex) in zip(pending_paths, load_files(pending_paths)):
+                if ex is not None:
+                    raise ex
+                self.add(path, content, get_ref_paths(path, content))
+
+            pending_paths = self.__pending_ref_paths(pending_paths)
+
+    def __pending_ref_paths(self, paths: Iterable[Text]) -> List[Text]:
+        return sorted(
+            {
+                ref_path
+                for path in paths
+                for ref_path in self.refs[path]
+                if ref_path not in self.refs
+            }
+        )
+
+    def dependents(self, paths: Iterable[Text]) -> Set[Text]:
+        """testcases referencing any of paths directly or indirectly, paths included"""
+        referenced_by: Dict[Text, List[Text]] = {}
+        for path, ref_paths in self.refs.items():
+            for ref_path in ref_paths:
+                referenced_by.setdefault(ref_path, []).append(path)
+
+        affected = set()
+        stack = list(paths)
+        while stack:
+            path = stack.pop()
+            if path not in affected:
+                affected.add(path)
+                stack.extend(referenced_by.get(path, []))
+
+        return affected
+
+    def find_cycles(self) -> List[List[Text]]:
+        """circular reference chains found by depth-first search, e.g. [a, b, a].
+        each testcase in circular references is in one chain at least.
+        """
+        cycles = []
+        # 1: in current search chain, 2: searched
+        states: Dict[Text, int] = {}
+        for start_path in sorted(self.refs):
+            if start_path in states:
+                continue
+
+            states[start_path] = 1
+            chain = [start_path]
+            stack = [iter(self.refs[start_path])]
+            while stack:
+                ref_path = next(stack[-1], None)
+                if ref_path is None:
+                    states[chain.pop()] = 2
+                    stack.pop()
+                elif states.get(ref_path) == 1:
+                    cycles.append(chain[chain.index(ref_path) :] + [ref_path])
+                elif ref_path not in states:
+                    states[ref_path] = 1
+                    chain.append(ref_path)
+                    stack.append(iter(self.refs.get(ref_path, [])))
+
+        return cycles
+
+    def build_levels(self) -> Tuple[Dict[Text, int], Dict[Text, Text]]:
+        """level of each testcase in topological order, level 0 references no testcase,
+        and testcase references testcases of lower levels only.
+
+        Returns:
+            (testcase path => level, testcase path => circular reference error)
+
+        """
+        errors: Dict[Text, Text] = {}
+        for chain in self.find_cycles():
+            for path in sorted(self.dependents(chain[:-1])):
+                errors.setdefault(path, format_reference_chain(chain))
+
+        levels_mapping: Dict[Text, int] = {}
+
+        def get_level(path: Text) -> int:
+            # testcases with circular references are excluded, recursion ends
+            if path not in levels_mapping:
+                levels_mapping[path] = 1 + max(
+                    [-1] + [get_level(ref_path) for ref_path in self.refs.get(path, [])]
+                )
+            return levels_mapping[path]
+
+        for path in sorted(self.refs):
+            if path not in errors:
+                get_level(path)
+
+        return levels_mapping, errors
@@ -0,0 +1,58 @@
+import unittest
+
+from httprunner import make_graph
+
+
+class TestTestcaseGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        # a, b => shared => base, c <=> d, e => c
+        self.graph = make_graph.TestcaseGraph()
+        for path, ref_paths in [
+            ("a", ["shared"]),
+            ("b", ["shared", "base"]),
+            ("shared", ["base"]),
+            ("base", []),
+            ("c", ["d"]),
+            ("d", ["c"]),
+            ("e", ["c"]),
+        ]:
+            self.graph.add(path, {"name": path}, ref_paths)
+
+    def test_load_refs(self):
+        loaded = []
+
+        def load_files(paths):
+            loaded.extend(paths)
+            return [({"refs": self.graph.refs.get(path, [])}, None) for path in paths]
+
+        graph = make_graph.TestcaseGraph()
+        graph.add("a", {}, ["shared"])
+        graph.add("b", {}, ["shared", "base"])
+        graph.load_refs(load_files, lambda path, content: content["refs"])
+        # each referenced testcase is loaded once
+        self.assertEqual(loaded, ["base", "shared"])
+        self.assertEqual(graph.refs["shared"], ["base"])
+
+        def load_files_failed(paths):
+            return [(None, FileNotFoundError(path)) for path in paths]
+
+        graph = make_graph.TestcaseGraph()
+        graph.add("a", {}, ["not_exist"])
+        with self.assertRaises(FileNotFoundError):
+            graph.load_refs(load_files_failed, lambda path, content: [])
+
+    def test_dependents(self):
+        self.assertEqual(self.graph.dependents(["base"]), {"a", "b", "shared", "base"})
+        self.assertEqual(self.graph.dependents(["a"]), {"a"})
+
+    def test_find_cycles(self):
+        self.assertEqual(self.graph.find_cycles(), [["c", "d", "c"]])
+
+        self.graph.add("f", {}, ["f"])
+        self.assertEqual(self.graph.find_cycles(), [["c", "d", "c"], ["f", "f"]])
+
+    def test_build_levels(self):
+        levels_mapping, errors = self.graph.build_levels()
+        self.assertEqual(levels_mapping, {"base": 0, "shared": 1, "a": 2, "b": 2})
+        error = "circular testcase reference: c -> d -> c"
+        self.assertEqual(errors, {"c": error, "d": error, "e": error})
@@ -1,7 +1,11 @@
+import json
 import os
+import subprocess
+import tempfile
 import unittest
+from unittest import mock
 
-from httprunner import loader
+from httprunner import compat, exceptions, loader, make, make_cache
 from httprunner.make import (
     main_make,
     convert_testcase_path,
@@ -9,6 +13,7 @@ from httprunner.make import (
     make_config_chain_style,
     make_teststep_chain_style,
     pytest_files_run_set,
+    pytest_files_cache_hit_set,
     ensure_file_abs_path_valid,
 )
 
@@ -17,6 +22,7 @@ class TestMake(unittest.TestCase):
     def setUp(self) -> None:
         pytest_files_made_cache_mapping.clear()
         pytest_files_run_set.clear()
+        pytest_files_cache_hit_set.clear()
         loader.project_meta = None
         self.data_dir = os.path.join(os.getcwd(), "examples", "data")
 
@@ -36,6 +42,96 @@ class TestMake(unittest.TestCase):
             ),
         )
 
+    def test_make_testcase_from_cache(self):
+        path = [
+            "examples/postman_echo/request_methods/request_with_testcase_reference.yml"
+        ]
+        main_make(path)
+        testcase_python_path = os.path.join(
+            os.getcwd(),
+            "examples",
+            "postman_echo",
+            "request_methods",
+            "request_with_testcase_reference_test.py",
+        )
+        with open(testcase_python_path) as f:
+            content = f.read()
+
+        # testcase and referenced testcase are not rendered again
+        pytest_files_made_cache_mapping.clear()
+        pytest_files_run_set.clear()
+        with mock.patch.object(make, "format_pytest_with_black") as format_black:
+            with mock.patch.object(make.__TEMPLATE__, "render") as render:
+                self.assertEqual(main_make(path), [testcase_python_path])
+        format_black.assert_not_called()
+        render.assert_not_called()
+        self.assertEqual(len(pytest_files_cache_hit_set), 2)
+        with open(testcase_python_path) as f:
+            self.assertEqual(f.read(), content)
+
+        # module transforming loaded content changed, e.g. v2/v3 conversion
+        hash_file = make_cache.hash_file
+        pytest_files_made_cache_mapping.clear()
+        pytest_files_cache_hit_set.clear()
+        with mock.patch.object(
+            make_cache,
+            "hash_file",
+            lambda path: "changed" if path == compat.__file__ else hash_file(path),
+        ), mock.patch.dict(make.make_caches, clear=True):
+            main_make(path)
+        self.assertNotIn(testcase_python_path, pytest_files_cache_hit_set)
+
+        # generated pytest file modified
+        with open(testcase_python_path, "a") as f:
+            f.write("# modified\n")
+        pytest_files_made_cache_mapping.clear()
+        main_make(path)
+        self.assertNotIn(testcase_python_path, pytest_files_cache_hit_set)
+        with open(testcase_python_path) as f:
+            self.assertEqual(f.read(), content)
+
+    def test_make_cache_of_several_projects(self):
+        testcase = {
+            "config": {"name": "get"},
+            "teststeps": [{"name": "get", "request": {"method": "GET", "url": "/"}}],
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dirs = [os.path.join(temp_dir, name) for name in ["a", "b"]]
+            for project_dir in project_dirs:
+                os.makedirs(project_dir)
+                open(os.path.join(project_dir, "debugtalk.py"), "w").close()
+                with open(os.path.join(project_dir, "get.json"), "w") as f:
+                    json.dump(testcase, f)
+
+            main_make(project_dirs)
+
+            # cache of each project is saved
+            for project_dir in project_dirs:
+                cache_path = os.path.join(project_dir, ".hrun_cache", "make.json")
+                with open(cache_path) as f:
+                    self.assertIn("get.json", json.load(f)["entries"])
+
+    def test_make_testcase_format_with_black(self):
+        path = ["examples/postman_echo/request_methods/request_with_functions.yml"]
+        with mock.patch.dict(os.environ, {"HRUN_MAKE_CACHE": "false"}):
+            with mock.patch.object(make, "format_pytest_with_black") as format_black:
+                testcase_python_list = main_make(path)
+            format_black.assert_not_called()
+
+            # generated pytest files are formatted in black code style already
+            result = subprocess.run(
+                ["black", "--check", *testcase_python_list], capture_output=True
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+
+            pytest_files_made_cache_mapping.clear()
+            with mock.patch.dict(os.environ, {"HRUN_MAKE_BLACK": "true"}):
+                with mock.patch.object(
+                    make, "format_pytest_with_black"
+                ) as format_black:
+                    main_make(path)
+            format_black.assert_called_once_with(*testcase_python_list)
+
     def test_make_testcase_with_outputdir(self):
         path = ["test_case_yaml/test_regex_extract.yml"]
         output_dir = "test_case_pytest"
@@ -108,6 +204,92 @@ from request_methods.request_with_functions_test import (
             testcase_python_list,
         )
 
+    def test_make_testcase_folder_parallel(self):
+        path = ["examples/postman_echo/request_methods/"]
+
+        def make_folder(workers):
+            pytest_files_made_cache_mapping.clear()
+            pytest_files_run_set.clear()
+            env = {"HRUN_MAKE_CACHE": "false", "HRUN_MAKE_WORKERS": str(workers)}
+            with mock.patch.dict(os.environ, env):
+                with mock.patch.object(make, "PARALLEL_MAKE_MIN_FILES", 1):
+                    testcase_python_list = main_make(path)
+
+            contents = {}
+            for python_path in pytest_files_made_cache_mapping:
+                with open(python_path) as f:
+                    contents[python_path] = f.read()
+            return testcase_python_list, contents
+
+        serial_python_list, serial_contents = make_folder(1)
+        parallel_python_list, parallel_contents = make_folder(2)
+        self.assertEqual(parallel_python_list, serial_python_list)
+        self.assertEqual(parallel_contents, serial_contents)
+        # referenced testcase is made once, and not run directly
+        self.assertIn(
+            os.path.join(
+                os.getcwd(),
+                "examples",
+                "postman_echo",
+                "request_methods",
+                "request_with_testcase_reference_test.py",
+            ),
+            parallel_python_list,
+        )
+
+    def test_make_testcase_with_circular_reference(self):
+        def testcase(name, ref=None):
+            step = {"name": "get", "request": {"method": "GET", "url": "/get"}}
+            if ref:
+                step = {"name": f"call {ref}", "testcase": ref}
+            return {"config": {"name": name}, "teststeps": [step]}
+
+        with tempfile.TemporaryDirectory() as project_dir:
+            open(os.path.join(project_dir, "debugtalk.py"), "w").close()
+            testcases = {
+                "a": testcase("a", "b.json"),
+                "b": testcase("b", "a.json"),
+                "c": testcase("c", "a.json"),
+                "d": testcase("d"),
+                "e": testcase("e", "d.json"),
+                "f": testcase("f", "d.json"),
+            }
+            for name, content in testcases.items():
+                with open(os.path.join(project_dir, f"{name}.json"), "w") as f:
+                    json.dump(content, f)
+
+            with mock.patch.dict(os.environ, {"HRUN_MAKE_CACHE": "false"}):
+                with mock.patch.object(
+                    make, "load_test_file", wraps=make.load_test_file
+                ) as load_test_file:
+                    testcase_python_list = main_make([project_dir])
+
+            # testcases in or referencing circular references are skipped
+            self.assertEqual(
+                testcase_python_list,
+                [
+                    os.path.join(project_dir, f"{name}_test.py")
+                    for name in ["d", "e", "f"]
+                ],
+            )
+            # referenced testcase is loaded once
+            loaded_paths = [call.args[0] for call in load_test_file.call_args_list]
+            self.assertEqual(loaded_paths.count(os.path.join(project_dir, "d.json")), 1)
+
+            # make testcase directly
+            a_path = os.path.join(project_dir, "a.json")
+            content = testcases["a"]
+            content["config"]["path"] = a_path
+            with mock.patch.dict(os.environ, {"HRUN_MAKE_CACHE": "false"}):
+                with self.assertRaises(exceptions.CircularReferenceError) as cm:
+                    make.make_testcase(content)
+            b_path = os.path.join(project_dir, "b.json")
+            self.assertEqual(
+                str(cm.exception),
+                f"circular testcase reference: {a_path} -> {b_path} -> {a_path}",
+            )
+            self.assertEqual(make.testcases_making_stack, [])
+
     def test_ensure_file_path_valid(self):
         self.assertEqual(
             ensure_file_abs_path_valid(os.path.join(self.data_dir, "a-b.c", "2 3.yml")),
@@ -195,6 +377,41 @@ from request_methods.request_with_functions_test import (
             """Step(RunRequest("get with params").with_variables(**{'foo1': 'bar1', 'foo2': 123, 'sum_v': '${sum_two(1, 2)}'}).get("/get").with_params(**{'foo1': '$foo1', 'foo2': '$foo2', 'sum_v': '$sum_v'}).with_headers(**{'User-Agent': 'HttpRunner/${get_httprunner_version()}'}).extract().with_jmespath('body.args.foo1', 'session_foo1').with_jmespath('body.args.foo2', 'session_foo2').validate().assert_equal("status_code", 200).assert_equal("body.args.sum_v", "3"))""",
         )
 
+    def test_make_teststep_with_snapshot_chain_style(self):
+        step = {
+            "name": "list orders",
+            "request": {"method": "GET", "url": "/orders"},
+            "snapshot": {"ignore": ["body.meta.request_id"]},
+        }
+        self.assertEqual(
+            make_teststep_chain_style(step),
+            """Step(RunRequest("list orders").get("/orders").validate().assert_snapshot(ignore=['body.meta.request_id']))""",
+        )
+
+    def test_make_teststep_stop_on_failure_chain_style(self):
+        step = {
+            "name": "list orders",
+            "request": {"method": "GET", "url": "/orders"},
+            "validate": [{"eq": ["status_code", 200]}],
+            "validate_stop_on_failure": True,
+        }
+        self.assertEqual(
+            make_teststep_chain_style(step),
+            """Step(RunRequest("list orders").get("/orders").validate(stop_on_failure=True).assert_equal("status_code", 200))""",
+        )
+
+    def test_make_teststep_repeat_chain_style(self):
+        step = {
+            "name": "list orders",
+            "repeat": {"times": 100, "warmup": 5},
+            "request": {"method": "GET", "url": "/orders"},
+            "validate": [{"lt": ["$elapsed_p95", 0.5]}],
+        }
+        self.assertEqual(
+            make_teststep_chain_style(step),
+            """Step(RunRequest("list orders").repeat(100, warmup=5).get("/orders").validate().assert_less_than("$elapsed_p95", 0.5))""",
+        )
+
     def test_make_requests_with_json_chain_style(self):
         step = {
             "name": "get with params",
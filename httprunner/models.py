@@ -1,8 +1,8 @@
 import os
 from enum import Enum
-from typing import Any, Callable, Dict, List, Text, Union
+from typing import Any, Callable, Dict, List, Text, Tuple, Union
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, PrivateAttr
 
 Name = Text
 Url = Text
@@ -114,6 +114,14 @@ class TSqlRequest(BaseModel):
     size: int = 0  # limit nums of sql result
 
 
+class RetentionEnum(Text, Enum):
+    """retention policy of step results in testcase summary"""
+
+    ALL = "all"  # keep all step results
+    FAILED = "failed"  # keep failed step results only
+    NONE = "none"  # keep step counters only
+
+
 class TConfig(BaseModel):
     name: Name
     verify: Verify = False
@@ -128,6 +136,12 @@ class TConfig(BaseModel):
     # configs for other protocols
     thrift: TConfigThrift = None
     db: TConfigDB = TConfigDB()
+    # step results retention, bound memory for long runs
+    retention: RetentionEnum = RetentionEnum.ALL
+    max_step_results: Union[int, None] = None  # keep latest N step results
+    keep_session_data: bool = True  # keep request/response data in step results
+    # testcase time budget in seconds, request timeouts are clamped to remaining time
+    deadline: Union[float, None] = None
 
 
 class TRequest(BaseModel):
@@ -142,10 +156,27 @@ class TRequest(BaseModel):
     cookies: Cookies = {}
     timeout: float = 120
     allow_redirects: bool = True
+    stream: bool = False  # extract simple body paths from response stream
     verify: Verify = False
     upload: Dict = {}  # used for upload files
 
 
+class TSnapshot(BaseModel):
+    """golden response snapshot of request step"""
+
+    name: Text = ""  # default to <testcase class>/<step name>
+    fields: List[Text] = ["status_code", "body"]
+    ignore: List[Text] = []  # volatile paths, e.g. body.meta.request_id
+
+
+class TRepeat(BaseModel):
+    """repeated-sample request step, see httprunner.sampling"""
+
+    times: int
+    warmup: int = 0  # warm-up samples are discarded
+    concurrency: int = 1
+
+
 class TStep(BaseModel):
     name: Name
     request: Union[TRequest, None] = None
@@ -159,11 +190,17 @@ class TStep(BaseModel):
     export: Export = []
     validators: Validators = Field([], alias="validate")
     validate_script: List[Text] = []
+    validate_stop_on_failure: bool = False  # stop validating at the first failure
     retry_times: int = 0
     retry_interval: int = 0  # sec
+    repeat: Union[TRepeat, None] = None
+    snapshot: Union[TSnapshot, None] = None
     thrift_request: Union[TThriftRequest, None] = None
     sql_request: Union[TSqlRequest, None] = None
 
+    # compiled ValidatorPlan of validators, see response.get_validator_plan
+    _validator_plan: Union[Tuple, None] = PrivateAttr(None)
+
 
 class TestCase(BaseModel):
     config: TConfig
@@ -242,6 +279,7 @@ class SessionData(BaseModel):
     stat: RequestStat = RequestStat()
     address: AddressData = AddressData()
     validators: Dict = {}
+    sample_stat: Dict = {}  # aggregated stats of repeated-sample step
 
 
 class StepResult(BaseModel):
@@ -282,7 +320,11 @@ class TestCaseSummary(BaseModel):
     time: TestCaseTime
     in_out: TestCaseInOut = {}
     log: Text = ""
-    step_results: List[StepResult] = []
+    step_results: List[StepResult] = []  # kept according to retention policy
+    # counted for all steps regardless of retention, including the step raised
+    steps_total: int = 0
+    steps_failed: int = 0
+    abort_reason: Text = ""  # set when skipped/aborted by exhausted error budget
 
 
 class PlatformInfo(BaseModel):
@@ -303,3 +345,4 @@ class TestSuiteSummary(BaseModel):
     time: TestCaseTime = TestCaseTime()
     platform: PlatformInfo
     testcases: List[TestCaseSummary]
+    abort_reason: Text = ""
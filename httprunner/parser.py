@@ -2,12 +2,15 @@ import ast
 import builtins
 import os
 import re
-from typing import Any, Callable, Dict, List, Set, Text
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Set, Text
 from urllib.parse import urlparse
 
 from loguru import logger
 
 from httprunner import exceptions, loader, utils
+from httprunner.csv_table import CsvTable
 from httprunner.models import FunctionsMapping, VariablesMapping
 
 # use $$ to escape $ notation
@@ -478,6 +481,7 @@ def parse_variables_mapping(
 
 def parse_parameters(
     parameters: Dict,
+    test_path: Text = None,
 ) -> List[Dict]:
     """parse parameters and generate cartesian product.
 
@@ -487,6 +491,8 @@ def parse_parameters(
                 (1) data list, e.g. ["iOS/10.1", "iOS/10.2", "iOS/10.3"]
                 (2) call built-in parameterize function, "${parameterize(account.csv)}"
                 (3) call custom function in debugtalk.py, "${gen_app_version()}"
+        test_path (str): testcase file path, parse with functions of its project.
+            default to current project, or project of current working directory.
 
     Returns:
         list: cartesian product list
@@ -503,7 +509,10 @@ def parse_parameters(
     parsed_parameters_list: List[List[Dict]] = []
 
     # load project_meta functions
-    project_meta = loader.load_project_meta(os.getcwd())
+    if test_path:
+        project_meta = loader.load_project_meta(test_path)
+    else:
+        project_meta = loader.project_meta or loader.load_project_meta(os.getcwd())
     functions_mapping = project_meta.functions
 
     for parameter_name, parameter_content in parameters.items():
@@ -531,7 +540,7 @@ def parse_parameters(
             parsed_parameter_content: List = parse_data(
                 parameter_content, {}, functions_mapping
             )
-            if not isinstance(parsed_parameter_content, List):
+            if not isinstance(parsed_parameter_content, (List, CsvTable)):
                 raise exceptions.ParamsError(
                     f"parameters content should be in List type, got {parsed_parameter_content} for {parameter_content}"
                 )
@@ -585,9 +594,86 @@ def parse_parameters(
     return utils.gen_cartesian_product(*parsed_parameters_list)
 
 
+""" live parsers, functions mapping of reloaded debugtalk.py is swapped in
+"""
+live_parsers: "weakref.WeakSet[Parser]" = weakref.WeakSet()
+live_parsers_lock = threading.Lock()
+
+""" stop event of debugtalk.py watcher thread, None if not watching
+"""
+debugtalk_watch_event: Optional[threading.Event] = None
+
+
+def get_debugtalk_watch_interval() -> float:
+    """interval seconds to check debugtalk.py, HRUN_DEBUGTALK_WATCH=2 to enable"""
+    try:
+        return float(os.getenv("HRUN_DEBUGTALK_WATCH", 0))
+    except ValueError:
+        logger.warning("invalid HRUN_DEBUGTALK_WATCH, debugtalk.py is not watched")
+        return 0
+
+
+def reload_debugtalk() -> int:
+    """reload modified debugtalk.py of loaded projects,
+    and swap reloaded functions mapping into live parsers
+
+    Returns:
+        int: count of reloaded debugtalk.py
+
+    """
+    reloaded = loader.reload_debugtalk_functions()
+    if not reloaded:
+        return 0
+
+    with live_parsers_lock:
+        for parser in list(live_parsers):
+            for previous_functions, functions in reloaded:
+                if parser.functions_mapping is previous_functions:
+                    # parsing in progress keeps the whole previous mapping
+                    parser.functions_mapping = functions
+                    break
+
+    return len(reloaded)
+
+
+def watch_debugtalk(interval: float = 1.0) -> threading.Event:
+    """check and reload debugtalk.py every interval seconds in daemon thread,
+    for long-running processes. set returned event to stop watching.
+    """
+    stop_event = threading.Event()
+
+    def watch():
+        while not stop_event.wait(interval):
+            try:
+                reload_debugtalk()
+            except Exception as ex:
+                logger.error(f"failed to reload debugtalk.py: {ex}")
+
+    threading.Thread(target=watch, name="hrun-debugtalk-watch", daemon=True).start()
+    return stop_event
+
+
+def ensure_debugtalk_watch():
+    """start watching debugtalk.py once if HRUN_DEBUGTALK_WATCH is set"""
+    global debugtalk_watch_event
+    if debugtalk_watch_event is not None:
+        return
+
+    interval = get_debugtalk_watch_interval()
+    if interval <= 0:
+        return
+
+    with live_parsers_lock:
+        if debugtalk_watch_event is None:
+            debugtalk_watch_event = watch_debugtalk(interval)
+
+
 class Parser(object):
     def __init__(self, functions_mapping: FunctionsMapping = None) -> None:
         self.functions_mapping = functions_mapping
+        with live_parsers_lock:
+            live_parsers.add(self)
+        ensure_debugtalk_watch()
 
     def parse_string(
         self, raw_string: Text, variables_mapping: VariablesMapping
@@ -1,8 +1,9 @@
 import os
+import tempfile
 import time
 import unittest
 
-from httprunner import parser
+from httprunner import loader, parser
 from httprunner.exceptions import FunctionNotFound, VariableNotFound
 from httprunner.loader import load_project_meta
 
@@ -483,6 +484,52 @@ class TestParserBasic(unittest.TestCase):
         self.assertEqual(parsed_testcase["body"], variables["data"])
         self.assertEqual(parsed_testcase["headers"]["sum"], 3)
 
+    def test_reload_debugtalk_in_live_parsers(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            debugtalk_path = os.path.join(project_dir, "debugtalk.py")
+            with open(debugtalk_path, "w") as f:
+                f.write("def get_name():\n    return 'foo'\n")
+
+            try:
+                project_meta = loader.load_project_meta(project_dir)
+                p = parser.Parser(project_meta.functions)
+                self.assertEqual(p.parse_data("${get_name()}"), "foo")
+                self.assertEqual(parser.reload_debugtalk(), 0)
+
+                with open(debugtalk_path, "w") as f:
+                    f.write("def get_name():\n    return 'foobar'\n")
+                self.assertEqual(parser.reload_debugtalk(), 1)
+                self.assertEqual(p.parse_data("${get_name()}"), "foobar")
+                self.assertIs(p.functions_mapping, project_meta.functions)
+
+                # keep previous functions if modified debugtalk.py is broken
+                with open(debugtalk_path, "w") as f:
+                    f.write("def get_name(:\n")
+                self.assertEqual(parser.reload_debugtalk(), 0)
+                self.assertEqual(p.parse_data("${get_name()}"), "foobar")
+            finally:
+                loader.project_meta = None
+
+    def test_parse_parameters_csv_rows_slice(self):
+        load_project_meta(
+            os.path.join(
+                os.path.dirname(os.path.dirname(__file__)),
+                "examples",
+                "postman_echo",
+                "request_methods",
+            ),
+        )
+        parsed_params = parser.parse_parameters(
+            {"username-password": "${parameterize(request_methods/account.csv, 1, 3)}"}
+        )
+        self.assertEqual(
+            parsed_params,
+            [
+                {"username": "test2", "password": "222222"},
+                {"username": "test3", "password": "333333"},
+            ],
+        )
+
     def test_parse_parameters_testcase(self):
         parameters = {
             "user_agent": ["iOS/10.1", "iOS/10.2"],
@@ -0,0 +1,43 @@
+""" pytest plugin of HttpRunner, loaded by hrun and registered as pytest11 entry point.
+
+Runner raises ErrorBudgetExhausted when error budget is exhausted, which is
+converted here to pytest outcomes according to HRUN_ERROR_BUDGET_ACTION:
+
+    skip     testcase is reported as skipped, remaining testcases go on and skip
+    abort    testcase is reported as failed, and the pytest session stops
+
+Runner itself does not depend on pytest, testcases run by distributed workers or
+called directly get ErrorBudgetExhausted as other failures.
+"""
+
+import pytest
+
+from httprunner.error_budget import get_error_budget
+from httprunner.exceptions import ErrorBudgetExhausted
+
+# whether pytest session is stopped by exhausted error budget
+aborted_key = pytest.StashKey[bool]()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if call.excinfo is None or not call.excinfo.errisinstance(ErrorBudgetExhausted):
+        return
+
+    msg = str(call.excinfo.value)
+    if get_error_budget().action == "abort":
+        item.session.shouldstop = msg
+        item.config.stash[aborted_key] = True
+        return
+
+    report = outcome.get_result()
+    report.outcome = "skipped"
+    path, lineno, _ = item.location
+    report.longrepr = (path, (lineno or 0) + 1, f"Skipped: {msg}")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # exit code 1 as failed, instead of 2 as interrupted by user
+    if session.config.stash.get(aborted_key, False):
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
@@ -1,13 +1,61 @@
-from typing import Dict, Text, Any
+import codecs
+import os
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Match, NamedTuple, Pattern, Text, Union
 
 import jmespath
 from jmespath.exceptions import JMESPathError
+from jmespath.parser import ParsedResult
+from jmespath.visitor import TreeInterpreter
 from loguru import logger
 
-from httprunner import exceptions
+from httprunner import exceptions, jsonlib, loader
 from httprunner.exceptions import ValidationFailure, ParamsError
-from httprunner.models import VariablesMapping, Validators
-from httprunner.parser import parse_string_value, Parser
+from httprunner.ext.streaming import (
+    ResponseStreamReader,
+    parse_simple_path,
+    stream_extract_response,
+)
+from httprunner.models import TStep, VariablesMapping, Validators
+from httprunner.parser import parse_data, parse_string_value, Parser
+
+# bounded cache of compiled jmespath expressions, shared by all response objects
+JMESPATH_CACHE_SIZE = int(os.getenv("HRUN_JMESPATH_CACHE_SIZE", 1024))
+
+
+@lru_cache(maxsize=JMESPATH_CACHE_SIZE)
+def compile_jmespath(expr: Text) -> ParsedResult:
+    """compile jmespath expression once, avoid lexing and parsing on each search"""
+    return jmespath.compile(expr)
+
+
+def get_jmespath_cache_info():
+    """hits/misses/maxsize/currsize of compiled jmespath expressions cache"""
+    return compile_jmespath.cache_info()
+
+
+# interpreter holds no state of searches, reuse it instead of creating one per search
+jmespath_interpreter = TreeInterpreter()
+
+
+def search_jmespath(expr: Text, data: Any) -> Any:
+    return jmespath_interpreter.visit(compile_jmespath(expr).parsed, data)
+
+
+# encodings decoding ascii content to the same text
+ASCII_TEXT_ENCODINGS = {"ascii", "utf-8"}
+
+# whitespaces matched by \s in text pattern only
+UNICODE_ONLY_SPACES_REGEX = re.compile(rb"[\x1c-\x1f]")
+
+
+@lru_cache(maxsize=256)
+def compile_regex(regex_pattern: Text, as_bytes: bool = False) -> Pattern:
+    """compile regex pattern once, bytes pattern is used to search raw response content"""
+    if as_bytes:
+        return re.compile(regex_pattern.encode("ascii"))
+    return re.compile(regex_pattern)
 
 
 def get_uniform_comparator(comparator: Text):
@@ -45,6 +93,8 @@ def get_uniform_comparator(comparator: Text):
         "length_less_or_equals",
     ]:
         return "length_less_or_equals"
+    elif comparator in ["schema", "schema_match"]:
+        return "schema_match"
     else:
         return comparator
 
@@ -120,6 +170,93 @@ def uniform_validator(validator):
     }
 
 
+def has_template(data: Any) -> bool:
+    """check if data contains any variable or function reference"""
+    if isinstance(data, Text):
+        return "$" in data
+    elif isinstance(data, (list, set, tuple)):
+        return any(has_template(item) for item in data)
+    elif isinstance(data, dict):
+        return any(
+            has_template(key) or has_template(value) for key, value in data.items()
+        )
+    else:
+        return False
+
+
+class CompiledValidator(NamedTuple):
+    """validator resolved once, only templates are left to be parsed at runtime"""
+
+    check: Any
+    check_has_template: bool
+    comparator: Text
+    builtin_comparator: Union[Callable, None]
+    expect: Any
+    expect_has_template: bool
+    expect_value: Any  # parsed expect value if no template
+    message: Any
+    message_has_template: bool
+    message_value: Any  # parsed message if no template
+
+
+def compile_validator(validator: Dict) -> CompiledValidator:
+    u_validator = uniform_validator(validator)
+    check_item = u_validator["check"]
+    expect_item = u_validator["expect"]
+    message = u_validator["message"]
+    comparator = u_validator["assert"]
+
+    expect_has_template = has_template(expect_item)
+    message_has_template = has_template(message)
+    return CompiledValidator(
+        check=check_item,
+        check_has_template=isinstance(check_item, Text) and "$" in check_item,
+        comparator=comparator,
+        builtin_comparator=loader.load_builtin_functions().get(comparator),
+        expect=expect_item,
+        expect_has_template=expect_has_template,
+        expect_value=None if expect_has_template else parse_data(expect_item),
+        message=message,
+        message_has_template=message_has_template,
+        message_value=None if message_has_template else parse_data(message),
+    )
+
+
+class ValidatorPlan(tuple):
+    """immutable compiled validators of one step, shared by all response objects"""
+
+    __slots__ = ()
+
+    def __new__(cls, validators: Validators):
+        return super().__new__(cls, [compile_validator(v) for v in validators])
+
+
+def get_validator_plan(step: TStep) -> ValidatorPlan:
+    """get compiled validators of step, compiled once and reused by runs and retries
+
+    Plan is compiled when Step is built, and reset by assert_* chain style calls
+    adding validators to step.
+    """
+    if step._validator_plan is None:
+        step._validator_plan = ValidatorPlan(step.validators)
+
+    return step._validator_plan
+
+
+def _decode_regex_value(value: Union[Text, bytes, None]) -> Union[Text, None]:
+    # bytes are matched only if content is ascii
+    if isinstance(value, bytes):
+        return value.decode("ascii")
+    return value
+
+
+def _format_validate_msg(check_item: Any, assert_method: Text, expect_value: Any):
+    return (
+        f"assert {check_item} {assert_method} "
+        f"{expect_value}({type(expect_value).__name__})"
+    )
+
+
 class ResponseObjectBase(object):
     def __init__(self, resp_obj, parser: Parser):
         """initialize with a response object
@@ -131,6 +268,8 @@ class ResponseObjectBase(object):
         self.resp_obj = resp_obj
         self.parser = parser
         self.validation_results: Dict = {}
+        # regex pattern => match, response content is scanned once for each pattern
+        self.regex_matches: Dict[Text, Match] = {}
 
     def extract(
         self,
@@ -156,6 +295,8 @@ class ResponseObjectBase(object):
             if field.startswith("regex:"):
                 regex_pattern = field[6:]  # 去掉"regex:"前缀
                 field_value = self._search_regex(regex_pattern)
+                # 命名分组一次提取多个变量, e.g. (?P<token>\w+)
+                extract_mapping.update(self._search_regex_groups(regex_pattern))
             else:
                 field_value = self._search_jmespath(field)
 
@@ -164,26 +305,86 @@ class ResponseObjectBase(object):
         logger.info(f"extract mapping: {extract_mapping}")
         return extract_mapping
 
-    def _search_regex(self, regex_pattern: Text) -> Any:
-        """使用正则表达式从响应中提取数据"""
-        import re
-        # 从响应文本中提取
-        resp_text = self.resp_obj.text
-        match = re.search(regex_pattern, resp_text)
+    def _match_regex(self, regex_pattern: Text) -> Match:
+        """使用正则表达式匹配响应内容，同一个表达式只匹配一次"""
+        if regex_pattern in self.regex_matches:
+            return self.regex_matches[regex_pattern]
+
+        bytes_pattern = self._get_bytes_pattern(regex_pattern)
+        if bytes_pattern is not None:
+            # 纯ASCII内容直接匹配原始字节，结果与文本一致，避免解码大响应体
+            resp_content = self.resp_obj.content
+            match = bytes_pattern.search(resp_content)
+        else:
+            # 从响应文本中提取
+            resp_content = self.resp_obj.text
+            match = compile_regex(regex_pattern).search(resp_content)
+
         if not match:
             logger.error(
                 f"failed to search with regex\n"
                 f"pattern: {regex_pattern}\n"
-                f"data: {resp_text}"
+                f"data: {resp_content}"
             )
             raise ValueError(f"failed to search with regex: {regex_pattern}")
+
+        self.regex_matches[regex_pattern] = match
+        return match
+
+    def _get_bytes_pattern(self, regex_pattern: Text) -> Union[Pattern, None]:
+        """bytes pattern to match raw content if results are the same as matching text,
+        i.e. pattern and content are ascii, and content is decoded as ascii or utf-8.
+        """
+        content = getattr(self.resp_obj, "content", None)
+        if not (
+            isinstance(content, bytes)
+            and regex_pattern.isascii()
+            and content.isascii()
+            # \s in text pattern matches \x1c-\x1f as well
+            and not UNICODE_ONLY_SPACES_REGEX.search(content)
+        ):
+            return None
+
+        # same encoding as response text, e.g. utf-16 body is ascii in bytes
+        encoding = getattr(self.resp_obj, "encoding", None) or getattr(
+            self.resp_obj, "apparent_encoding", None
+        )
+        try:
+            if codecs.lookup(encoding).name not in ASCII_TEXT_ENCODINGS:
+                return None
+        except (TypeError, LookupError):
+            # no encoding, or unknown encoding
+            return None
+
+        # invalid pattern fails the same as matching text
+        compile_regex(regex_pattern)
+        try:
+            return compile_regex(regex_pattern, as_bytes=True)
+        except re.error:
+            # e.g. (?u) is not allowed in bytes pattern
+            return None
+
+    def _search_regex(self, regex_pattern: Text) -> Any:
+        """使用正则表达式从响应中提取数据"""
+        match = self._match_regex(regex_pattern)
         # 如果有分组，返回第一个分组的内容，否则返回整个匹配
         check_value = match.group(1) if match.groups() else match.group(0)
-        return check_value
+        return _decode_regex_value(check_value)
+
+    def _search_regex_groups(self, regex_pattern: Text) -> Dict[Text, Any]:
+        """使用正则表达式命名分组提取多个变量，没有命名分组则返回空"""
+        if not compile_regex(regex_pattern).groupindex:
+            return {}
+
+        match = self._match_regex(regex_pattern)
+        return {
+            name: _decode_regex_value(value)
+            for name, value in match.groupdict().items()
+        }
 
     def _search_jmespath(self, expr: Text) -> Any:
         try:
-            check_value = jmespath.search(expr, self.resp_obj)
+            check_value = search_jmespath(expr, self.resp_obj)
         except JMESPathError as ex:
             logger.error(
                 f"failed to search with jmespath\n"
@@ -196,29 +397,34 @@ class ResponseObjectBase(object):
 
     def validate(
         self,
-        validators: Validators,
+        validators: Union[Validators, "ValidatorPlan"],
         variables_mapping: VariablesMapping = None,
+        stop_on_failure: bool = False,
     ):
+        """validate response, raise ValidationFailure with all failures collected,
+        or with the first failure if stop_on_failure is set.
 
+        Messages are rendered only when validator fails or debug log is enabled,
+        passing validators cost comparisons only.
+        """
         variables_mapping = variables_mapping or {}
 
         self.validation_results = {}
         if not validators:
             return
 
+        if not isinstance(validators, ValidatorPlan):
+            validators = ValidatorPlan(validators)
+
         validate_pass = True
         failures = []
+        functions_mapping = self.parser.functions_mapping
+        self.validation_results["validate_extractor"] = []
 
-        for v in validators:
-
-            if "validate_extractor" not in self.validation_results:
-                self.validation_results["validate_extractor"] = []
-
-            u_validator = uniform_validator(v)
-
+        for index, v in enumerate(validators):
             # check item
-            check_item = u_validator["check"]
-            if "$" in check_item:
+            check_item = v.check
+            if v.check_has_template:
                 # check_item is variable or function
                 check_item = self.parser.parse_data(check_item, variables_mapping)
                 # 引用值会进行一次转换：字符串 -> 整数，转换失败则还是字符串
@@ -230,21 +436,36 @@ class ResponseObjectBase(object):
                 # variable or function evaluation result is "" or not text
                 check_value = check_item
 
-            # comparator
-            assert_method = u_validator["assert"]
-            assert_func = self.parser.get_mapping_function(assert_method)
+            # comparator, functions in debugtalk.py override builtin comparators
+            assert_method = v.comparator
+            assert_func = (
+                functions_mapping.get(assert_method)
+                or v.builtin_comparator
+                or self.parser.get_mapping_function(assert_method)
+            )
 
             # expect item
-            expect_item = u_validator["expect"]
+            expect_item = v.expect
             # parse expected value with config/teststep/extracted variables
-            expect_value = self.parser.parse_data(expect_item, variables_mapping)
+            expect_value = (
+                self.parser.parse_data(expect_item, variables_mapping)
+                if v.expect_has_template
+                else v.expect_value
+            )
 
             # message
-            message = u_validator["message"]
-            # parse message with config/teststep/extracted variables
-            message = self.parser.parse_data(message, variables_mapping)
-
-            validate_msg = f"assert {check_item} {assert_method} {expect_value}({type(expect_value).__name__})"
+            # builtin comparators only use message in assertion error, so message
+            # template is rendered after failure, while custom comparators get it
+            defer_message = (
+                v.message_has_template and assert_func is v.builtin_comparator
+            )
+            if defer_message:
+                message = ""
+            elif v.message_has_template:
+                # parse message with config/teststep/extracted variables
+                message = self.parser.parse_data(v.message, variables_mapping)
+            else:
+                message = v.message_value
 
             validator_dict = {
                 "comparator": assert_method,
@@ -252,17 +473,33 @@ class ResponseObjectBase(object):
                 "check_value": check_value,
                 "expect": expect_item,
                 "expect_value": expect_value,
-                "message": message,
+                "message": v.message if defer_message else message,
             }
 
             try:
                 assert_func(check_value, expect_value, message)
-                validate_msg += "\t==> pass"
-                logger.info(validate_msg)
+                logger.opt(lazy=True).debug(
+                    "{}\t==> pass",
+                    lambda: _format_validate_msg(
+                        check_item, assert_method, expect_value
+                    ),
+                )
                 validator_dict["check_result"] = "pass"
             except AssertionError as ex:
+                if defer_message:
+                    message = self.parser.parse_data(v.message, variables_mapping)
+                    validator_dict["message"] = message
+                    # compare again with message, same assertion error as before
+                    try:
+                        assert_func(check_value, expect_value, message)
+                    except AssertionError as ex_with_message:
+                        ex = ex_with_message
+
                 validate_pass = False
                 validator_dict["check_result"] = "fail"
+                validate_msg = _format_validate_msg(
+                    check_item, assert_method, expect_value
+                )
                 validate_msg += "\t==> fail"
                 validate_msg += (
                     f"\n"
@@ -280,16 +517,128 @@ class ResponseObjectBase(object):
 
             self.validation_results["validate_extractor"].append(validator_dict)
 
+            if not validate_pass and stop_on_failure:
+                skipped_count = len(validators) - index - 1
+                if skipped_count:
+                    logger.info(f"stop on failure, skip {skipped_count} validators")
+                break
+
         if not validate_pass:
             failures_string = "\n".join([failure for failure in failures])
             raise ValidationFailure(failures_string)
 
 
+class ResponseMeta(dict):
+    """top-level fields of http response, searched by jmespath directly
+
+    Fields are populated lazily, each field is computed at most once per response
+    and only when an expression touches it, e.g. body is not decoded when checking
+    status_code only.
+    """
+
+    FIELDS = ("status_code", "elapsed", "headers", "cookies", "body")
+
+    def __init__(self, resp_obj: "ResponseObject"):
+        super().__init__()
+        self.__resp_obj = resp_obj
+
+    def __missing__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+
+        if key == "elapsed":
+            value = self.__resp_obj.resp_obj.elapsed.total_seconds()
+        else:
+            value = getattr(self.__resp_obj, key)
+
+        self[key] = value
+        return value
+
+    def get(self, key, default=None):
+        # jmespath get field value with dict.get
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def load_all(self) -> "ResponseMeta":
+        for key in self.FIELDS:
+            self.get(key)
+        return self
+
+    # whole view is required, e.g. searching with wildcard or logging
+    def keys(self):
+        self.load_all()
+        return super().keys()
+
+    def values(self):
+        self.load_all()
+        return super().values()
+
+    def items(self):
+        self.load_all()
+        return super().items()
+
+    def __iter__(self):
+        self.load_all()
+        return super().__iter__()
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        self.load_all()
+        return super().__repr__()
+
+
 class ResponseObject(ResponseObjectBase):
+    def __init__(self, resp_obj, parser: Parser, stream: bool = False):
+        super(ResponseObject, self).__init__(resp_obj, parser)
+        self.resp_obj_meta = ResponseMeta(self)
+        # stream response content is parsed incrementally for simple body paths
+        self.stream_reader = None
+        self.stream_values: Dict[Text, Any] = {}
+        if stream and resp_obj.raw is not None and resp_obj._content is False:
+            self.stream_reader = ResponseStreamReader(resp_obj)
+
+    def load_stream_content(self):
+        """read full content of stream response, required before decoding body"""
+        if self.stream_reader is not None:
+            self.stream_reader.restore_content()
+            self.stream_reader = None
+
+    def extract(
+        self,
+        extractors: Dict[Text, Text],
+        variables_mapping: VariablesMapping = None,
+    ) -> Dict[Text, Any]:
+        if self.stream_reader is not None and extractors:
+            stream_exprs = [
+                field
+                for field in extractors.values()
+                if "$" not in field and parse_simple_path(field) is not None
+            ]
+            if stream_exprs:
+                self.stream_values = (
+                    stream_extract_response(self.stream_reader, stream_exprs) or {}
+                )
+
+        return super(ResponseObject, self).extract(extractors, variables_mapping)
+
+    def _match_regex(self, regex_pattern: Text) -> Match:
+        self.load_stream_content()
+        return super(ResponseObject, self)._match_regex(regex_pattern)
+
     def __getattr__(self, key):
+        if key in ["json", "content", "body", "text"]:
+            self.load_stream_content()
+
         if key in ["json", "content", "body"]:
             try:
-                value = self.resp_obj.json()
+                value = jsonlib.loads_response(self.resp_obj)
             except ValueError:
                 value = self.resp_obj.content
         elif key == "cookies":
@@ -306,24 +655,23 @@ class ResponseObject(ResponseObjectBase):
         return value
 
     def _search_jmespath(self, expr: Text) -> Any:
-        resp_obj_meta = {
-            "status_code": self.status_code,
-            "elapsed": self.resp_obj.elapsed.total_seconds(),
-            "headers": self.headers,
-            "cookies": self.cookies,
-            "body": self.body,
-        }
+        if expr in self.stream_values:
+            return self.stream_values[expr]
+
+        resp_obj_meta = self.resp_obj_meta
         # 如果expr不是以resp_obj_meta的key开头
-        if not expr.startswith(tuple(resp_obj_meta.keys())):
+        if not expr.startswith(ResponseMeta.FIELDS):
+            # response attribute may read content, e.g. text
+            self.load_stream_content()
             # 如果resp_obj_meta中存在expr
-            if hasattr(self.resp_obj,expr):
-                return getattr(self.resp_obj,expr)
+            if hasattr(self.resp_obj, expr):
+                return getattr(self.resp_obj, expr)
             else:
                 return expr
 
         try:
             # 尝试使用jmespath的expr在规定的resp_obj_meta中搜索
-            check_value = jmespath.search(expr, resp_obj_meta)
+            check_value = search_jmespath(expr, resp_obj_meta)
         except JMESPathError as ex:
             logger.error(
                 f"failed to search with jmespath\n"
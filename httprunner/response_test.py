@@ -1,9 +1,28 @@
+import json
+import os
+import tempfile
 import unittest
+from datetime import timedelta
+from unittest import mock
 
 import requests
 
+from httprunner import RunRequest, Step, jsonlib, loader
+from httprunner.builtin import comparators
+from httprunner.exceptions import ValidationFailure
+from httprunner.models import ProjectMeta, TStep
 from httprunner.parser import Parser
-from httprunner.response import ResponseObject, uniform_validator
+from httprunner.response import (
+    ResponseMeta,
+    ResponseObject,
+    SqlResponseObject,
+    ValidatorPlan,
+    compile_jmespath,
+    compile_regex,
+    get_jmespath_cache_info,
+    get_validator_plan,
+    uniform_validator,
+)
 from httprunner.utils import HTTP_BIN_URL
 
 
@@ -88,3 +107,379 @@ class TestResponse(unittest.TestCase):
         }
         for validator in validators:
             self.assertEqual(uniform_validator(validator), expected)
+
+
+def build_response(body) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers["Content-Type"] = "application/json"
+    resp._content = json.dumps(body).encode("utf-8")
+    resp.elapsed = timedelta(milliseconds=10)
+    return resp
+
+
+class TestJmespathCache(unittest.TestCase):
+    def test_compiled_expression_reused(self):
+        resp_obj = ResponseObject(build_response({"a": [1, 2, 3]}), Parser({}))
+        validators = [{"eq": ["body.a[0]", 1]}, {"len_eq": ["body.a", 3]}]
+
+        compile_jmespath.cache_clear()
+        resp_obj.validate(validators)
+        cache_info = get_jmespath_cache_info()
+        self.assertEqual(cache_info.misses, 2)
+        self.assertEqual(cache_info.hits, 0)
+
+        another_resp_obj = ResponseObject(build_response({"a": [1, 5, 6]}), Parser({}))
+        another_resp_obj.validate(validators)
+        self.assertEqual(another_resp_obj.extract({"v": "body.a[1]"}), {"v": 5})
+        cache_info = get_jmespath_cache_info()
+        self.assertEqual(cache_info.misses, 3)
+        self.assertEqual(cache_info.hits, 2)
+
+    def test_sql_response_use_cache(self):
+        resp_obj = SqlResponseObject({"rows": [{"id": 1}]}, Parser({}))
+        compile_jmespath.cache_clear()
+        self.assertEqual(resp_obj.extract({"id": "rows[0].id"}), {"id": 1})
+        self.assertEqual(resp_obj.extract({"id": "rows[0].id"}), {"id": 1})
+        self.assertEqual(get_jmespath_cache_info().hits, 1)
+
+
+class TestResponseMeta(unittest.TestCase):
+    def test_fields_computed_lazily_once(self):
+        resp = build_response({"a": 1})
+        resp_obj = ResponseObject(resp, Parser({}))
+        meta = resp_obj.resp_obj_meta
+
+        with mock.patch.object(
+            resp.cookies, "get_dict", wraps=resp.cookies.get_dict
+        ) as get_dict, mock.patch.object(
+            jsonlib, "loads_response", wraps=jsonlib.loads_response
+        ) as loads_response:
+            resp_obj.validate([{"eq": ["status_code", 200]}])
+            self.assertEqual(loads_response.call_count, 0)
+            self.assertNotIn("body", dict.keys(meta))
+
+            resp_obj.validate(
+                [{"eq": ["body.a", 1]}, {"eq": ["body", {"a": 1}]}],
+            )
+            self.assertEqual(resp_obj.extract({"a": "body.a"}), {"a": 1})
+            self.assertEqual(loads_response.call_count, 1)
+            get_dict.assert_not_called()
+
+            self.assertEqual(resp_obj.extract({"c": "cookies"}), {"c": {}})
+            self.assertEqual(resp_obj.extract({"c": "cookies"}), {"c": {}})
+            get_dict.assert_called_once()
+
+    def test_full_view(self):
+        resp_obj = ResponseObject(build_response({"a": 1}), Parser({}))
+        meta = resp_obj.resp_obj_meta
+        self.assertIsInstance(meta, ResponseMeta)
+        self.assertIn("elapsed", meta)
+        self.assertEqual(len(meta), 5)
+        self.assertEqual(meta["elapsed"], 0.01)
+        self.assertEqual(sorted(meta.keys()), sorted(ResponseMeta.FIELDS))
+        self.assertIsNone(meta.get("unknown"))
+
+
+class TestValidatorPlan(unittest.TestCase):
+    def test_compile_validators(self):
+        plan = ValidatorPlan(
+            [
+                {"eq": ["status_code", 200]},
+                {"len_eq": ["$path", "${get_len()}", "length of $path"]},
+                {"check": "body.a", "comparator": "str_eq", "expect": " 1\t"},
+            ]
+        )
+        self.assertEqual(plan[0].comparator, "equal")
+        self.assertFalse(plan[0].check_has_template)
+        self.assertFalse(plan[0].expect_has_template)
+        self.assertIsNotNone(plan[0].builtin_comparator)
+        self.assertEqual(plan[1].comparator, "length_equal")
+        self.assertTrue(plan[1].check_has_template)
+        self.assertTrue(plan[1].expect_has_template)
+        self.assertTrue(plan[1].message_has_template)
+        # same as parsing at runtime
+        self.assertEqual(plan[2].expect_value, "1")
+
+    def test_validate_with_plan(self):
+        parser = Parser({"get_len": lambda: 2})
+        plan = ValidatorPlan(
+            [
+                {"eq": ["body.a", 1]},
+                {"len_eq": ["$path", "${get_len()}"]},
+            ]
+        )
+        for body in [{"a": 1}, {"a": 1, "b": [1, 2]}]:
+            resp_obj = ResponseObject(build_response(body), parser)
+            resp_obj.validate(
+                plan, {"path": "body.b"} if "b" in body else {"path": "ab"}
+            )
+            self.assertEqual(len(resp_obj.validation_results["validate_extractor"]), 2)
+
+        resp_obj = ResponseObject(build_response({"a": 2}), parser)
+        with self.assertRaises(ValidationFailure):
+            resp_obj.validate(plan, {"path": "ab"})
+
+    def test_debugtalk_override_builtin_comparator(self):
+        def equal(check_value, expect_value, message=""):
+            assert str(check_value) == str(expect_value), message
+
+        resp_obj = ResponseObject(build_response({"a": 1}), Parser({"equal": equal}))
+        resp_obj.validate(ValidatorPlan([{"eq": ["body.a", "1"]}]))
+
+    def test_plan_cached_on_step(self):
+        step = TStep(name="plan")
+        step.validators.append({"eq": ["status_code", 200]})
+        plan = get_validator_plan(step)
+        self.assertIs(get_validator_plan(step), plan)
+
+        # compiled when step is built, reset by chain style assert calls
+        step = RunRequest("plan").get("/get").validate()
+        step.assert_equal("status_code", 200)
+        plan = Step(step).struct()._validator_plan
+        self.assertEqual(len(plan), 1)
+        self.assertIs(get_validator_plan(step.struct()), plan)
+
+        step.assert_equal("body.a", 1)
+        new_plan = get_validator_plan(step.struct())
+        self.assertIsNot(new_plan, plan)
+        self.assertEqual(len(new_plan), 2)
+
+
+class TestLazyValidation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rendered = []
+
+        def render_msg(name):
+            self.rendered.append(name)
+            return f"{name} mismatched"
+
+        self.parser = Parser({"render_msg": render_msg})
+        self.resp_obj = ResponseObject(build_response({"a": 1, "b": 2}), self.parser)
+
+    def test_message_rendered_on_failure_only(self):
+        self.resp_obj.validate(
+            [{"eq": ["body.a", 1, "${render_msg(a)}"]}, {"eq": ["body.b", 2]}]
+        )
+        self.assertEqual(self.rendered, [])
+        self.assertEqual(
+            self.resp_obj.validation_results["validate_extractor"][0]["message"],
+            "${render_msg(a)}",
+        )
+
+        with self.assertRaises(ValidationFailure) as context:
+            self.resp_obj.validate([{"eq": ["body.a", 2, "${render_msg(a)}"]}])
+        self.assertEqual(self.rendered, ["a"])
+        self.assertIn("message: a mismatched", str(context.exception))
+        self.assertEqual(
+            self.resp_obj.validation_results["validate_extractor"][0]["message"],
+            "a mismatched",
+        )
+
+    def test_stop_on_failure(self):
+        validators = [
+            {"eq": ["body.a", 0]},
+            {"eq": ["body.b", 0]},
+            {"eq": ["body.a", 1]},
+        ]
+        with self.assertRaises(ValidationFailure) as context:
+            self.resp_obj.validate(validators)
+        self.assertIn("body.b", str(context.exception))
+        self.assertEqual(len(self.resp_obj.validation_results["validate_extractor"]), 3)
+
+        with self.assertRaises(ValidationFailure) as context:
+            self.resp_obj.validate(validators, stop_on_failure=True)
+        self.assertNotIn("body.b", str(context.exception))
+        self.assertEqual(len(self.resp_obj.validation_results["validate_extractor"]), 1)
+
+
+class TestRegexExtract(unittest.TestCase):
+    def test_named_groups_extracted_once(self):
+        resp_obj = ResponseObject(
+            build_response({"url": "/login?token=abc123&uid=42"}), Parser({})
+        )
+        pattern = r"token=(?P<token>\w+)&uid=(?P<uid>\d+)"
+        extract_mapping = resp_obj.extract(
+            {"token": f"regex:{pattern}", "first": f"regex:{pattern}"}
+        )
+        self.assertEqual(
+            extract_mapping, {"token": "abc123", "uid": "42", "first": "abc123"}
+        )
+        self.assertEqual(len(resp_obj.regex_matches), 1)
+        # ascii content is matched as bytes
+        self.assertIsInstance(resp_obj.regex_matches[pattern].string, bytes)
+
+    def test_non_ascii_content(self):
+        resp_obj = ResponseObject(build_response({"name": "中文名字"}), Parser({}))
+        resp_obj.resp_obj._content = '{"name": "中文名字"}'.encode("utf-8")
+        resp_obj.resp_obj.encoding = "utf-8"
+        self.assertEqual(
+            resp_obj.extract({"name": 'regex:"name": "(\\w+)"'}), {"name": "中文名字"}
+        )
+
+    def test_utf16_content(self):
+        resp_obj = ResponseObject(build_response({}), Parser({}))
+        # ascii in bytes, but text is different
+        resp_obj.resp_obj._content = '{"token": "abc"}'.encode("utf-16-le")
+        resp_obj.resp_obj.encoding = "utf-16-le"
+        self.assertEqual(
+            resp_obj.extract({"token": 'regex:"token": "(\\w+)"'}), {"token": "abc"}
+        )
+        self.assertIsInstance(resp_obj.regex_matches['"token": "(\\w+)"'].string, str)
+
+        with self.assertRaises(ValueError):
+            resp_obj.extract({"zero": "regex:\\x00"})
+
+    def test_unicode_flag_pattern(self):
+        resp_obj = ResponseObject(build_response({"uid": "42"}), Parser({}))
+        # (?u) is not allowed in bytes pattern, matched as text
+        self.assertEqual(
+            resp_obj.extract({"uid": 'regex:(?u)"uid": "(\\d+)"'}), {"uid": "42"}
+        )
+
+    def test_regex_not_matched(self):
+        resp_obj = ResponseObject(build_response({"a": 1}), Parser({}))
+        with self.assertRaises(ValueError):
+            resp_obj.extract({"b": 'regex:"b": (\\d+)'})
+
+
+class TestSchemaMatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.schema = {
+            "type": "object",
+            "required": ["items"],
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["id"],
+                        "properties": {"id": {"type": "integer"}},
+                    },
+                }
+            },
+        }
+        fd, self.schema_path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.schema, f)
+
+    def tearDown(self) -> None:
+        os.remove(self.schema_path)
+
+    def test_schema_file(self):
+        resp_obj = ResponseObject(
+            build_response({"items": [{"id": 1}, {"id": 2}]}), Parser({})
+        )
+        resp_obj.validate(
+            [
+                {"schema": ["body", self.schema_path]},
+                {
+                    "schema_match": [
+                        "body.items[0]",
+                        self.schema["properties"]["items"]["items"],
+                    ]
+                },
+            ]
+        )
+
+    def test_schema_mismatch(self):
+        resp_obj = ResponseObject(
+            build_response({"items": [{"id": 1}, {"id": "2"}]}), Parser({})
+        )
+        with self.assertRaises(ValidationFailure) as cm:
+            resp_obj.validate([{"schema": ["body", self.schema_path]}])
+        self.assertIn("schema mismatch at .items[1].id", str(cm.exception))
+
+    def test_schema_relative_to_running_root_dir(self):
+        root_dir, schema_file = os.path.split(self.schema_path)
+        resp_obj = ResponseObject(
+            build_response({"items": [{"id": 1}, {"id": 2}]}), Parser({})
+        )
+        # project loaded last is not the project of running testcase
+        other_project = ProjectMeta(RootDir=os.path.join(root_dir, "other"))
+        token = loader.running_root_dir.set(root_dir)
+        try:
+            with mock.patch.object(loader, "project_meta", other_project):
+                resp_obj.validate([{"schema": ["body", schema_file]}])
+        finally:
+            loader.running_root_dir.reset(token)
+
+    def test_jsonschema_uninstalled(self):
+        resp_obj = ResponseObject(build_response({"items": []}), Parser({}))
+        with mock.patch.object(comparators, "JSONSCHEMA_READY", False):
+            with self.assertRaises(ValidationFailure) as cm:
+                resp_obj.validate(
+                    [{"schema": ["body", self.schema_path]}, {"eq": ["body.a", 1]}]
+                )
+        # validation failed instead of exiting, following validators still run
+        self.assertIn("jsonschema uninstalled", str(cm.exception))
+        self.assertEqual(len(resp_obj.validation_results["validate_extractor"]), 2)
+
+
+class TestCollectionComparators(unittest.TestCase):
+    def setUp(self) -> None:
+        items = [
+            {"id": index, "price": index * 0.5, "status": "paid", "tags": ["a"]}
+            for index in range(2000)
+        ]
+        self.resp_obj = ResponseObject(build_response({"items": items}), Parser({}))
+
+    def test_collection_comparators(self):
+        self.resp_obj.validate(
+            [
+                {"all_match": ["body.items", {"status": "paid"}]},
+                {"all_match": ["body.items[*].status", "paid"]},
+                {"any_match": ["body.items", {"id": 1999, "tags": ["a"]}]},
+                {"each_in_range": ["body.items[*].price", [0, 999.5]]},
+                {"sorted_by": ["body.items", "id"]},
+                {"sorted_by": ["body.items[::-1].price", "-"]},
+                {"unique_by": ["body.items", "id"]},
+                {"unique_by": ["body.items[:2]", ""]},
+                {"sum_equal": ["body.items[*].price", 999500.0 + 0.1 - 0.1]},
+                {"min_equal": ["body.items[*].id", 0]},
+                {"max_less_or_equals": ["body.items[*].id", 1999]},
+                {"min_greater_or_equals": ["body.items[*].price", 0]},
+                {"contains_all": ["body.items[*].id", [0, 1000, 1999]]},
+                {"all_contained_by": ["body.items[:3].tags", [["a"], ["b"]]]},
+            ]
+        )
+        self.assertEqual(
+            len(self.resp_obj.validation_results["validate_extractor"]), 14
+        )
+
+    def test_nested_field(self):
+        items = [{"id": index, "buyer": {"country": "CN"}} for index in range(3)]
+        items[2]["buyer"]["country"] = "US"
+        resp_obj = ResponseObject(build_response({"items": items}), Parser({}))
+        resp_obj.validate(
+            [
+                {"all_match": ["body.items[:2]", {"buyer.country": "CN"}]},
+                {"any_match": ["body.items", {"id": 2, "buyer.country": "US"}]},
+            ]
+        )
+
+        failures = [
+            ({"all_match": ["body.items", {"buyer.country": "CN"}]}, "item 2"),
+            ({"all_match": ["body.items", {"buyer.city": "SH"}]}, "item 0"),
+            ({"any_match": ["body.items", {"buyer.country": "JP"}]}, "no item"),
+        ]
+        for validator, error in failures:
+            with self.assertRaises(ValidationFailure) as context:
+                resp_obj.validate([validator])
+            self.assertIn(error, str(context.exception))
+
+    def test_failure_located(self):
+        failures = [
+            ({"all_match": ["body.items", {"id": 0}]}, "item 1 mismatched"),
+            ({"each_in_range": ["body.items[*].id", [0, 100]]}, "item 101 out of"),
+            ({"sorted_by": ["body.items", "-id"]}, "item 1 not sorted by -id"),
+            ({"unique_by": ["body.items", "status"]}, "item 1 duplicated: 'paid'"),
+            ({"unique_by": ["body.items", "missing"]}, "item 0 has no field missing"),
+            ({"contains_all": ["body.items[*].id", [1, 2000]]}, "missing items"),
+            ({"all_contained_by": ["body.items[*].id", [0]]}, "item 1 not allowed"),
+            ({"max_equal": ["body.items[*].id", 2000]}, "max is 1999"),
+        ]
+        for validator, error in failures:
+            with self.assertRaises(ValidationFailure) as context:
+                self.resp_obj.validate([validator])
+            self.assertIn(error, str(context.exception))
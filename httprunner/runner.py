@@ -1,8 +1,9 @@
 import os
 import time
 import uuid
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Text
+from typing import Deque, Dict, List, Text, Union
 
 try:
     import allure
@@ -15,10 +16,17 @@ from loguru import logger
 
 from httprunner.client import HttpSession
 from httprunner.config import Config
-from httprunner.exceptions import ParamsError, ValidationFailure
-from httprunner.loader import load_project_meta
+from httprunner.error_budget import get_error_budget
+from httprunner.exceptions import (
+    DeadlineExceeded,
+    ErrorBudgetExhausted,
+    ParamsError,
+    ValidationFailure,
+)
+from httprunner.loader import load_project_meta, running_root_dir
 from httprunner.models import (
     ProjectMeta,
+    RetentionEnum,
     StepResult,
     TConfig,
     TestCaseInOut,
@@ -30,6 +38,72 @@ from httprunner.parser import Parser
 from httprunner.utils import init_file_logger, merge_variables
 
 
+class SessionState(object):
+    """mutable state of one testcase run, created fresh at each test_start
+
+    Step results are kept according to retention policy, while step counters are
+    always updated, so memory stays flat when running huge amount of steps.
+    """
+
+    __slots__ = (
+        "session_variables",
+        "step_results",
+        "steps_total",
+        "steps_failed",
+        "start_at",
+        "duration",
+        "retention",
+        "keep_session_data",
+        "abort_reason",
+        "deadline_at",
+        "param",
+    )
+
+    def __init__(
+        self,
+        session_variables: VariablesMapping = None,
+        retention: RetentionEnum = RetentionEnum.ALL,
+        max_step_results: int = None,
+        keep_session_data: bool = True,
+    ):
+        self.session_variables: VariablesMapping = dict(session_variables or {})
+        self.step_results: Union[List[StepResult], Deque[StepResult]] = (
+            deque(maxlen=max_step_results) if max_step_results else []
+        )
+        self.steps_total = 0
+        self.steps_failed = 0
+        self.start_at: float = 0
+        self.duration: float = 0
+        self.retention = retention
+        self.keep_session_data = keep_session_data
+        self.abort_reason: Text = ""
+        self.deadline_at: Union[float, None] = None
+        self.param: Dict = {}  # parameter set of parameterized testcase
+
+    def add_step_result(self, step_result: StepResult):
+        self.steps_total += 1
+        if not step_result.success:
+            self.steps_failed += 1
+
+        if self.retention == RetentionEnum.NONE:
+            return
+        if self.retention == RetentionEnum.FAILED and step_result.success:
+            return
+
+        if not self.keep_session_data:
+            step_result.data = None
+
+        self.step_results.append(step_result)
+
+    def add_step_error(self):
+        self.steps_total += 1
+        self.steps_failed += 1
+
+    @property
+    def success(self) -> bool:
+        return self.steps_failed == 0
+
+
 class SessionRunner(object):
     config: Config
     teststeps: List[object]  # list of Step
@@ -43,21 +117,24 @@ class SessionRunner(object):
 
     __config: TConfig
     __project_meta: ProjectMeta = None
-    __export: List[Text] = []
-    __step_results: List[StepResult] = []
-    __session_variables: VariablesMapping = {}
+    # specified by caller before test_start, e.g. referenced testcase step
+    __export: List[Text] = None
+    __variables: VariablesMapping = None
     __is_referenced: bool = False
-    # time
-    __start_at: float = 0
-    __duration: float = 0
+    __deadline_at: float = None  # inherited from caller testcase
+    # state of current run
+    __state: SessionState = None
     # log
     __log_path: Text = ""
 
     def __init(self):
         self.__config = self.config.struct()
-        self.__session_variables = self.__session_variables or {}
-        self.__start_at = 0
-        self.__duration = 0
+        self.__state = SessionState(
+            self.__variables,
+            retention=self.__config.retention,
+            max_step_results=self.__config.max_step_results,
+            keep_session_data=self.__config.keep_session_data,
+        )
         self.__is_referenced = self.__is_referenced or False
 
         self.__project_meta = self.__project_meta or load_project_meta(
@@ -67,7 +144,6 @@ class SessionRunner(object):
         self.root_dir = self.root_dir or self.__project_meta.RootDir
         self.__log_path = os.path.join(self.root_dir, "logs", f"{self.case_id}.run.log")
 
-        self.__step_results = self.__step_results or []
         self.session = self.session or HttpSession()
         self.parser = self.parser or Parser(self.__project_meta.functions)
 
@@ -87,13 +163,18 @@ class SessionRunner(object):
         return self
 
     def with_variables(self, variables: VariablesMapping) -> "SessionRunner":
-        self.__session_variables = variables
+        self.__variables = variables
         return self
 
     def with_export(self, export: List[Text]) -> "SessionRunner":
         self.__export = export
         return self
 
+    def with_deadline(self, deadline_at: float) -> "SessionRunner":
+        """set absolute deadline timestamp, e.g. inherited from caller testcase"""
+        self.__deadline_at = deadline_at
+        return self
+
     def with_thrift_client(self, thrift_client) -> "SessionRunner":
         self.thrift_client = thrift_client
         return self
@@ -104,7 +185,7 @@ class SessionRunner(object):
 
     def __parse_config(self, param: Dict = None) -> None:
         # parse config variables
-        self.__config.variables.update(self.__session_variables)
+        self.__config.variables.update(self.__state.session_variables)
         if param:
             self.__config.variables.update(param)
         self.__config.variables = self.parser.parse_variables(self.__config.variables)
@@ -122,49 +203,79 @@ class SessionRunner(object):
     def get_export_variables(self) -> Dict:
         # override testcase export vars with step export
         export_var_names = self.__export or self.__config.export
+        session_variables = self.__state.session_variables
         export_vars_mapping = {}
         for var_name in export_var_names:
-            if var_name not in self.__session_variables:
+            if var_name not in session_variables:
                 raise ParamsError(
-                    f"failed to export variable {var_name} from session variables {self.__session_variables}"
+                    f"failed to export variable {var_name} from session variables {session_variables}"
                 )
 
-            export_vars_mapping[var_name] = self.__session_variables[var_name]
+            export_vars_mapping[var_name] = session_variables[var_name]
 
         return export_vars_mapping
 
     def get_summary(self) -> TestCaseSummary:
         """get testcase result summary"""
-        start_at_timestamp = self.__start_at
-        start_at_iso_format = datetime.utcfromtimestamp(start_at_timestamp).isoformat()
-
-        summary_success = True
-        for step_result in self.__step_results:
-            if not step_result.success:
-                summary_success = False
-                break
+        state = self.__state
+        start_at_iso_format = datetime.utcfromtimestamp(state.start_at).isoformat()
 
         return TestCaseSummary(
             name=self.__config.name,
-            success=summary_success,
+            success=state.success,
             case_id=self.case_id,
             time=TestCaseTime(
-                start_at=self.__start_at,
+                start_at=state.start_at,
                 start_at_iso_format=start_at_iso_format,
-                duration=self.__duration,
+                duration=state.duration,
             ),
             in_out=TestCaseInOut(
                 config_vars=self.__config.variables,
                 export_vars=self.get_export_variables(),
             ),
             log=self.__log_path,
-            step_results=self.__step_results,
+            step_results=list(state.step_results),
+            steps_total=state.steps_total,
+            steps_failed=state.steps_failed,
+            abort_reason=state.abort_reason,
+        )
+
+    def get_param(self) -> Dict:
+        """parameter set of current run, empty if testcase is not parameterized"""
+        return self.__state.param
+
+    def get_step_occurrence(self, step_name: Text) -> int:
+        """occurrence of running step among steps with the same name, starts from 1"""
+        steps = self.teststeps[: self.__state.steps_total + 1]
+        return sum(1 for step in steps if step.name() == step_name) or 1
+
+    def get_deadline_at(self) -> Union[float, None]:
+        return self.__state.deadline_at
+
+    def get_remaining_time(self) -> Union[float, None]:
+        """get remaining seconds before testcase deadline, None if no deadline"""
+        deadline_at = self.__state.deadline_at
+        if deadline_at is None:
+            return None
+
+        return max(deadline_at - time.time(), 0)
+
+    def check_deadline(self, step_name: Text):
+        """raise DeadlineExceeded if no time left before testcase deadline"""
+        remaining_time = self.get_remaining_time()
+        if remaining_time is None or remaining_time > 0:
+            return
+
+        elapsed = time.time() - self.__state.start_at
+        raise DeadlineExceeded(
+            f"testcase {self.__config.name} deadline exceeded at step {step_name}, "
+            f"elapsed {elapsed:.3f}s"
         )
 
     def merge_step_variables(self, variables: VariablesMapping) -> VariablesMapping:
         # override variables
         # step variables > extracted variables from previous steps
-        variables = merge_variables(variables, self.__session_variables)
+        variables = merge_variables(variables, self.__state.session_variables)
         # step variables > testcase config variables
         variables = merge_variables(variables, self.__config.variables)
 
@@ -178,10 +289,18 @@ class SessionRunner(object):
             step (Step): teststep
 
         """
+        abort_reason = get_error_budget().exhausted_reason()
+        if abort_reason:
+            self.__state.abort_reason = abort_reason
+            raise ErrorBudgetExhausted(
+                f"error budget exhausted before step {step.name()}: {abort_reason}"
+            )
+
         logger.info(f"run step begin: {step.name()} >>>>>>")
 
         # run step
         for i in range(step.retry_times + 1):
+            self.check_deadline(step.name())
             try:
                 if ALLURE is not None:
                     with ALLURE.step(f"step: {step.name()}"):
@@ -189,9 +308,22 @@ class SessionRunner(object):
                 else:
                     step_result: StepResult = step.run(self)
                 break
-            except ValidationFailure:
+            except ValidationFailure as ex:
+                # request may fail due to timeout clamped by deadline
+                try:
+                    self.check_deadline(step.name())
+                except DeadlineExceeded as deadline_ex:
+                    raise deadline_ex from ex
+
                 if i == step.retry_times:
                     raise
+
+                remaining_time = self.get_remaining_time()
+                if remaining_time is not None and remaining_time <= step.retry_interval:
+                    raise DeadlineExceeded(
+                        f"no time left to retry step {step.name()}, "
+                        f"remaining {remaining_time:.3f}s, retry interval {step.retry_interval}s"
+                    ) from ex
                 else:
                     logger.warning(
                         f"run step {step.name()} validation failed,wait {step.retry_interval} sec and try again"
@@ -202,9 +334,9 @@ class SessionRunner(object):
                     )
 
         # save extracted variables to session variables
-        self.__session_variables.update(step_result.export_vars)
+        self.__state.session_variables.update(step_result.export_vars)
         # update testcase summary
-        self.__step_results.append(step_result)
+        self.__state.add_step_result(step_result)
 
         logger.info(f"run step end: {step.name()} <<<<<<\n")
 
@@ -212,8 +344,18 @@ class SessionRunner(object):
         """main entrance, discovered by pytest"""
         print("\n")
         self.__init()
+        self.__state.param = dict(param or {})
         self.__parse_config(param)
 
+        error_budget = get_error_budget()
+        abort_reason = error_budget.exhausted_reason()
+        if abort_reason:
+            # skipped or aborted by pytest plugin, see httprunner.pytest_plugin
+            self.__state.abort_reason = abort_reason
+            msg = f"error budget exhausted, testcase {self.__config.name} not run: {abort_reason}"
+            logger.warning(msg)
+            raise ErrorBudgetExhausted(msg)
+
         if ALLURE is not None and not self.__is_referenced:
             # update allure report meta
             ALLURE.dynamic.title(self.__config.name)
@@ -223,22 +365,46 @@ class SessionRunner(object):
             f"Start to run testcase: {self.__config.name}, TestCase ID: {self.case_id}"
         )
 
-        init_file_logger(self.__log_path)
-        self.__start_at = time.time()
+        log_handler_id = init_file_logger(self.__log_path)
+        self.__state.start_at = time.time()
+        deadline_candidates = [self.__deadline_at]
+        if self.__config.deadline is not None:
+            deadline_candidates.append(self.__state.start_at + self.__config.deadline)
+        deadline_candidates = [item for item in deadline_candidates if item is not None]
+        if deadline_candidates:
+            # referenced testcase can not run longer than its caller
+            self.__state.deadline_at = min(deadline_candidates)
+
+        success = False
+        # files referenced by steps are relative to RootDir of this testcase
+        root_dir_token = running_root_dir.set(self.root_dir)
         try:
             # run step in sequential order
             for step in self.teststeps:
                 self.__run_step(step)
+            success = self.__state.success
+        except ErrorBudgetExhausted:
+            # remaining steps not run, not failure of step
+            raise
+        except Exception:
+            # failed step raised without step result, count it anyway
+            self.__state.add_step_error()
+            raise
         finally:
+            running_root_dir.reset(root_dir_token)
+            if not self.__is_referenced:
+                error_budget.record_testcase(success)
             logger.info(f"generate testcase log: {self.__log_path}")
-            if ALLURE is not None:
+            # remove file sink, avoid sinks piling up when running testcase repeatedly
+            logger.remove(log_handler_id)
+            if ALLURE is not None and os.path.isfile(self.__log_path):
                 ALLURE.attach.file(
                     self.__log_path,
                     name="all log",
                     attachment_type=ALLURE.attachment_type.TEXT,
                 )
 
-        self.__duration = time.time() - self.__start_at
+        self.__state.duration = time.time() - self.__state.start_at
         return self
 
 
@@ -0,0 +1,199 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from httprunner import Config, HttpRunner, RunRequest, Step, loader
+from httprunner.exceptions import DeadlineExceeded, ValidationFailure
+from httprunner.models import IStep, StepResult
+
+
+class FakeStep(IStep):
+    """step without network access, export one variable per run"""
+
+    retry_times = 0
+    retry_interval = 0
+
+    def __init__(self, name: str, success: bool = True):
+        self.__name = name
+        self.__success = success
+
+    def name(self) -> str:
+        return self.__name
+
+    def run(self, runner) -> StepResult:
+        return StepResult(
+            name=self.__name,
+            step_type="fake",
+            success=self.__success,
+            export_vars={self.__name: self.__success},
+        )
+
+
+class SlowStep(FakeStep):
+    def __init__(self, name: str, seconds: float, fail_times: int = 0):
+        super().__init__(name)
+        self.seconds = seconds
+        self.fail_times = fail_times
+
+    def run(self, runner) -> StepResult:
+        time.sleep(self.seconds)
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise ValidationFailure(f"{self.name()} failed")
+        return super().run(runner)
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(2)
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CaseWithFakeSteps(HttpRunner):
+    config = Config("fake steps").export("step1")
+    teststeps = [FakeStep("step1"), FakeStep("step2", success=False), FakeStep("step3")]
+
+
+class TestSessionState(unittest.TestCase):
+    def test_fresh_state_per_run(self):
+        runner = CaseWithFakeSteps()
+        runner.test_start()
+        runner.test_start()
+        summary = runner.get_summary()
+        self.assertEqual(len(summary.step_results), 3)
+        self.assertFalse(summary.success)
+        self.assertEqual(summary.in_out.export_vars, {"step1": True})
+
+        another_runner = CaseWithFakeSteps().test_start()
+        self.assertEqual(len(another_runner.get_summary().step_results), 3)
+
+    def test_running_root_dir(self):
+        root_dirs = []
+
+        class RootDirStep(FakeStep):
+            def run(self, runner) -> StepResult:
+                root_dirs.append(loader.running_root_dir.get())
+                return super().run(runner)
+
+        class CaseWithRootDir(HttpRunner):
+            config = Config("root dir")
+            teststeps = [RootDirStep("step1")]
+
+        runner = CaseWithRootDir().test_start()
+        self.assertEqual(root_dirs, [runner.root_dir])
+        self.assertEqual(loader.running_root_dir.get(), "")
+
+    def test_with_variables_not_shared(self):
+        runner = CaseWithFakeSteps().with_variables({"foo": "bar"}).test_start()
+        self.assertEqual(runner.get_summary().in_out.config_vars["foo"], "bar")
+
+        another_runner = CaseWithFakeSteps().test_start()
+        self.assertNotIn("foo", another_runner.get_summary().in_out.config_vars)
+
+    def test_retain_failed_step_results(self):
+        class TestCaseRetainFailed(CaseWithFakeSteps):
+            config = Config("retain failed").retain_step_results("failed")
+
+        summary = TestCaseRetainFailed().test_start().get_summary()
+        self.assertEqual([r.name for r in summary.step_results], ["step2"])
+        self.assertFalse(summary.success)
+
+    def test_retain_no_step_results(self):
+        class TestCaseRetainNone(CaseWithFakeSteps):
+            config = Config("retain none").retain_step_results("none")
+
+        summary = TestCaseRetainNone().test_start().get_summary()
+        self.assertEqual(summary.step_results, [])
+        self.assertFalse(summary.success)
+        self.assertEqual((summary.steps_total, summary.steps_failed), (3, 1))
+
+    def test_retain_latest_step_results(self):
+        class TestCaseRetainLatest(CaseWithFakeSteps):
+            config = Config("retain latest").retain_step_results(
+                max_step_results=2, keep_session_data=False
+            )
+
+        summary = TestCaseRetainLatest().test_start().get_summary()
+        self.assertEqual([r.name for r in summary.step_results], ["step2", "step3"])
+        self.assertIsNone(summary.step_results[0].data)
+
+
+class TestDeadline(unittest.TestCase):
+    def test_deadline_exceeded(self):
+        class CaseWithSlowSteps(HttpRunner):
+            config = Config("slow steps").deadline(0.3)
+            teststeps = [SlowStep("step1", 0.2), SlowStep("step2", 0.2), FakeStep("step3")]
+
+        runner = CaseWithSlowSteps()
+        with self.assertRaises(DeadlineExceeded):
+            runner.test_start()
+        summary = runner.get_summary()
+        self.assertEqual([r.name for r in summary.step_results], ["step1", "step2"])
+
+    def test_completed_step_not_failed(self):
+        class CaseWithSlowLastStep(HttpRunner):
+            config = Config("slow last step").deadline(0.1)
+            teststeps = [SlowStep("step1", 0.2)]
+
+        summary = CaseWithSlowLastStep().test_start().get_summary()
+        self.assertTrue(summary.success)
+        self.assertEqual([r.name for r in summary.step_results], ["step1"])
+
+    def test_slow_setup_hook(self):
+        class CaseWithSlowSetupHook(HttpRunner):
+            config = (
+                Config("slow setup hook").base_url("http://127.0.0.1").deadline(0.3)
+            )
+            teststeps = [
+                Step(RunRequest("get").setup_hook("${sleep(0.5)}").get("/get"))
+            ]
+
+        # request is not sent with timeout=0
+        with mock.patch("requests.Session.request") as request:
+            with self.assertRaises(DeadlineExceeded):
+                CaseWithSlowSetupHook().test_start()
+        request.assert_not_called()
+
+    def test_retry_respects_deadline(self):
+        class CaseWithRetry(HttpRunner):
+            config = Config("retry").deadline(1)
+            teststeps = [SlowStep("step1", 0, fail_times=3)]
+
+        CaseWithRetry.teststeps[0].retry_times = 3
+        CaseWithRetry.teststeps[0].retry_interval = 5
+
+        start_at = time.time()
+        with self.assertRaises(DeadlineExceeded):
+            CaseWithRetry().test_start()
+        self.assertLess(time.time() - start_at, 1)
+
+    def test_request_timeout_clamped(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        class CaseWithSlowRequest(HttpRunner):
+            config = (
+                Config("slow request")
+                .base_url(f"http://127.0.0.1:{server.server_address[1]}")
+                .deadline(0.5)
+            )
+            teststeps = [Step(RunRequest("get").get("/slow")), FakeStep("next")]
+
+        runner = CaseWithSlowRequest()
+        start_at = time.time()
+        try:
+            # request timed out without validators, next step is not started
+            with self.assertRaises(DeadlineExceeded):
+                runner.test_start()
+            self.assertLess(time.time() - start_at, 1.5)
+            step_names = [r.name for r in runner.get_summary().step_results]
+            self.assertEqual(step_names, ["get"])
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,160 @@
+""" repeated-sample request step, assert latency statistically.
+
+A single elapsed check is noisy, repeated step sends the same request many
+times, discards warm-up samples, and exposes aggregate variables to validators.
+
+    - test:
+        name: get orders
+        repeat:
+            times: 100
+            warmup: 5
+            concurrency: 4
+        request:
+            url: /orders
+            method: GET
+        validate:
+            - lt: ["$elapsed_p95", 0.5]
+            - eq: ["$error_rate", 0]
+
+Aggregate variables:
+
+- elapsed_p50, elapsed_p95, elapsed_p99, elapsed_mean, elapsed_max: transfer time
+  of samples in seconds, from sending request to downloading response body (only
+  headers for stream request), client side recording and logging are excluded
+- error_rate: ratio of samples failed to connect or with status code >= 400
+- rps: samples per second
+- samples: count of samples, warm-up samples excluded
+
+Extraction and validation of response fields, e.g. status_code and body, apply to
+the last sample.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Text, Tuple, Union
+
+from loguru import logger
+from requests import Response
+
+from httprunner.client import HttpSession, get_req_resp_record
+from httprunner.models import SessionData, TRepeat
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """percentile with linear interpolation between closest ranks"""
+    if not sorted_values:
+        return 0.0
+
+    rank = (len(sorted_values) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = rank - lower
+    return (
+        sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+    )
+
+
+def is_error_response(resp: Response) -> bool:
+    # status code 0 means connection error, see HttpSession._send_request_safe_mode
+    return resp.status_code == 0 or resp.status_code >= 400
+
+
+def aggregate_samples(
+    elapsed_list: List[float], error_count: int, duration: float
+) -> Dict[Text, Union[int, float]]:
+    count = len(elapsed_list)
+    sorted_elapsed = sorted(elapsed_list)
+    return {
+        "samples": count,
+        "elapsed_p50": round(percentile(sorted_elapsed, 50), 6),
+        "elapsed_p95": round(percentile(sorted_elapsed, 95), 6),
+        "elapsed_p99": round(percentile(sorted_elapsed, 99), 6),
+        "elapsed_mean": round(sum(elapsed_list) / count, 6) if count else 0.0,
+        "elapsed_max": round(sorted_elapsed[-1], 6) if count else 0.0,
+        "error_rate": round(error_count / count, 6) if count else 0.0,
+        "rps": round(count / duration, 3) if duration > 0 else 0.0,
+    }
+
+
+class _SessionPool(object):
+    """one HttpSession for each worker thread, HttpSession.data is not thread safe"""
+
+    def __init__(self, session: HttpSession):
+        self.__session = session
+        self.__local = threading.local()
+        self.__sessions: List[HttpSession] = []
+        self.__lock = threading.Lock()
+
+    def get(self) -> HttpSession:
+        session = getattr(self.__local, "session", None)
+        if session is None:
+            session = HttpSession()
+            session.headers.update(self.__session.headers)
+            session.cookies.update(self.__session.cookies)
+            self.__local.session = session
+            with self.__lock:
+                self.__sessions.append(session)
+        return session
+
+    def close(self):
+        for session in self.__sessions:
+            session.close()
+
+
+def run_repeated_request(
+    session: HttpSession, method: Text, url: Text, repeat: TRepeat, **kwargs
+) -> Tuple[Response, SessionData, Dict]:
+    """send request repeatedly, return last response, its session data and stats"""
+    session_pool = _SessionPool(session) if repeat.concurrency > 1 else None
+    stream = kwargs.get("stream", False)
+    # body is downloaded and timed here, instead of being recorded by HttpSession
+    send_kwargs = dict(kwargs, stream=True)
+
+    def send(index: int) -> Tuple[Response, SessionData, float]:
+        worker_session = session_pool.get() if session_pool else session
+        resp = worker_session.request(method, url, **send_kwargs)
+        # time of _send_request_safe_mode, recording request and response excluded
+        elapsed = worker_session.data.stat.response_time_ms / 1000
+        if not stream:
+            start_time = time.perf_counter()
+            _ = resp.content
+            elapsed += time.perf_counter() - start_time
+        return resp, worker_session.data, elapsed
+
+    logger.info(
+        f"repeat request {repeat.times} times, warmup: {repeat.warmup}, "
+        f"concurrency: {repeat.concurrency}"
+    )
+    elapsed_list = []
+    error_count = 0
+    last_sample = None
+    executor = ThreadPoolExecutor(max_workers=repeat.concurrency)
+    try:
+        for resp, _, _ in executor.map(send, range(repeat.warmup)):
+            resp.close()
+
+        start_time = time.perf_counter()
+        for index, sample in enumerate(executor.map(send, range(repeat.times))):
+            resp, _, elapsed = sample
+            elapsed_list.append(elapsed)
+            if is_error_response(resp):
+                error_count += 1
+            if index < repeat.times - 1:
+                resp.close()
+            else:
+                last_sample = sample
+        duration = time.perf_counter() - start_time
+    finally:
+        executor.shutdown()
+        # connection of last stream response is still in use
+        if session_pool is not None and not stream:
+            session_pool.close()
+
+    stats = aggregate_samples(elapsed_list, error_count, duration)
+    logger.info(f"repeated request stats: {stats}")
+    resp, session_data, _ = last_sample
+    if not stream:
+        # body of last response is omitted when recorded, record it with body
+        session_data.req_resps[-1] = get_req_resp_record(resp)
+    return resp, session_data, stats
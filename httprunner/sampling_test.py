@@ -0,0 +1,114 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from httprunner import Config, HttpRunner, RunRequest, Step, client
+from httprunner.exceptions import ParamsError
+from httprunner.sampling import aggregate_samples, percentile
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            CountingHandler.hits += 1
+            hits = CountingHandler.hits
+
+        # every 4th request of /flaky fails
+        status_code = 500 if self.path == "/flaky" and hits % 4 == 0 else 200
+        content = b'{"ok": true}'
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAggregate(unittest.TestCase):
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.5)
+        self.assertAlmostEqual(percentile(values, 95), 95.05)
+        self.assertEqual(percentile(values, 100), 100.0)
+        self.assertEqual(percentile([0.2], 99), 0.2)
+
+    def test_aggregate_samples(self):
+        stats = aggregate_samples([0.1, 0.3, 0.2, 0.4], 1, 2.0)
+        self.assertEqual(stats["samples"], 4)
+        self.assertEqual(stats["elapsed_p50"], 0.25)
+        self.assertEqual(stats["elapsed_max"], 0.4)
+        self.assertEqual(stats["error_rate"], 0.25)
+        self.assertEqual(stats["rps"], 2.0)
+
+    def test_invalid_repeat(self):
+        with self.assertRaises(ParamsError):
+            RunRequest("repeat").repeat(0)
+
+
+class TestRepeatRequest(unittest.TestCase):
+    def setUp(self) -> None:
+        CountingHandler.hits = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_repeat_with_statistical_assertions(self):
+        base_url = self.base_url
+
+        class CaseWithRepeatRequest(HttpRunner):
+            config = Config("repeat request").base_url(base_url)
+            teststeps = [
+                Step(
+                    RunRequest("flaky orders")
+                    .repeat(20, warmup=4, concurrency=4)
+                    .get("/flaky")
+                    .validate()
+                    .assert_equal("$samples", 20)
+                    .assert_less_than("$elapsed_p95", 1)
+                    .assert_less_or_equals("$elapsed_p50", "$elapsed_p99")
+                    .assert_equal("$error_rate", 0.25)
+                    .assert_greater_than("$rps", 0)
+                ),
+            ]
+
+        summary = CaseWithRepeatRequest().test_start().get_summary()
+        self.assertTrue(summary.success)
+        self.assertEqual(CountingHandler.hits, 24)
+        session_data = summary.step_results[0].data
+        self.assertEqual(session_data.sample_stat["samples"], 20)
+        self.assertEqual(len(session_data.validators["validate_extractor"]), 5)
+
+    def test_elapsed_excludes_recording(self):
+        base_url = self.base_url
+
+        class CaseWithRepeatRequest(HttpRunner):
+            config = Config("repeat request").base_url(base_url)
+            teststeps = [
+                Step(RunRequest("orders").repeat(5, concurrency=2).get("/orders")),
+            ]
+
+        get_req_resp_record = client.get_req_resp_record
+
+        def slow_record(*args, **kwargs):
+            time.sleep(0.1)
+            return get_req_resp_record(*args, **kwargs)
+
+        with mock.patch.object(client, "get_req_resp_record", slow_record):
+            summary = CaseWithRepeatRequest().test_start().get_summary()
+
+        session_data = summary.step_results[0].data
+        self.assertLess(session_data.sample_stat["elapsed_max"], 0.1)
+        # last sample is recorded with response body
+        self.assertEqual(session_data.req_resps[-1].response.body, {"ok": True})
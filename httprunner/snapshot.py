@@ -0,0 +1,308 @@
+"""golden response snapshot, compare full response with recorded snapshot file.
+
+The first run of a request step with snapshot records normalized response to
+snapshot file, later runs compare structural hash of response with the hash in
+snapshot file, detailed diff is computed only when hashes are different.
+
+    - test:
+        name: list orders
+        request:
+            url: /orders
+            method: GET
+        snapshot:
+            ignore:
+                - body.meta.request_id
+                - body.items[*].updated_at
+
+Snapshot files are saved in snapshots folder of project RootDir, which can be
+changed with environment variable HRUN_SNAPSHOT_DIR. Recorded snapshots are
+updated with HRUN_UPDATE_SNAPSHOTS=true, or `hrun --update-snapshots`.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Any, Dict, List, Text, Tuple, Union
+
+from loguru import logger
+
+from httprunner import loader
+from httprunner.exceptions import ParamsError, ValidationFailure
+from httprunner.models import TSnapshot
+
+# report at most 20 differences, snapshot of large body may be totally different
+MAX_DIFFS = 20
+
+# second line of snapshot file, keys are sorted and hash is always the first one
+SNAPSHOT_HASH_REGEX = re.compile(r'^\s*"hash":\s*"([0-9a-f]+)"')
+# body.meta.request_id, body.items[*].updated_at, headers.Date
+IGNORE_PATH_REGEX = re.compile(r"^[^.\[\]]+(?:\.[^.\[\]]+|\[(?:\d+|\*)\])*$")
+IGNORE_COMPONENT_REGEX = re.compile(r"([^.\[\]]+)|\[(\d+|\*)\]")
+
+# marks the end of an ignore path in ignore tree
+IGNORED = object()
+UNSAFE_NAME_REGEX = re.compile(r"[^\w\-]+")
+
+
+def is_update_snapshots() -> bool:
+    return os.getenv("HRUN_UPDATE_SNAPSHOTS", "").lower() in ["1", "true", "yes"]
+
+
+def parse_ignore_path(path: Text) -> Tuple[Union[Text, int], ...]:
+    """parse ignore path to components, * matches any item of list
+
+    Examples:
+        >>> parse_ignore_path("body.items[*].updated_at")
+        ("body", "items", "*", "updated_at")
+
+    """
+    if not IGNORE_PATH_REGEX.match(path):
+        raise ParamsError(f"invalid snapshot ignore path: {path}")
+
+    return tuple(
+        name if name else (index if index == "*" else int(index))
+        for name, index in IGNORE_COMPONENT_REGEX.findall(path)
+    )
+
+
+def build_ignore_tree(paths: List[Text]) -> Dict:
+    tree = {}
+    for path in paths:
+        components = parse_ignore_path(path)
+        node = tree
+        for component in components[:-1]:
+            node = node.setdefault(component, {})
+            if node is IGNORED:
+                # parent path is ignored already
+                break
+        else:
+            node[components[-1]] = IGNORED
+
+    return tree
+
+
+def normalize(data: Any, ignore_tree: Dict) -> Any:
+    """remove ignored paths from data, only parts on ignored paths are copied"""
+    if not ignore_tree:
+        return data
+
+    if isinstance(data, dict):
+        result = {}
+        for key, value in data.items():
+            node = ignore_tree.get(key)
+            if node is IGNORED:
+                continue
+            result[key] = normalize(value, node) if node else value
+        return result
+
+    if isinstance(data, list):
+        any_node = ignore_tree.get("*")
+        if any_node is IGNORED:
+            return []
+
+        result = []
+        for index, item in enumerate(data):
+            node = ignore_tree.get(index)
+            if node is IGNORED:
+                continue
+            if any_node:
+                item = normalize(item, any_node)
+            result.append(normalize(item, node) if node else item)
+        return result
+
+    return data
+
+
+def make_snapshot_data(resp_obj, snapshot: TSnapshot) -> Dict:
+    """collect fields of response, then remove ignored paths"""
+    data = {}
+    for field in snapshot.fields:
+        value = resp_obj.resp_obj_meta.get(field)
+        if field in ["headers", "cookies"]:
+            value = dict(value or {})
+        elif isinstance(value, bytes):
+            # response body is not json
+            value = value.decode("utf-8", errors="backslashreplace")
+        data[field] = value
+
+    return normalize(data, build_ignore_tree(snapshot.ignore))
+
+
+def hash_snapshot(data: Dict) -> Text:
+    # canonical json with stdlib, hash must be stable with any json backend
+    content = json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=repr
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _short_repr(value: Any, max_length: int = 80) -> Text:
+    value_repr = repr(value)
+    if len(value_repr) > max_length:
+        value_repr = value_repr[: max_length - 3] + "..."
+    return value_repr
+
+
+def diff_snapshot(expected: Any, actual: Any) -> List[Text]:
+    """structural diff of snapshot data, at most MAX_DIFFS differences"""
+    diffs = []
+    _diff_into(expected, actual, "", diffs)
+    return diffs[:MAX_DIFFS]
+
+
+def _diff_into(expected: Any, actual: Any, path: Text, diffs: List[Text]):
+    # equal subtrees are skipped at once
+    if len(diffs) >= MAX_DIFFS or (
+        type(expected) is type(actual) and expected == actual
+    ):
+        return
+
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in expected:
+            key_path = f"{path}.{key}" if path else str(key)
+            if key not in actual:
+                diffs.append(
+                    f"{key_path}: missing, expected {_short_repr(expected[key])}"
+                )
+            else:
+                _diff_into(expected[key], actual[key], key_path, diffs)
+        for key in actual:
+            if key not in expected:
+                key_path = f"{path}.{key}" if path else str(key)
+                diffs.append(f"{key_path}: unexpected {_short_repr(actual[key])}")
+
+    elif isinstance(expected, list) and isinstance(actual, list):
+        for index, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            _diff_into(expected_item, actual_item, f"{path}[{index}]", diffs)
+        if len(expected) != len(actual):
+            diffs.append(f"{path}: expected length {len(expected)}, got {len(actual)}")
+
+    else:
+        diffs.append(
+            f"{path}: expected {_short_repr(expected)}, got {_short_repr(actual)}"
+        )
+
+
+def get_default_snapshot_name(
+    testcase_cls_name: Text,
+    step_name: Text,
+    step_occurrence: int = 1,
+    param: Dict = None,
+) -> Text:
+    """e.g. TestCaseListOrders/list_orders
+
+    Steps with the same name get occurrence suffix, e.g. list_orders_2, and each
+    parameter set of parameterized testcase gets hash suffix of the parameters,
+    e.g. list_orders-1f2e3d4c5b6a, so that they never share one snapshot file.
+    """
+    step_slug = UNSAFE_NAME_REGEX.sub("_", step_name).strip("_") or "step"
+    if step_occurrence > 1:
+        step_slug = f"{step_slug}_{step_occurrence}"
+    if param:
+        step_slug = f"{step_slug}-{hash_snapshot(param)[:12]}"
+    return f"{testcase_cls_name}/{step_slug}"
+
+
+def get_snapshot_path(name: Text) -> Text:
+    snapshot_dir = os.getenv("HRUN_SNAPSHOT_DIR", "snapshots")
+    if not os.path.isabs(snapshot_dir):
+        project_meta = loader.project_meta
+        if project_meta and project_meta.RootDir:
+            root_dir = project_meta.RootDir
+        else:
+            root_dir = os.getcwd()
+        snapshot_dir = os.path.join(root_dir, snapshot_dir)
+
+    return os.path.join(snapshot_dir, *name.split("/")) + ".json"
+
+
+def read_snapshot_hash(snapshot_path: Text) -> Union[Text, None]:
+    """read hash only, snapshot data is loaded when hashes are different"""
+    with open(snapshot_path, encoding="utf-8") as f:
+        f.readline()
+        matched = SNAPSHOT_HASH_REGEX.match(f.readline())
+
+    if matched:
+        return matched.group(1)
+
+    # snapshot file is formatted by other tools
+    return load_snapshot(snapshot_path).get("hash")
+
+
+def load_snapshot(snapshot_path: Text) -> Dict:
+    with open(snapshot_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_snapshot(snapshot_path: Text, snapshot_hash: Text, data: Dict):
+    snapshot_dir = os.path.dirname(snapshot_path)
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    content = json.dumps(
+        {"hash": snapshot_hash, "response": data},
+        indent=4,
+        sort_keys=True,
+        ensure_ascii=False,
+        default=repr,
+    )
+    # write to temp file first, avoid partial snapshot with pytest-xdist workers
+    fd, temp_path = tempfile.mkstemp(dir=snapshot_dir, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(content + "\n")
+    os.replace(temp_path, snapshot_path)
+
+
+def validate_snapshot(resp_obj, snapshot: TSnapshot, default_name: Text) -> Dict:
+    """compare response with snapshot, record snapshot if not exists
+
+    Returns:
+        dict: snapshot validation result
+
+    Raises:
+        ValidationFailure: response mismatch with recorded snapshot
+
+    """
+    snapshot_path = get_snapshot_path(snapshot.name or default_name)
+    data = make_snapshot_data(resp_obj, snapshot)
+    snapshot_hash = hash_snapshot(data)
+    result = {"path": snapshot_path, "hash": snapshot_hash}
+
+    if not os.path.isfile(snapshot_path):
+        save_snapshot(snapshot_path, snapshot_hash, data)
+        logger.info(f"snapshot recorded: {snapshot_path}")
+        result["check_result"] = "recorded"
+        return result
+
+    if read_snapshot_hash(snapshot_path) == snapshot_hash:
+        logger.info(f"snapshot matched: {snapshot_path}")
+        result["check_result"] = "pass"
+        return result
+
+    if is_update_snapshots():
+        save_snapshot(snapshot_path, snapshot_hash, data)
+        logger.info(f"snapshot updated: {snapshot_path}")
+        result["check_result"] = "updated"
+        return result
+
+    # ignore paths may be changed after snapshot recorded
+    expected = normalize(
+        load_snapshot(snapshot_path).get("response", {}),
+        build_ignore_tree(snapshot.ignore),
+    )
+    diffs = diff_snapshot(expected, data)
+    if not diffs:
+        logger.warning(f"snapshot matched with stale hash: {snapshot_path}")
+        result["check_result"] = "pass"
+        return result
+
+    result["check_result"] = "fail"
+    result["diffs"] = diffs
+    diffs_string = "\n".join(f"    {diff}" for diff in diffs)
+    failure_msg = (
+        f"snapshot mismatch: {snapshot_path}\n{diffs_string}\n"
+        f"set HRUN_UPDATE_SNAPSHOTS=true to update snapshot if it is expected"
+    )
+    logger.error(failure_msg)
+    raise ValidationFailure(failure_msg)
@@ -0,0 +1,212 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+import requests
+
+from httprunner import Config, HttpRunner, RunRequest, Step, snapshot
+from httprunner.client import HttpSession
+from httprunner.exceptions import ParamsError, ValidationFailure
+from httprunner.models import TSnapshot
+from httprunner.parser import Parser
+from httprunner.response import ResponseObject
+
+
+def build_response(body) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers["Content-Type"] = "application/json"
+    resp._content = json.dumps(body).encode("utf-8")
+    resp.elapsed = timedelta(milliseconds=10)
+    return resp
+
+
+def build_orders(request_id: str, first_name: str = "item-0"):
+    return {
+        "meta": {"total": 3, "request_id": request_id},
+        "items": [
+            {"id": 0, "name": first_name, "updated_at": request_id},
+            {"id": 1, "name": "item-1", "updated_at": request_id},
+            {"id": 2, "name": "item-2", "updated_at": request_id},
+        ],
+    }
+
+
+class TestNormalize(unittest.TestCase):
+    def test_parse_ignore_path(self):
+        self.assertEqual(
+            snapshot.parse_ignore_path("body.items[*].updated_at"),
+            ("body", "items", "*", "updated_at"),
+        )
+        self.assertEqual(
+            snapshot.parse_ignore_path("body.items[1].id"), ("body", "items", 1, "id")
+        )
+        with self.assertRaises(ParamsError):
+            snapshot.parse_ignore_path("body..id")
+
+    def test_normalize_without_mutating(self):
+        data = {"body": build_orders("r1")}
+        ignore_tree = snapshot.build_ignore_tree(
+            ["body.meta.request_id", "body.items[*].updated_at", "body.items[2]"]
+        )
+        self.assertEqual(
+            snapshot.normalize(data, ignore_tree),
+            {
+                "body": {
+                    "meta": {"total": 3},
+                    "items": [{"id": 0, "name": "item-0"}, {"id": 1, "name": "item-1"}],
+                }
+            },
+        )
+        self.assertEqual(data, {"body": build_orders("r1")})
+
+    def test_diff_snapshot(self):
+        expected = {"body": {"a": 1, "b": [1, 2], "c": True}}
+        actual = {"body": {"a": 2, "b": [1], "c": 1, "d": None}}
+        self.assertEqual(
+            snapshot.diff_snapshot(expected, actual),
+            [
+                "body.a: expected 1, got 2",
+                "body.b: expected length 2, got 1",
+                "body.c: expected True, got 1",
+                "body.d: unexpected None",
+            ],
+        )
+
+
+class TestValidateSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.snapshot_dir = tempfile.mkdtemp()
+        env = {"HRUN_SNAPSHOT_DIR": self.snapshot_dir, "HRUN_UPDATE_SNAPSHOTS": ""}
+        self.env_patcher = mock.patch.dict(os.environ, env)
+        self.env_patcher.start()
+        self.snapshot = TSnapshot(
+            ignore=["body.meta.request_id", "body.items[*].updated_at"]
+        )
+
+    def tearDown(self) -> None:
+        self.env_patcher.stop()
+        shutil.rmtree(self.snapshot_dir)
+
+    def validate(self, body):
+        resp_obj = ResponseObject(build_response(body), Parser({}))
+        return snapshot.validate_snapshot(
+            resp_obj, self.snapshot, "TestCaseOrders/list_orders"
+        )
+
+    def test_record_then_match(self):
+        result = self.validate(build_orders("r1"))
+        self.assertEqual(result["check_result"], "recorded")
+        snapshot_path = os.path.join(
+            self.snapshot_dir, "TestCaseOrders", "list_orders.json"
+        )
+        self.assertEqual(result["path"], snapshot_path)
+        self.assertEqual(snapshot.read_snapshot_hash(snapshot_path), result["hash"])
+
+        # volatile fields changed, snapshot data is not loaded
+        with mock.patch.object(snapshot, "load_snapshot") as load_snapshot:
+            result = self.validate(build_orders("r2"))
+        self.assertEqual(result["check_result"], "pass")
+        load_snapshot.assert_not_called()
+
+    def test_mismatch_and_update(self):
+        self.validate(build_orders("r1"))
+
+        with self.assertRaises(ValidationFailure) as context:
+            self.validate(build_orders("r2", first_name="renamed"))
+        self.assertIn(
+            "body.items[0].name: expected 'item-0', got 'renamed'",
+            str(context.exception),
+        )
+
+        with mock.patch.dict(os.environ, {"HRUN_UPDATE_SNAPSHOTS": "true"}):
+            result = self.validate(build_orders("r3", first_name="renamed"))
+        self.assertEqual(result["check_result"], "updated")
+        result = self.validate(build_orders("r4", first_name="renamed"))
+        self.assertEqual(result["check_result"], "pass")
+
+    def test_ignore_added_after_recorded(self):
+        self.validate(build_orders("r1"))
+        self.snapshot.ignore.append("body.meta.total")
+        body = build_orders("r2")
+        body["meta"]["total"] = 4
+        # hashes are different, while normalized snapshot data is matched
+        result = self.validate(body)
+        self.assertEqual(result["check_result"], "pass")
+
+
+class TestDefaultSnapshotName(unittest.TestCase):
+    def setUp(self) -> None:
+        self.snapshot_dir = tempfile.mkdtemp()
+        env = {"HRUN_SNAPSHOT_DIR": self.snapshot_dir, "HRUN_UPDATE_SNAPSHOTS": ""}
+        self.env_patcher = mock.patch.dict(os.environ, env)
+        self.env_patcher.start()
+
+    def tearDown(self) -> None:
+        self.env_patcher.stop()
+        shutil.rmtree(self.snapshot_dir)
+
+    def test_default_snapshot_name(self):
+        self.assertEqual(
+            snapshot.get_default_snapshot_name("TestCaseOrders", "list orders"),
+            "TestCaseOrders/list_orders",
+        )
+        self.assertEqual(
+            snapshot.get_default_snapshot_name("TestCaseOrders", "list orders", 2),
+            "TestCaseOrders/list_orders_2",
+        )
+        name = snapshot.get_default_snapshot_name(
+            "TestCaseOrders", "list orders", 1, {"user": "a"}
+        )
+        self.assertRegex(name, r"^TestCaseOrders/list_orders-[0-9a-f]{12}$")
+        self.assertNotEqual(
+            name,
+            snapshot.get_default_snapshot_name(
+                "TestCaseOrders", "list orders", 1, {"user": "b"}
+            ),
+        )
+
+    def test_parameterized_testcase(self):
+        class TestCaseUserOrders(HttpRunner):
+            config = Config("user orders").base_url("https://example.com")
+            teststeps = [
+                Step(
+                    RunRequest("list orders")
+                    .get("/orders")
+                    .with_params(**{"user": "$user"})
+                    .validate()
+                    .assert_snapshot()
+                ),
+                Step(
+                    RunRequest("list orders")
+                    .get("/orders")
+                    .with_params(**{"user": "$user", "page": 2})
+                    .validate()
+                    .assert_snapshot()
+                ),
+            ]
+
+        def send_request(session, method, url, **kwargs):
+            request = requests.Request(method, url, params=kwargs.get("params"))
+            resp = build_response(kwargs.get("params"))
+            resp.request = request.prepare()
+            resp.url = resp.request.url
+            return resp
+
+        with mock.patch.object(HttpSession, "_send_request_safe_mode", send_request):
+            for user in ["a", "b"]:
+                for _ in range(2):
+                    # recorded on first run, matched on second run
+                    runner = TestCaseUserOrders().test_start({"user": user})
+                    self.assertTrue(runner.get_summary().success)
+
+        snapshot_names = sorted(
+            os.listdir(os.path.join(self.snapshot_dir, "TestCaseUserOrders"))
+        )
+        # two steps of the same name, two parameter sets
+        self.assertEqual(len(snapshot_names), 4)
+        self.assertEqual(len([n for n in snapshot_names if "_2-" in n]), 2)
@@ -2,6 +2,7 @@ from typing import Union
 
 from httprunner import HttpRunner
 from httprunner.models import StepResult, TRequest, TStep, TestCase
+from httprunner.response import get_validator_plan
 from httprunner.step_request import (
     RequestWithOptionalArgs,
     StepRequestExtraction,
@@ -37,6 +38,8 @@ class Step(object):
         ],
     ):
         self.__step = step
+        # compile validators once when step is built, reused by all runs
+        get_validator_plan(step.struct())
 
     @property
     def request(self) -> TRequest:
@@ -1,25 +1,28 @@
-import json
 import time
 from typing import Any, Dict, List, Text, Union
 
 import requests
 from loguru import logger
 
-from httprunner import utils
-from httprunner.exceptions import ValidationFailure
+from httprunner import jsonlib, utils
+from httprunner.exceptions import ParamsError, ValidationFailure
 from httprunner.ext.uploader import prepare_upload_step
 from httprunner.models import (
     Hooks,
     IStep,
     MethodEnum,
     StepResult,
+    TRepeat,
     TRequest,
+    TSnapshot,
     TStep,
     VariablesMapping,
 )
 from httprunner.parser import build_url, parse_variables_mapping
-from httprunner.response import ResponseObject
+from httprunner.response import ResponseObject, compile_regex, get_validator_plan
 from httprunner.runner import ALLURE, HttpRunner
+from httprunner.sampling import run_repeated_request
+from httprunner.snapshot import get_default_snapshot_name, validate_snapshot
 
 
 def call_hooks(
@@ -69,10 +72,10 @@ def call_hooks(
 
 def pretty_format(v) -> str:
     if isinstance(v, dict):
-        return json.dumps(v, indent=4, ensure_ascii=False)
+        return jsonlib.dumps(v, indent=4, ensure_ascii=False)
 
     if isinstance(v, requests.structures.CaseInsensitiveDict):
-        return json.dumps(dict(v.items()), indent=4, ensure_ascii=False)
+        return jsonlib.dumps(dict(v.items()), indent=4, ensure_ascii=False)
 
     return repr(utils.omit_long_data(v))
 
@@ -102,9 +105,9 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
     request_headers = {
         key: request_headers[key] for key in request_headers if not key.startswith(":")
     }
-    request_headers[
-        "HRUN-Request-ID"
-    ] = f"HRUN-{runner.case_id}-{str(int(time.time() * 1000))[-6:]}"
+    request_headers["HRUN-Request-ID"] = (
+        f"HRUN-{runner.case_id}-{str(int(time.time() * 1000))[-6:]}"
+    )
     parsed_request_dict["headers"] = request_headers
 
     step_variables["request"] = parsed_request_dict
@@ -121,6 +124,15 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
     parsed_request_dict["verify"] = config.verify
     parsed_request_dict["json"] = parsed_request_dict.pop("req_json", {})
 
+    # setup hooks and parsing may use up the deadline, timeout=0 is invalid
+    runner.check_deadline(step.name)
+    # clamp request timeout to remaining time of testcase deadline
+    remaining_time = runner.get_remaining_time()
+    if remaining_time is not None:
+        parsed_request_dict["timeout"] = min(
+            parsed_request_dict["timeout"] or remaining_time, remaining_time
+        )
+
     # log request
     request_print = "====== request details ======\n"
     request_print += f"url: {url}\n"
@@ -135,7 +147,16 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
             name="request details",
             attachment_type=ALLURE.attachment_type.TEXT,
         )
-    resp = runner.session.request(method, url, **parsed_request_dict)
+    if step.repeat:
+        resp, session_data, sample_stat = run_repeated_request(
+            runner.session, method, url, step.repeat, **parsed_request_dict
+        )
+        # extract and validate with the last sample
+        runner.session.data = session_data
+        runner.session.data.sample_stat = sample_stat
+        step_variables.update(sample_stat)
+    else:
+        resp = runner.session.request(method, url, **parsed_request_dict)
 
     # log response
     response_print = "====== response details ======\n"
@@ -143,10 +164,14 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
     response_print += f"elapsed: {resp.elapsed.total_seconds()}s\n"
     response_print += f"headers: {pretty_format(resp.headers)}\n"
 
-    try:
-        resp_body = resp.json()
-    except (requests.exceptions.JSONDecodeError, json.decoder.JSONDecodeError):
-        resp_body = resp.content
+    if step.request.stream:
+        # response content is parsed on demand
+        resp_body = "stream body (OMITTED)"
+    else:
+        try:
+            resp_body = jsonlib.loads_response(resp)
+        except (requests.exceptions.JSONDecodeError, jsonlib.JSONDecodeError):
+            resp_body = resp.content
 
     response_print += f"body: {pretty_format(resp_body)}\n"
     logger.debug(response_print)
@@ -156,7 +181,7 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
             name="response details",
             attachment_type=ALLURE.attachment_type.TEXT,
         )
-    resp_obj = ResponseObject(resp, runner.parser)
+    resp_obj = ResponseObject(resp, runner.parser, stream=step.request.stream)
     step_variables["response"] = resp_obj
 
     # teardown hooks
@@ -172,9 +197,20 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
     variables_mapping.update(extract_mapping)
 
     # validate
-    validators = step.validators
+    validators = get_validator_plan(step)
     try:
-        resp_obj.validate(validators, variables_mapping)
+        resp_obj.validate(validators, variables_mapping, step.validate_stop_on_failure)
+        if step.snapshot:
+            resp_obj.validation_results["snapshot"] = validate_snapshot(
+                resp_obj,
+                step.snapshot,
+                get_default_snapshot_name(
+                    runner.__class__.__name__,
+                    step.name,
+                    runner.get_step_occurrence(step.name),
+                    runner.get_param(),
+                ),
+            )
         step_result.success = True
     except ValidationFailure:
         raise
@@ -187,6 +223,10 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
         step_result.data = session_data
         step_result.elapsed = time.time() - start_time
 
+        if step.request.stream:
+            # release connection, remaining content may be left unread
+            resp.close()
+
     return step_result
 
 
@@ -194,40 +234,39 @@ class StepRequestValidation(IStep):
     def __init__(self, step: TStep):
         self.__step = step
 
+    def __add_validator(self, validator: Dict):
+        self.__step.validators.append(validator)
+        # compile again with added validator, see get_validator_plan
+        self.__step._validator_plan = None
+
     def assert_equal(
         self, jmes_path: Text, expected_value: Any, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append({"equal": [jmes_path, expected_value, message]})
+        self.__add_validator({"equal": [jmes_path, expected_value, message]})
         return self
 
     def assert_not_equal(
         self, jmes_path: Text, expected_value: Any, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"not_equal": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"not_equal": [jmes_path, expected_value, message]})
         return self
 
     def assert_greater_than(
         self, jmes_path: Text, expected_value: Union[int, float], message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"greater_than": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"greater_than": [jmes_path, expected_value, message]})
         return self
 
     def assert_less_than(
         self, jmes_path: Text, expected_value: Union[int, float], message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"less_than": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"less_than": [jmes_path, expected_value, message]})
         return self
 
     def assert_greater_or_equals(
         self, jmes_path: Text, expected_value: Union[int, float], message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
+        self.__add_validator(
             {"greater_or_equals": [jmes_path, expected_value, message]}
         )
         return self
@@ -235,23 +274,19 @@ class StepRequestValidation(IStep):
     def assert_less_or_equals(
         self, jmes_path: Text, expected_value: Union[int, float], message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"less_or_equals": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"less_or_equals": [jmes_path, expected_value, message]})
         return self
 
     def assert_length_equal(
         self, jmes_path: Text, expected_value: int, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"length_equal": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"length_equal": [jmes_path, expected_value, message]})
         return self
 
     def assert_length_greater_than(
         self, jmes_path: Text, expected_value: int, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
+        self.__add_validator(
             {"length_greater_than": [jmes_path, expected_value, message]}
         )
         return self
@@ -259,15 +294,13 @@ class StepRequestValidation(IStep):
     def assert_length_less_than(
         self, jmes_path: Text, expected_value: int, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"length_less_than": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"length_less_than": [jmes_path, expected_value, message]})
         return self
 
     def assert_length_greater_or_equals(
         self, jmes_path: Text, expected_value: int, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
+        self.__add_validator(
             {"length_greater_or_equals": [jmes_path, expected_value, message]}
         )
         return self
@@ -275,7 +308,7 @@ class StepRequestValidation(IStep):
     def assert_length_less_or_equals(
         self, jmes_path: Text, expected_value: int, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
+        self.__add_validator(
             {"length_less_or_equals": [jmes_path, expected_value, message]}
         )
         return self
@@ -283,59 +316,155 @@ class StepRequestValidation(IStep):
     def assert_string_equals(
         self, jmes_path: Text, expected_value: Any, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"string_equals": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"string_equals": [jmes_path, expected_value, message]})
         return self
 
     def assert_startswith(
         self, jmes_path: Text, expected_value: Text, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"startswith": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"startswith": [jmes_path, expected_value, message]})
         return self
 
     def assert_endswith(
         self, jmes_path: Text, expected_value: Text, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"endswith": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"endswith": [jmes_path, expected_value, message]})
         return self
 
     def assert_regex_match(
         self, jmes_path: Text, expected_value: Text, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"regex_match": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"regex_match": [jmes_path, expected_value, message]})
         return self
 
     def assert_contains(
         self, jmes_path: Text, expected_value: Any, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"contains": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"contains": [jmes_path, expected_value, message]})
         return self
 
     def assert_contained_by(
         self, jmes_path: Text, expected_value: Any, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"contained_by": [jmes_path, expected_value, message]}
-        )
+        self.__add_validator({"contained_by": [jmes_path, expected_value, message]})
         return self
 
     def assert_type_match(
         self, jmes_path: Text, expected_value: Any, message: Text = ""
     ) -> "StepRequestValidation":
-        self.__step.validators.append(
-            {"type_match": [jmes_path, expected_value, message]}
+        self.__add_validator({"type_match": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_schema_match(
+        self, jmes_path: Text, schema: Union[Text, Dict], message: Text = ""
+    ) -> "StepRequestValidation":
+        """validate with JSON Schema, schema is file path relative to project root
+        directory, or inline schema dict
+        """
+        self.__add_validator({"schema_match": [jmes_path, schema, message]})
+        return self
+
+    def assert_schema(
+        self, jmes_path: Text, schema: Union[Text, Dict], message: Text = ""
+    ) -> "StepRequestValidation":
+        return self.assert_schema_match(jmes_path, schema, message)
+
+    def assert_all_match(
+        self, jmes_path: Text, expected_value: Any, message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator({"all_match": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_any_match(
+        self, jmes_path: Text, expected_value: Any, message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator({"any_match": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_each_in_range(
+        self, jmes_path: Text, expected_value: List, message: Text = ""
+    ) -> "StepRequestValidation":
+        """expected value is [low, high], both inclusive"""
+        self.__add_validator({"each_in_range": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_sorted_by(
+        self, jmes_path: Text, expected_value: Text, message: Text = ""
+    ) -> "StepRequestValidation":
+        """expected value is key field of items, descending if it starts with -"""
+        self.__add_validator({"sorted_by": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_unique_by(
+        self, jmes_path: Text, expected_value: Text, message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator({"unique_by": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_sum_equal(
+        self, jmes_path: Text, expected_value: Union[int, float], message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator({"sum_equal": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_min_equal(
+        self, jmes_path: Text, expected_value: Union[int, float], message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator({"min_equal": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_max_equal(
+        self, jmes_path: Text, expected_value: Union[int, float], message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator({"max_equal": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_min_greater_or_equals(
+        self, jmes_path: Text, expected_value: Union[int, float], message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator(
+            {"min_greater_or_equals": [jmes_path, expected_value, message]}
         )
         return self
 
+    def assert_max_less_or_equals(
+        self, jmes_path: Text, expected_value: Union[int, float], message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator(
+            {"max_less_or_equals": [jmes_path, expected_value, message]}
+        )
+        return self
+
+    def assert_contains_all(
+        self, jmes_path: Text, expected_value: List, message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator({"contains_all": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_all_contained_by(
+        self, jmes_path: Text, expected_value: List, message: Text = ""
+    ) -> "StepRequestValidation":
+        self.__add_validator({"all_contained_by": [jmes_path, expected_value, message]})
+        return self
+
+    def assert_snapshot(
+        self, name: Text = "", ignore: List[Text] = None, fields: List[Text] = None
+    ) -> "StepRequestValidation":
+        """compare response with golden snapshot, recorded on first run
+
+        Args:
+            name: snapshot file name, default to <testcase class>/<step name>,
+                with suffix of step occurrence and parameters hash if needed
+            ignore: volatile paths excluded from snapshot, e.g. body.meta.request_id
+            fields: response fields in snapshot, default to status_code and body
+
+        """
+        snapshot = TSnapshot(name=name, ignore=ignore or [])
+        if fields:
+            snapshot.fields = fields
+        self.__step.snapshot = snapshot
+        return self
+
     def struct(self) -> TStep:
         return self.__step
 
@@ -357,7 +486,21 @@ class StepRequestExtraction(IStep):
         self.__step.extract[var_name] = jmes_path
         return self
 
-    def with_regex(self, regex_pattern: Text, var_name: Text) -> "StepRequestExtraction":
+    def with_regex(
+        self, regex_pattern: Text, var_name: Text = None
+    ) -> "StepRequestExtraction":
+        """extract with regex, first group (or whole match) is assigned to var_name,
+        named groups are extracted as variables at the same time,
+        var_name defaults to the first named group.
+        """
+        if var_name is None:
+            group_names = list(compile_regex(regex_pattern).groupindex)
+            if not group_names:
+                raise ParamsError(
+                    f"var_name is required for regex without named groups: {regex_pattern}"
+                )
+            var_name = group_names[0]
+
         # 使用特殊前缀标记这是正则表达式
         self.__step.extract[var_name] = f"regex:{regex_pattern}"
         return self
@@ -366,7 +509,8 @@ class StepRequestExtraction(IStep):
     #     # TODO: extract response json with jsonpath
     #     pass
 
-    def validate(self) -> StepRequestValidation:
+    def validate(self, stop_on_failure: bool = False) -> StepRequestValidation:
+        self.__step.validate_stop_on_failure = stop_on_failure
         return StepRequestValidation(self.__step)
 
     def struct(self) -> TStep:
@@ -418,6 +562,11 @@ class RequestWithOptionalArgs(IStep):
         self.__step.request.allow_redirects = allow_redirects
         return self
 
+    def set_stream(self, stream: bool = True) -> "RequestWithOptionalArgs":
+        """extract simple body paths from response stream, without decoding full body"""
+        self.__step.request.stream = stream
+        return self
+
     def upload(self, **file_info) -> "RequestWithOptionalArgs":
         self.__step.request.upload.update(file_info)
         return self
@@ -435,7 +584,8 @@ class RequestWithOptionalArgs(IStep):
     def extract(self) -> StepRequestExtraction:
         return StepRequestExtraction(self.__step)
 
-    def validate(self) -> StepRequestValidation:
+    def validate(self, stop_on_failure: bool = False) -> StepRequestValidation:
+        self.__step.validate_stop_on_failure = stop_on_failure
         return StepRequestValidation(self.__step)
 
     def struct(self) -> TStep:
@@ -464,6 +614,19 @@ class RunRequest(object):
         self.__step.retry_interval = retry_interval
         return self
 
+    def repeat(self, times: int, warmup: int = 0, concurrency: int = 1) -> "RunRequest":
+        """send request repeatedly, validate with aggregate variables of samples,
+        e.g. $elapsed_p95, $error_rate, see httprunner.sampling
+        """
+        if times < 1 or warmup < 0 or concurrency < 1:
+            raise ParamsError(
+                f"invalid repeat: times={times}, warmup={warmup}, concurrency={concurrency}"
+            )
+        self.__step.repeat = TRepeat(
+            times=times, warmup=warmup, concurrency=concurrency
+        )
+        return self
+
     def setup_hook(self, hook: Text, assign_var_name: Text = None) -> "RunRequest":
         if assign_var_name:
             self.__step.setup_hooks.append({assign_var_name: hook})
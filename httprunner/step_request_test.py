@@ -3,6 +3,8 @@ import unittest
 from examples.postman_echo.request_methods.request_with_functions_test import (
     TestCaseRequestWithFunctions,
 )
+from httprunner import RunRequest
+from httprunner.exceptions import ParamsError
 
 
 class TestRunRequest(unittest.TestCase):
@@ -15,3 +17,22 @@ class TestRunRequest(unittest.TestCase):
         self.assertEqual(summary.step_results[0].name, "get with params")
         self.assertEqual(summary.step_results[1].name, "post raw text")
         self.assertEqual(summary.step_results[2].name, "post form data")
+
+    def test_with_regex_named_groups(self):
+        step = (
+            RunRequest("regex")
+            .get("/get")
+            .extract()
+            .with_regex(r"token=(?P<token>\w+)&uid=(?P<uid>\d+)")
+            .with_regex(r"code=(\d+)", "code")
+            .struct()
+        )
+        self.assertEqual(
+            step.extract,
+            {
+                "token": r"regex:token=(?P<token>\w+)&uid=(?P<uid>\d+)",
+                "code": r"regex:code=(\d+)",
+            },
+        )
+        with self.assertRaises(ParamsError):
+            RunRequest("regex").get("/get").extract().with_regex(r"code=(\d+)")
@@ -8,7 +8,7 @@ from loguru import logger
 from httprunner import utils
 from httprunner.exceptions import SqlMethodNotSupport, ValidationFailure
 from httprunner.models import IStep, SqlMethodEnum, StepResult, TSqlRequest, TStep
-from httprunner.response import SqlResponseObject
+from httprunner.response import SqlResponseObject, get_validator_plan
 from httprunner.runner import ALLURE, HttpRunner
 from httprunner.step_request import (
     StepRequestExtraction,
@@ -173,9 +173,9 @@ def run_step_sql_request(runner: HttpRunner, step: TStep) -> StepResult:
     variables_mapping.update(extract_mapping)
 
     # validate
-    validators = step.validators
+    validators = get_validator_plan(step)
     try:
-        resp_obj.validate(validators, variables_mapping)
+        resp_obj.validate(validators, variables_mapping, step.validate_stop_on_failure)
         step_result.success = True
     except ValidationFailure:
         log_sql_req_resp_details()
@@ -208,7 +208,8 @@ class StepSqlRequestExtraction(StepRequestExtraction):
     def run(self, runner: HttpRunner):
         return run_step_sql_request(runner, self.__step)
 
-    def validate(self) -> StepSqlRequestValidation:
+    def validate(self, stop_on_failure: bool = False) -> StepSqlRequestValidation:
+        self.__step.validate_stop_on_failure = stop_on_failure
         return StepSqlRequestValidation(self.__step)
 
 
@@ -307,7 +308,8 @@ class RunSqlRequest(IStep):
     def extract(self) -> StepSqlRequestExtraction:
         return StepSqlRequestExtraction(self.__step)
 
-    def validate(self) -> StepSqlRequestValidation:
+    def validate(self, stop_on_failure: bool = False) -> StepSqlRequestValidation:
+        self.__step.validate_stop_on_failure = stop_on_failure
         return StepSqlRequestValidation(self.__step)
 
     def with_jmespath(
@@ -24,7 +24,9 @@ def run_step_testcase(runner: HttpRunner, step: TStep) -> StepResult:
     ref_case_runner = step.testcase()
     ref_case_runner.set_referenced().with_session(runner.session).with_case_id(
         runner.case_id
-    ).with_variables(step_variables).with_export(step_export).test_start()
+    ).with_variables(step_variables).with_export(step_export).with_deadline(
+        runner.get_deadline_at()
+    ).test_start()
 
     # teardown hooks
     if step.teardown_hooks:
@@ -16,7 +16,7 @@ from httprunner.models import (
     TStep,
     TThriftRequest,
 )
-from httprunner.response import ThriftResponseObject
+from httprunner.response import ThriftResponseObject, get_validator_plan
 from httprunner.runner import ALLURE, HttpRunner
 from httprunner.step_request import (
     StepRequestExtraction,
@@ -176,9 +176,9 @@ def run_step_thrift_request(runner: HttpRunner, step: TStep) -> StepResult:
     variables_mapping.update(extract_mapping)
 
     # validate
-    validators = step.validators
+    validators = get_validator_plan(step)
     try:
-        resp_obj.validate(validators, variables_mapping)
+        resp_obj.validate(validators, variables_mapping, step.validate_stop_on_failure)
         step_result.success = True
     except ValidationFailure:
         log_thrift_req_resp_details()
@@ -211,7 +211,8 @@ class StepThriftRequestExtraction(StepRequestExtraction):
     def run(self, runner: HttpRunner):
         return run_step_thrift_request(runner, self.__step)
 
-    def validate(self) -> StepThriftRequestValidation:
+    def validate(self, stop_on_failure: bool = False) -> StepThriftRequestValidation:
+        self.__step.validate_stop_on_failure = stop_on_failure
         return StepThriftRequestValidation(self.__step)
 
 
@@ -299,7 +300,8 @@ class RunThriftRequest(IStep):
     def extract(self) -> StepThriftRequestExtraction:
         return StepThriftRequestExtraction(self.__step)
 
-    def validate(self) -> StepThriftRequestValidation:
+    def validate(self, stop_on_failure: bool = False) -> StepThriftRequestValidation:
+        self.__step.validate_stop_on_failure = stop_on_failure
         return StepThriftRequestValidation(self.__step)
 
     def with_jmespath(
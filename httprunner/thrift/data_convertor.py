@@ -10,6 +10,8 @@ import base64
 
 from thrift.Thrift import TType
 
+from httprunner import jsonlib
+
 try:
     from _json import encode_basestring_ascii as c_encode_basestring_ascii
 except ImportError:
@@ -249,7 +251,9 @@ def json2thrift(json_str, thrift_class):
 
 def dumper(obj):
     try:
-        return json.dumps(obj, default=lambda o: o.__dict__, sort_keys=True, indent=2)
+        return jsonlib.dumps(
+            obj, default=lambda o: o.__dict__, sort_keys=True, indent=2
+        )
     except:
         return obj.__dict__
 
@@ -456,7 +460,7 @@ def thrift2json(obj, skip_nonutf8_value=False):
 
 def thrift2dict(obj):
     str = thrift2json(obj)
-    return json.loads(str)
+    return jsonlib.loads(str)
 
 
 dict2thrift = json2thrift
@@ -293,8 +293,8 @@ def init_stdout_logger(level: Optional[Text] = None):
     logger.remove()
     logger.add(sys.stdout, format=LOGGER_FORMAT, level=level)
 
-def init_file_logger(file_path: str, level: Optional[Text] = None):
-    """追加文件输出位置"""
+def init_file_logger(file_path: str, level: Optional[Text] = None) -> int:
+    """追加文件输出位置，返回 handler id，用完后需 logger.remove(handler_id) 移除"""
     if level:
         level = level.upper()
         if level not in ["TRACE", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
@@ -303,4 +303,7 @@ def init_file_logger(file_path: str, level: Optional[Text] = None):
         # 默认采用环境变量
         level = os.getenv("LOGGER_FILE_LEVEL", "INFO")
 
-    logger.add(file_path, format=LOGGER_FORMAT, level=level, encoding="utf-8")
+    # delay: 没有日志输出时不创建文件
+    return logger.add(
+        file_path, format=LOGGER_FORMAT, level=level, encoding="utf-8", delay=True
+    )